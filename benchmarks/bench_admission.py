@@ -0,0 +1,68 @@
+"""Latency under overload with and without admission control.
+
+Simulates one worker receiving requests faster than it can serve them (service
+capacity is bounded like the Groq rate limit). Without a gate every request
+queues and eventually completes very late; with the gate excess requests get a
+fast 503 while admitted ones keep a bounded latency. Run from the repository root:
+    python -m benchmarks.bench_admission --rate 40 --capacity 8 --service 0.5
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from com.mhire.app.common.admission_control import EndpointGate
+
+def _summary(name: str, samples) -> str:
+    if not samples:
+        return f"{name:<10} n=0"
+    ordered = sorted(samples)
+    p95 = ordered[int(0.95 * (len(ordered) - 1))]
+    return f"{name:<10} n={len(samples):<5} p50={statistics.median(samples):6.2f}s  p95={p95:6.2f}s  max={ordered[-1]:6.2f}s"
+
+async def _simulate(args, gated: bool):
+    upstream = asyncio.Semaphore(args.capacity)
+    gate = EndpointGate("/bench", args.capacity, args.queue, args.max_wait)
+    served, shed = [], []
+    rng = random.Random(1)
+
+    async def request() -> None:
+        start = time.perf_counter()
+        if gated and await gate.acquire() is not None:
+            shed.append(time.perf_counter() - start)
+            return
+        service_start = time.perf_counter()
+        try:
+            async with upstream:
+                await asyncio.sleep(rng.expovariate(1 / args.service))
+        finally:
+            if gated:
+                gate.release(time.perf_counter() - service_start)
+        served.append(time.perf_counter() - start)
+
+    tasks = []
+    for _ in range(int(args.rate * args.duration)):
+        tasks.append(asyncio.ensure_future(request()))
+        await asyncio.sleep(1 / args.rate)
+    await asyncio.gather(*tasks)
+    return served, shed
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rate", type=float, default=40.0, help="arrivals per second")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--capacity", type=int, default=8, help="concurrent upstream calls")
+    parser.add_argument("--service", type=float, default=0.5, help="mean service time in seconds")
+    parser.add_argument("--queue", type=int, default=8)
+    parser.add_argument("--max-wait", type=float, default=2.0)
+    args = parser.parse_args()
+
+    for gated in (False, True):
+        served, shed = asyncio.run(_simulate(args, gated))
+        print("with admission control" if gated else "without admission control")
+        print("  " + _summary("served", served))
+        print("  " + _summary("shed (503)", shed))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Per-task latency with task-based model routing vs one large model for everything.
+
+Runs the same chat completions the services send against the local mock Groq
+server (see ``benchmarks/mock_groq_server.py``) and reports p50/p95 per task.
+Run from the repository root:
+    python -m benchmarks.bench_model_routing --requests 50 --concurrency 8
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+from benchmarks.mock_groq_server import start_mock_server
+
+LARGE_MODEL = "llama-3.3-70b-versatile"
+SMALL_MODEL = "llama-3.1-8b-instant"
+
+# Enough of each real prompt for the mock server to return the matching content
+TASK_PROMPTS = {
+    "sentiment": "Return only ONE emotional keyword from: Sad, Angry, Guilty",
+    "tools": "Categories: 1. Stay Connected ... return JSON",
+    "schedule": "Create a schedule with morning, noon, afternoon, evening and night periods",
+    "song_suggestion": "Return JSON with title, artist and why_relevant",
+    "video_selection": "Return JSON with selected_index and reason",
+    "essay": "Return JSON with motivation_cards and essay",
+}
+
+def _percentile(samples, fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+async def _run_task(client, task, requests: int, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+    messages = [{"role": "user", "content": TASK_PROMPTS[task.value]}]
+
+    async def one() -> float:
+        async with semaphore:
+            start = time.perf_counter()
+            await client.complete(task, messages=messages)
+            return time.perf_counter() - start
+
+    return await asyncio.gather(*(one() for _ in range(requests)))
+
+async def _run(args) -> None:
+    from com.mhire.app.common.model_router import LLMTask, ModelRouter
+    from com.mhire.app.common.upstream_clients import GroqChatClient
+
+    single_model = {task.value: {"model": LARGE_MODEL, "fallback_model": None} for task in LLMTask}
+    scenarios = {
+        "single large model": ModelRouter(overrides=single_model),
+        "task-based routing": ModelRouter(overrides={}),
+    }
+    for name, router in scenarios.items():
+        client = GroqChatClient(api_key="benchmark", router=router)
+        print(f"\n{name}")
+        for task in LLMTask:
+            samples = await _run_task(client, task, args.requests, args.concurrency)
+            print(
+                f"  {task.value:<16} {router.profile(task).model:<26} "
+                f"p50={statistics.median(samples) * 1000:7.1f}ms  p95={_percentile(samples, 0.95) * 1000:7.1f}ms"
+            )
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency-scale", type=float, default=1.0)
+    args = parser.parse_args()
+
+    server, state, base_url = start_mock_server()
+    state.latency_scale = args.latency_scale
+    os.environ.update({
+        "GROQ_BASE_URL": base_url,
+        "GROQ_MODEL_NAME": LARGE_MODEL,
+        "GROQ_SMALL_MODEL_NAME": SMALL_MODEL,
+    })
+    try:
+        asyncio.run(_run(args))
+    finally:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Micro-benchmark for the API response path.
+
+Compares the previous validate -> model_dump -> JSONResponse round trip with the
+single-pass validation and direct-to-bytes rendering used by NetworkResponse.
+
+Run from the repository root:
+    python -m benchmarks.bench_response_path --requests 2000 --concurrency 64
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from fastapi.responses import JSONResponse
+
+from com.mhire.app.common.json_handler import LLMJsonHandler
+from com.mhire.app.common.network_responses import NetworkResponse, HTTPCode
+from com.mhire.app.services.schedule_builder.schedule_builder_schema import DailySchedule
+
+def _sample_schedule() -> str:
+    """Build an LLM-sized schedule payload (5 periods x 5 activities)."""
+    periods = {}
+    for period in ("morning", "noon", "afternoon", "evening", "night"):
+        periods[period] = [
+            {
+                "time_frame": f"{7 + i}:00 AM - {7 + i}:30 AM",
+                "activity": f"Specific {period} activity {i}",
+                "description": "Detailed, step-by-step instructions for a gentle, grounding activity. " * 3
+            }
+            for i in range(5)
+        ]
+    return json.dumps({"date": "2025-01-01", **periods})
+
+def legacy_path(raw: str) -> bytes:
+    """Previous path: json.loads, kwargs validation, model_dump, stdlib JSONResponse."""
+    data = json.loads(raw)
+    schedule = DailySchedule(**data)
+    return JSONResponse(
+        status_code=HTTPCode.SUCCESS,
+        content={
+            "success": True,
+            "message": "ok",
+            "data": schedule.model_dump(),
+            "resource": "/api/v1/daily-schedule",
+            "duration": "0.0s"
+        }
+    ).body
+
+def fast_path(raw: str, handler: LLMJsonHandler, network_response: NetworkResponse) -> bytes:
+    """Current path: cached single-pass validation, model rendered straight to bytes."""
+    schedule = handler.process_llm_response(raw, DailySchedule)
+    return network_response.success_response(
+        http_code=HTTPCode.SUCCESS,
+        message="ok",
+        data=schedule,
+        resource="/api/v1/daily-schedule",
+        duration=0.0
+    ).body
+
+async def _run(label: str, fn, total: int, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            fn()
+            # Yield like a real handler would while awaiting I/O
+            await asyncio.sleep(0)
+
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    cpu = time.process_time() - cpu_start
+    wall = time.perf_counter() - wall_start
+    per_request_us = cpu / total * 1e6
+    print(f"{label:<8} cpu/request={per_request_us:8.1f}us  wall={wall:6.3f}s  requests={total}")
+    return per_request_us
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    args = parser.parse_args()
+
+    raw = _sample_schedule()
+    handler = LLMJsonHandler()
+    network_response = NetworkResponse()
+
+    # Warm both paths so validator construction is not measured
+    legacy_path(raw)
+    fast_path(raw, handler, network_response)
+
+    legacy = asyncio.run(_run("legacy", lambda: legacy_path(raw), args.requests, args.concurrency))
+    fast = asyncio.run(_run("fast", lambda: fast_path(raw, handler, network_response), args.requests, args.concurrency))
+    print(f"saved    cpu/request={legacy - fast:8.1f}us  ({(1 - fast / legacy) * 100:.1f}%)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Daily schedule latency and tokens, one whole-day completion vs one completion per period.
+
+Generates schedules with the schedule service against the local mock Groq server
+(see ``benchmarks/mock_groq_server.py``) once per ``SCHEDULE_GENERATION_MODE`` and
+reports p50/p95 wall-clock time, completions and tokens per schedule. The semantic
+cache is disabled so every schedule reaches the model.
+Run from the repository root:
+    python -m benchmarks.bench_schedule_generation --requests 20 --concurrency 4
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+from benchmarks.mock_groq_server import start_mock_server
+
+MODES = ("single", "per_period")
+
+def _percentile(samples, fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+async def _run_mode(mode: str, requests: int, concurrency: int) -> None:
+    from com.mhire.app.common.request_context import background_scope
+    from com.mhire.app.common.usage_tracker import get_usage_tracker
+    from com.mhire.app.services.schedule_builder.schedule_builder import ScheduleBuilder, ScheduleGenerationMode
+    from com.mhire.app.services.schedule_builder.schedule_builder_schema import ScheduleRequest
+
+    builder = ScheduleBuilder()
+    builder.generation_mode = ScheduleGenerationMode(mode)
+    request = ScheduleRequest(
+        user_thoughts="I keep replaying our last conversation.", relationship="Parent", cause_of_loss="Illness"
+    )
+    semaphore = asyncio.Semaphore(concurrency)
+    failures = 0
+
+    async def one() -> float:
+        nonlocal failures
+        async with semaphore:
+            with background_scope(f"schedule:{mode}", 120):
+                start = time.perf_counter()
+                try:
+                    await builder.generate_daily_schedule(request)
+                except Exception:
+                    failures += 1
+                return time.perf_counter() - start
+
+    samples = await asyncio.gather(*(one() for _ in range(requests)))
+    stages = [stage for stage in get_usage_tracker().aggregates()["by_stage"] if stage["endpoint"] == f"schedule:{mode}"]
+    completions = sum(stage["calls"] for stage in stages)
+    prompt_tokens = sum(stage["prompt_tokens"] for stage in stages)
+    completion_tokens = sum(stage["completion_tokens"] for stage in stages)
+    print(
+        f"  {mode:<11} p50={statistics.median(samples) * 1000:7.1f}ms  p95={_percentile(samples, 0.95) * 1000:7.1f}ms  "
+        f"completions/schedule={completions / requests:4.2f}  prompt_tokens/schedule={prompt_tokens / requests:7.1f}  "
+        f"completion_tokens/schedule={completion_tokens / requests:7.1f}  failed={failures}"
+    )
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--latency-scale", type=float, default=1.0)
+    args = parser.parse_args()
+
+    server, state, base_url = start_mock_server()
+    state.latency_scale = args.latency_scale
+    os.environ.update({
+        "GROQ_BASE_URL": base_url,
+        "GROQ_API_KEY": "benchmark",
+        "TAVILY_API_KEY": "benchmark",
+        "GROQ_MODEL_NAME": "llama-3.3-70b-versatile",
+        "SHARED_STORE_BACKEND": "memory",
+        "SEMANTIC_CACHE_TTL_SECONDS": "0",
+    })
+
+    async def run_all() -> None:
+        print(f"\n{args.requests} schedules, {args.concurrency} at a time")
+        for mode in MODES:
+            await _run_mode(mode, args.requests, args.concurrency)
+
+    try:
+        asyncio.run(run_all())
+    finally:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Cache hit rate and latency per shared-store backend as workers are added.
+
+Each simulated worker has its own store instance, as a gunicorn worker would:
+in-process caches stay split per worker, while SQLite and Redis (the local
+stand-in from ``benchmarks/mock_redis_server.py``) are shared. Requests draw
+from a skewed key distribution and fill the cache on a miss. Before measuring,
+every backend is checked for the get/set/add/incr/TTL semantics the app relies on.
+
+Run from the repository root:
+    python -m benchmarks.bench_shared_cache --requests 4000 --keys 500
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from benchmarks.mock_redis_server import start_mock_redis
+from com.mhire.app.common.shared_store import MemoryStore, RedisStore, SQLiteStore, SharedStore
+
+async def check_semantics(store: SharedStore) -> None:
+    await store.set("check:value", b"one", ttl=60)
+    assert await store.get("check:value") == b"one"
+    assert not await store.add("check:value", b"two", ttl=60)
+    await store.delete("check:value")
+    assert await store.get("check:value") is None
+    assert await store.add("check:value", b"two", ttl=60)
+    assert await store.incr("check:counter", 2, ttl=60) == 2
+    assert await store.incr("check:counter", 3, ttl=60) == 5
+    await store.set("check:short", b"x", ttl=0.05)
+    await asyncio.sleep(0.1)
+    assert await store.get("check:short") is None
+    assert await store.incr("check:short", 1, ttl=60) == 1
+    for key in ("check:value", "check:counter", "check:short"):
+        await store.delete(key)
+
+async def simulate(workers, requests: int, keys: int, seed: int):
+    rng = random.Random(seed)
+    population = list(range(keys))
+    weights = [1 / (rank + 1) for rank in population]
+    hits = 0
+    latencies = []
+    for i, key in enumerate(rng.choices(population, weights, k=requests)):
+        store = workers[i % len(workers)]
+        start = time.perf_counter()
+        if await store.get(f"bench:{key}") is not None:
+            hits += 1
+        else:
+            await store.set(f"bench:{key}", b"x" * 512, ttl=300)
+        latencies.append(time.perf_counter() - start)
+    return hits / requests, statistics.median(latencies)
+
+async def _run(args) -> None:
+    _, redis_url = start_mock_redis()
+    backends = {
+        "memory": lambda path: MemoryStore(max_entries=args.keys * 2),
+        "sqlite": lambda path: SQLiteStore(path, max_entries=args.keys * 2),
+        "redis": lambda path: RedisStore(redis_url, prefix=f"bench{time.time_ns()}:"),
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, factory in backends.items():
+            await check_semantics(factory(os.path.join(tmp, "check.sqlite3")))
+        print("semantics check passed for: " + ", ".join(backends))
+
+        for name, factory in backends.items():
+            for count in args.workers:
+                path = os.path.join(tmp, f"{name}-{count}.sqlite3")
+                workers = [factory(path) for _ in range(count)]
+                if name == "redis":
+                    # Instances of one deployment share a key prefix
+                    for store in workers[1:]:
+                        store.prefix = workers[0].prefix
+                hit_rate, median = await simulate(workers, args.requests, args.keys, seed=count)
+                print(f"{name:<7} workers={count:<2} hit_rate={hit_rate:6.1%}  median_op={median * 1e6:8.1f}us")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=4000)
+    parser.add_argument("--keys", type=int, default=500)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+    asyncio.run(_run(args))
+
+if __name__ == "__main__":
+    main()
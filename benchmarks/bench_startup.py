@@ -0,0 +1,80 @@
+"""Startup benchmark: time from process start to the first request served.
+
+Each scenario launches the server in a subprocess and polls ``/health`` until it
+answers, so the number includes interpreter start, imports, worker fork and the
+lifespan warmup. Run from the repository root:
+    python -m benchmarks.bench_startup --runs 3
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+SCENARIOS = {
+    "uvicorn (lazy services)": {
+        "cmd": ["uvicorn", "com.mhire.app.main:app", "--port", "{port}"],
+        "env": {"PREWARM_CONNECTIONS": "false"}
+    },
+    "uvicorn + prewarm": {
+        "cmd": ["uvicorn", "com.mhire.app.main:app", "--port", "{port}"],
+        "env": {"PREWARM_CONNECTIONS": "true"}
+    },
+    "gunicorn 4 workers, no preload": {
+        "cmd": ["gunicorn", "--config", "gunicorn_config.py", "--bind", "127.0.0.1:{port}", "com.mhire.app.main:app"],
+        "env": {"GUNICORN_PRELOAD": "false", "PREWARM_CONNECTIONS": "false"}
+    },
+    "gunicorn 4 workers, preload": {
+        "cmd": ["gunicorn", "--config", "gunicorn_config.py", "--bind", "127.0.0.1:{port}", "com.mhire.app.main:app"],
+        "env": {"GUNICORN_PRELOAD": "true", "PREWARM_CONNECTIONS": "false"}
+    },
+    "gunicorn 4 workers, preload + prewarm": {
+        "cmd": ["gunicorn", "--config", "gunicorn_config.py", "--bind", "127.0.0.1:{port}", "com.mhire.app.main:app"],
+        "env": {"GUNICORN_PRELOAD": "true", "PREWARM_CONNECTIONS": "true"}
+    },
+}
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def _time_to_first_request(cmd, env, timeout: float) -> float:
+    port = _free_port()
+    args = [part.format(port=port) for part in cmd]
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        args, env={**os.environ, **env}, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        while time.perf_counter() - start < timeout:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1) as resp:
+                    if resp.status == 200:
+                        return time.perf_counter() - start
+            except OSError:
+                time.sleep(0.01)
+        raise TimeoutError(f"Server did not answer within {timeout}s: {' '.join(args)}")
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    args = parser.parse_args()
+
+    for name, scenario in SCENARIOS.items():
+        try:
+            samples = [_time_to_first_request(scenario["cmd"], scenario["env"], args.timeout) for _ in range(args.runs)]
+        except (OSError, TimeoutError) as e:
+            print(f"{name:<40} skipped: {e}", file=sys.stderr)
+            continue
+        print(f"{name:<40} median={statistics.median(samples):.3f}s  min={min(samples):.3f}s  runs={len(samples)}")
+
+if __name__ == "__main__":
+    main()
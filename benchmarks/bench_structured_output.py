@@ -0,0 +1,99 @@
+"""Parse failures, retry completions and prompt size per structured-output mode.
+
+Runs the sentiment, schedule and content services against the local mock Groq
+server (see ``benchmarks/mock_groq_server.py``) once per ``STRUCTURED_OUTPUT_MODE``.
+The mock damages ``--malformed-rate`` of the JSON-mode answers the way an
+unconstrained model does, and never damages schema-constrained ones. Caches are
+disabled so every request reaches the model.
+Run from the repository root:
+    python -m benchmarks.bench_structured_output --requests 30 --malformed-rate 0.1
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from benchmarks.mock_groq_server import start_mock_server
+
+MODES = ("prompt", "json_schema", "tool")
+
+async def _run_mode(mode: str, requests: int) -> None:
+    from com.mhire.app.common.json_handler import json_parse_snapshot
+    from com.mhire.app.common.request_context import background_scope
+    from com.mhire.app.common.structured_output import StructuredOutput
+    from com.mhire.app.common.usage_tracker import get_usage_tracker
+    from com.mhire.app.services.personalized_content.personalized_content import PersonalizedContent
+    from com.mhire.app.services.personalized_content.personalized_content_schema import GriefContentRequest
+    from com.mhire.app.services.schedule_builder.schedule_builder import ScheduleBuilder
+    from com.mhire.app.services.schedule_builder.schedule_builder_schema import ScheduleRequest
+    from com.mhire.app.services.sentiment_toolkit.sentiment_toolkit import SentimentToolkit
+    from com.mhire.app.services.sentiment_toolkit.sentiment_toolkit_schema import UserInput
+
+    services = {"sentiment": SentimentToolkit(), "schedule": ScheduleBuilder(), "content": PersonalizedContent()}
+    for service in services.values():
+        service.structured = StructuredOutput(mode)
+
+    inputs = {"user_thoughts": "I keep replaying our last conversation.", "relationship": "Parent", "cause_of_loss": "Illness"}
+    calls = {
+        "sentiment": lambda: services["sentiment"].analyze_grief(UserInput(**inputs)),
+        "schedule": lambda: services["schedule"].generate_daily_schedule(ScheduleRequest(**inputs)),
+        "content": lambda: services["content"].generate_personalized_content(GriefContentRequest(
+            **inputs, tool_title="Mindfulness", tool_description="Stay present with your feelings.", tool_name="Breathing"
+        )),
+    }
+
+    before = json_parse_snapshot()
+    print(f"\n{mode}")
+    for endpoint, call in calls.items():
+        failures = 0
+        start = time.perf_counter()
+        for _ in range(requests):
+            with background_scope(f"{mode}:{endpoint}", 120):
+                try:
+                    await call()
+                except Exception:
+                    failures += 1
+        elapsed = time.perf_counter() - start
+        stages = [stage for stage in get_usage_tracker().aggregates()["by_stage"] if stage["endpoint"] == f"{mode}:{endpoint}"]
+        completions = sum(stage["calls"] for stage in stages)
+        prompt_tokens = sum(stage["prompt_tokens"] for stage in stages)
+        retries = sum(stage["retries"] for stage in stages)
+        print(
+            f"  {endpoint:<10} completions/request={completions / requests:5.2f}  retries={retries:3d}  "
+            f"failed={failures:3d}  prompt_tokens/request={prompt_tokens / requests:7.1f}  "
+            f"mean={elapsed / requests * 1000:7.1f}ms"
+        )
+    after = json_parse_snapshot()
+    print("  parsing    " + "  ".join(f"{outcome}={after[outcome] - before[outcome]}" for outcome in ("clean", "repaired", "failed")))
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=30)
+    parser.add_argument("--malformed-rate", type=float, default=0.1)
+    parser.add_argument("--latency-scale", type=float, default=0.05)
+    args = parser.parse_args()
+
+    server, state, base_url = start_mock_server()
+    state.latency_scale = args.latency_scale
+    state.malformed_rate = args.malformed_rate
+    os.environ.update({
+        "GROQ_BASE_URL": base_url,
+        "GROQ_API_KEY": "benchmark",
+        "TAVILY_API_KEY": "benchmark",
+        "GROQ_MODEL_NAME": "llama-3.3-70b-versatile",
+        "SHARED_STORE_BACKEND": "memory",
+        "SENTIMENT_CACHE_TTL_SECONDS": "0",
+        "SEMANTIC_CACHE_TTL_SECONDS": "0",
+    })
+
+    async def run_all() -> None:
+        for mode in MODES:
+            await _run_mode(mode, args.requests)
+
+    try:
+        asyncio.run(run_all())
+    finally:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
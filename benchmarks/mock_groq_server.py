@@ -0,0 +1,240 @@
+"""Local stand-in for the Groq chat completions API used by the benchmarks.
+
+Answers ``POST /openai/v1/chat/completions`` with canned, schema-valid content for
+each prompt the services send, and sleeps to mimic model latency: a fixed time to
+first token plus a per-token cost that is lower for small models. Structured-output
+requests (``json_schema`` response format or a forced tool call) are answered by
+schema name; single-period schedule prompts get that period's activities.
+``--malformed-rate`` damages that share of JSON-mode answers. Point the app or
+a benchmark at it with ``GROQ_BASE_URL=http://127.0.0.1:<port>``.
+
+    python -m benchmarks.mock_groq_server --port 8100
+"""
+import argparse
+import json
+import re
+import threading
+import time
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Tuple
+
+# (time to first token, seconds per completion token)
+LATENCY_PROFILES = {
+    "small": (0.08, 0.0015),
+    "large": (0.30, 0.0080),
+}
+
+def _model_size(model: str) -> str:
+    return "small" if any(marker in model for marker in ("8b", "instant", "mini")) else "large"
+
+PERIODS = ("morning", "noon", "afternoon", "evening", "night")
+# First hour of each period, and the activity that meets its requirement
+PERIOD_STARTS = {"morning": 7, "noon": 11, "afternoon": 14, "evening": 18, "night": 21}
+PERIOD_HIGHLIGHTS = {
+    "morning": "Make honey oatmeal breakfast",
+    "noon": "Prepare lentil soup lunch",
+    "afternoon": "Walk 15 minutes around the block",
+    "evening": "Write a letter about a favorite memory",
+}
+_PERIOD_PROMPT = re.compile(r"only the (morning|noon|afternoon|evening|night)\b")
+
+def _clock(minutes: int) -> str:
+    hour, minute = divmod(minutes, 60)
+    return f"{hour % 12 or 12}:{minute:02d} {'AM' if hour < 12 else 'PM'}"
+
+def _activity(period: str, index: int) -> Dict[str, str]:
+    start = PERIOD_STARTS[period] * 60 + index * 45
+    name = PERIOD_HIGHLIGHTS.get(period) if index == 0 else None
+    return {
+        "time_frame": f"{_clock(start)} - {_clock(start + 30)}",
+        "activity": name or f"Gentle {period} activity {index + 1}",
+        "description": "Step-by-step instructions for a specific, grounding activity."
+    }
+
+# Structured-output requests are answered by schema name; the prompts no longer spell out the format
+SCHEMA_PROMPTS = {
+    "daily_schedule": "morning night",
+    "schedule_period": '"activities"',
+    "tool_recommendations": "Stay Connected",
+    "personalized_content": "motivation_cards",
+    "song_suggestion": "why_relevant",
+    "video_selection": "selected_index",
+}
+
+def malform(content: str, count: int) -> str:
+    """Damage JSON the way unconstrained models do: chatter around it, or cut off mid-object."""
+    if count % 2:
+        return f"Here is the JSON you asked for:\n```json\n{content}\n```"
+    return content[:len(content) // 2]
+
+def canned_content(prompt: str, schema_name: Optional[str] = None) -> Tuple[str, int]:
+    """Pick a valid response for the prompt and the number of tokens it represents."""
+    period = _PERIOD_PROMPT.search(prompt)
+    if period and (schema_name == "schedule_period" or '"activities"' in prompt):
+        return json.dumps({"activities": [_activity(period.group(1), i) for i in range(4)]}), 280
+    if schema_name:
+        prompt = SCHEMA_PROMPTS.get(schema_name, prompt)
+    if "emotional keyword" in prompt:
+        return "Sad", 1
+    if "selected_index" in prompt:
+        return json.dumps({"selected_index": 0, "reason": "Official, high quality audio."}), 20
+    if "why_relevant" in prompt:
+        return json.dumps({
+            "title": "See You Again",
+            "artist": "Wiz Khalifa ft. Charlie Puth",
+            "why_relevant": "A song about carrying a loved one with you."
+        }), 60
+    if "motivation_cards" in prompt:
+        words = " ".join(["word"] * 100)
+        return json.dumps({
+            "motivation_cards": ["Breathe slowly today.", "Your love still matters.", "Rest is allowed."],
+            "essay": {
+                "quote": "What we have once enjoyed we can never lose - Helen Keller",
+                "welcome_to_grief_works": words,
+                "grief_is_hard_work": words,
+                "about_your_grief": words,
+                "heal_and_grow": words
+            }
+        }), 700
+    if "morning" in prompt and "night" in prompt:
+        return json.dumps({
+            "date": time.strftime("%Y-%m-%d"),
+            **{period: [_activity(period, i) for i in range(4)] for period in PERIODS}
+        }), 1400
+    if "Stay Connected" in prompt:
+        categories = ["1. Stay Connected", "2. Work Through Emotions", "3. Find Strength",
+                      "4. Mindfulness", "5. Check In", "6. Get Moving"]
+        return json.dumps({
+            name: {"description": "A gentle way to care for yourself.", "tools": ["Daily Memory Journal Prompt", "Evening Gratitude Walk Ritual"]}
+            for name in categories
+        }), 350
+    return json.dumps({"message": "ok"}), 10
+
+class MockGroqState:
+    """Knobs the benchmarks can flip while the server runs."""
+
+    def __init__(self, latency_scale: float = 1.0, malformed_rate: float = 0.0):
+        self.latency_scale = latency_scale
+        # Share of JSON-mode answers that come back damaged; schema-constrained answers never are
+        self.malformed_rate = malformed_rate
+        self.rate_limited_models = set()
+        self.requests = 0
+        self.malformed = 0
+        self.lock = threading.Lock()
+
+    def should_malform(self) -> bool:
+        with self.lock:
+            if self.malformed < self.malformed_rate * self.requests:
+                self.malformed += 1
+                return True
+            return False
+
+def _schema_name(request: Dict[str, Any]) -> Optional[str]:
+    """Name of the schema a structured-output request asks for, None in JSON or text mode."""
+    tools = request.get("tools")
+    if tools:
+        return tools[0]["function"]["name"]
+    response_format = request.get("response_format") or {}
+    if response_format.get("type") == "json_schema":
+        return response_format["json_schema"]["name"]
+    return None
+
+class _Handler(BaseHTTPRequestHandler):
+    state: MockGroqState
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def _send(self, status: int, payload: Dict[str, Any]) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        if self.path.endswith("/models"):
+            self._send(200, {"object": "list", "data": []})
+        else:
+            self._send(404, {"error": {"message": "not found"}})
+
+    def do_POST(self) -> None:
+        if not self.path.endswith("/chat/completions"):
+            self._send(404, {"error": {"message": "not found"}})
+            return
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        model = request.get("model", "")
+        with self.state.lock:
+            self.state.requests += 1
+        if model in self.state.rate_limited_models:
+            self._send(429, {"error": {"message": "Rate limit reached", "type": "rate_limit_exceeded"}})
+            return
+
+        prompt = "\n".join(str(message.get("content", "")) for message in request.get("messages", []))
+        schema_name = _schema_name(request)
+        content, tokens = canned_content(prompt, schema_name)
+        if schema_name is None and content.startswith("{") and self.state.should_malform():
+            content = malform(content, self.state.malformed)
+        max_tokens = request.get("max_tokens") or tokens
+        completion_tokens = min(tokens, max_tokens)
+        first_token, per_token = LATENCY_PROFILES[_model_size(model)]
+        generation_time = (first_token + per_token * completion_tokens) * self.state.latency_scale
+        time.sleep(generation_time)
+
+        prompt_tokens = (len(prompt) + len(json.dumps(request.get("tools") or request.get("response_format") or ""))) // 4
+        message: Dict[str, Any] = {"role": "assistant", "content": content}
+        finish_reason = "stop"
+        if request.get("tools"):
+            message = {
+                "role": "assistant",
+                "content": None,
+                "tool_calls": [{
+                    "id": f"call_mock_{self.state.requests}",
+                    "type": "function",
+                    "function": {"name": schema_name, "arguments": content}
+                }]
+            }
+            finish_reason = "tool_calls"
+        self._send(200, {
+            "id": f"chatcmpl-mock-{self.state.requests}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "message": message, "finish_reason": finish_reason}],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+                "queue_time": 0.0,
+                "prompt_time": 0.0,
+                "completion_time": generation_time,
+                "total_time": generation_time
+            }
+        })
+
+def start_mock_server(port: int = 0, state: Optional[MockGroqState] = None) -> Tuple[ThreadingHTTPServer, MockGroqState, str]:
+    """Start the server on a background thread; returns (server, state, base_url)."""
+    state = state or MockGroqState()
+    handler = type("MockGroqHandler", (_Handler,), {"state": state})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, state, f"http://127.0.0.1:{server.server_address[1]}"
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency-scale", type=float, default=1.0)
+    parser.add_argument("--malformed-rate", type=float, default=0.0)
+    args = parser.parse_args()
+    server, _, base_url = start_mock_server(args.port, MockGroqState(args.latency_scale, args.malformed_rate))
+    print(f"Mock Groq API listening on {base_url} (set GROQ_BASE_URL={base_url})")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
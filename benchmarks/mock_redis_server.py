@@ -0,0 +1,126 @@
+"""Local stand-in for a Redis server, enough for ``RedisStore``.
+
+Implements the RESP commands the shared store sends (PING, AUTH, SELECT, GET,
+SET with EX/PX/NX/XX, DEL, INCRBY, FLUSHDB) over asyncio, with lazy expiry.
+Point the backend at it with ``SHARED_STORE_BACKEND=redis`` and
+``SHARED_STORE_URL=redis://127.0.0.1:6390/0``.
+
+    python -m benchmarks.mock_redis_server --port 6390
+"""
+import argparse
+import asyncio
+import threading
+import time
+
+from typing import Any, Dict, List, Optional, Tuple
+
+class MockRedis:
+    def __init__(self):
+        self.data: Dict[bytes, Tuple[bytes, Optional[float]]] = {}
+        self.commands = 0
+
+    def _live(self, key: bytes) -> Optional[bytes]:
+        entry = self.data.get(key)
+        if entry is None:
+            return None
+        if entry[1] is not None and entry[1] <= time.monotonic():
+            del self.data[key]
+            return None
+        return entry[0]
+
+    def execute(self, args: List[bytes]) -> Any:
+        self.commands += 1
+        name = args[0].upper()
+        if name == b"PING":
+            return "PONG"
+        if name in (b"AUTH", b"SELECT"):
+            return "OK"
+        if name == b"FLUSHDB":
+            self.data.clear()
+            return "OK"
+        if name == b"GET":
+            return self._live(args[1])
+        if name == b"DEL":
+            return sum(1 for key in args[1:] if self._live(key) is not None and self.data.pop(key))
+        if name == b"SET":
+            key, value, expires_at = args[1], args[2], None
+            options = [arg.upper() for arg in args[3:]]
+            for unit, scale in ((b"EX", 1.0), (b"PX", 0.001)):
+                if unit in options:
+                    expires_at = time.monotonic() + int(options[options.index(unit) + 1]) * scale
+            exists = self._live(key) is not None
+            if (b"NX" in options and exists) or (b"XX" in options and not exists):
+                return None
+            self.data[key] = (value, expires_at)
+            return "OK"
+        if name == b"INCRBY":
+            key = args[1]
+            current = self._live(key)
+            try:
+                value = int(current or 0) + int(args[2])
+            except ValueError:
+                return RuntimeError("ERR value is not an integer or out of range")
+            self.data[key] = (str(value).encode(), self.data[key][1] if current is not None else None)
+            return value
+        return RuntimeError(f"ERR unknown command '{name.decode()}'")
+
+def _encode_reply(reply: Any) -> bytes:
+    if reply is None:
+        return b"$-1\r\n"
+    if isinstance(reply, RuntimeError):
+        return f"-{reply}\r\n".encode()
+    if isinstance(reply, str):
+        return f"+{reply}\r\n".encode()
+    if isinstance(reply, int):
+        return f":{reply}\r\n".encode()
+    return f"${len(reply)}\r\n".encode() + reply + b"\r\n"
+
+async def _handle(redis: MockRedis, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    try:
+        while True:
+            header = await reader.readline()
+            if not header:
+                break
+            args = []
+            for _ in range(int(header[1:-2])):
+                length = int((await reader.readline())[1:-2])
+                args.append((await reader.readexactly(length + 2))[:-2])
+            writer.write(_encode_reply(redis.execute(args)))
+            await writer.drain()
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+def start_mock_redis(port: int = 0) -> Tuple[MockRedis, str]:
+    """Run the server on a background thread's event loop; returns (state, url)."""
+    redis = MockRedis()
+    started = threading.Event()
+    address = {}
+
+    def serve() -> None:
+        loop = asyncio.new_event_loop()
+        server = loop.run_until_complete(
+            asyncio.start_server(lambda r, w: _handle(redis, r, w), "127.0.0.1", port)
+        )
+        address["port"] = server.sockets[0].getsockname()[1]
+        started.set()
+        loop.run_forever()
+
+    threading.Thread(target=serve, daemon=True).start()
+    started.wait()
+    return redis, f"redis://127.0.0.1:{address['port']}/0"
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=6390)
+    args = parser.parse_args()
+    _, url = start_mock_redis(args.port)
+    print(f"Mock Redis listening on {url} (set SHARED_STORE_URL={url})")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
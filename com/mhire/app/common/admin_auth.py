@@ -0,0 +1,24 @@
+import hmac
+
+from typing import Mapping, Optional
+
+from com.mhire.app.config.config import Config
+
+ADMIN_TOKEN_HEADER = "X-Admin-Token"
+
+def _presented_token(headers: Mapping[str, str]) -> Optional[str]:
+    token = headers.get(ADMIN_TOKEN_HEADER)
+    if token:
+        return token
+    authorization = headers.get("Authorization", "")
+    if authorization.lower().startswith("bearer "):
+        return authorization[7:].strip()
+    return None
+
+def is_admin(headers: Mapping[str, str]) -> bool:
+    """True if the request carries ``ADMIN_TOKEN``; always False when no token is configured."""
+    expected = Config().admin_token
+    presented = _presented_token(headers)
+    if not expected or not presented:
+        return False
+    return hmac.compare_digest(presented.encode(), expected.encode())
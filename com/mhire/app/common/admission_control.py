@@ -0,0 +1,202 @@
+import asyncio
+import json
+import logging
+import math
+import time
+
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+from com.mhire.app.config.config import Config
+from com.mhire.app.common.network_responses import NetworkResponse, FastJSONResponse, HTTPCode, ErrorCode, Message
+
+logger = logging.getLogger(__name__)
+
+# Per-worker limits for the generation endpoints; every other path is never gated.
+DEFAULT_LIMITS: Dict[str, Dict[str, float]] = {
+    "/api/v1/sentiment-analyze": {"max_in_flight": 32, "max_queue": 32, "max_queue_wait_seconds": 5},
+    "/api/v1/daily-schedule": {"max_in_flight": 16, "max_queue": 16, "max_queue_wait_seconds": 5},
+    "/api/v1/personalized-content": {"max_in_flight": 8, "max_queue": 8, "max_queue_wait_seconds": 5},
+    "/api/v1/multi-day-schedule": {"max_in_flight": 4, "max_queue": 4, "max_queue_wait_seconds": 5},
+}
+
+class EndpointGate:
+    """Bounds concurrent work for one endpoint with a short, bounded FIFO queue.
+
+    A request is admitted straight away while fewer than ``max_in_flight`` are
+    running. Otherwise it queues, unless the queue is full or the expected wait
+    (from the recent service time) already exceeds ``max_queue_wait_seconds``;
+    a queued request that is not admitted in time is rejected as well.
+    """
+
+    EWMA_ALPHA = 0.2
+    MAX_RETRY_AFTER = 60
+
+    def __init__(self, path: str, max_in_flight: int, max_queue: int, max_queue_wait_seconds: float):
+        self.path = path
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.max_queue_wait_seconds = max_queue_wait_seconds
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self.admitted = 0
+        self.rejected = 0
+        self.service_time_ewma: Optional[float] = None
+        self.queue_wait_ewma = 0.0
+
+    def _ewma(self, current: Optional[float], sample: float) -> float:
+        return sample if current is None else current + self.EWMA_ALPHA * (sample - current)
+
+    def _expected_wait(self, position: int) -> float:
+        return (self.service_time_ewma or 0.0) * position / self.max_in_flight
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def _reject(self, position: int) -> int:
+        self.rejected += 1
+        retry_after = max(self._expected_wait(position), 1.0)
+        return min(math.ceil(retry_after), self.MAX_RETRY_AFTER)
+
+    def _admit(self, waited: float) -> None:
+        self.admitted += 1
+        self.queue_wait_ewma = self._ewma(self.queue_wait_ewma, waited)
+
+    async def acquire(self) -> Optional[int]:
+        """Wait for a slot; returns None once admitted, else the Retry-After seconds."""
+        if self.in_flight < self.max_in_flight and not self._waiters:
+            self.in_flight += 1
+            self._admit(0.0)
+            return None
+
+        position = len(self._waiters) + 1
+        if position > self.max_queue or self._expected_wait(position) > self.max_queue_wait_seconds:
+            return self._reject(position)
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        start_time = time.monotonic()
+        try:
+            await asyncio.wait_for(waiter, timeout=self.max_queue_wait_seconds)
+        except asyncio.TimeoutError:
+            # A slot may have been handed over just as the wait ran out
+            if not (waiter.done() and not waiter.cancelled()):
+                self._discard(waiter)
+                return self._reject(position)
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            else:
+                self._discard(waiter)
+            raise
+        self._admit(time.monotonic() - start_time)
+        return None
+
+    def _discard(self, waiter: asyncio.Future) -> None:
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+
+    def release(self, service_time: Optional[float] = None) -> None:
+        """Free a slot, handing it straight to the oldest waiter if there is one."""
+        if service_time is not None:
+            self.service_time_ewma = self._ewma(self.service_time_ewma, service_time)
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "queue_wait_ewma_seconds": round(self.queue_wait_ewma, 3),
+            "service_time_ewma_seconds": round(self.service_time_ewma, 3) if self.service_time_ewma is not None else None
+        }
+
+class AdmissionController:
+    """Holds the gates for the limited endpoints of this worker.
+
+    Limits come from ``DEFAULT_LIMITS`` and can be overridden per path through
+    ``ADMISSION_ENDPOINT_LIMITS``, e.g. ``{"/api/v1/daily-schedule": {"max_in_flight": 8}}``.
+    """
+
+    def __init__(self, overrides: Optional[Dict[str, Dict[str, float]]] = None):
+        config = Config()
+        self.enabled = config.admission_control_enabled
+        if overrides is None:
+            overrides = self._load_overrides(config.admission_endpoint_limits)
+        self.gates: Dict[str, EndpointGate] = {}
+        for path, defaults in DEFAULT_LIMITS.items():
+            limits = {**defaults, **overrides.get(path, {})}
+            self.gates[path] = EndpointGate(
+                path,
+                max_in_flight=int(limits["max_in_flight"]),
+                max_queue=int(limits["max_queue"]),
+                max_queue_wait_seconds=float(limits["max_queue_wait_seconds"])
+            )
+        self.response = NetworkResponse()
+
+    def _load_overrides(self, raw: Optional[str]) -> Dict[str, Dict[str, float]]:
+        if not raw:
+            return {}
+        try:
+            overrides = json.loads(raw)
+            unknown = set(overrides) - set(DEFAULT_LIMITS)
+            if unknown:
+                logger.warning(f"Ignoring unknown paths in ADMISSION_ENDPOINT_LIMITS: {sorted(unknown)}")
+            return overrides
+        except (json.JSONDecodeError, TypeError) as e:
+            logger.error(f"Invalid ADMISSION_ENDPOINT_LIMITS, using defaults: {str(e)}")
+            return {}
+
+    def gate_for(self, method: str, path: str) -> Optional[EndpointGate]:
+        if not self.enabled or method != "POST":
+            return None
+        return self.gates.get(path)
+
+    def rejection(self, path: str, retry_after: int, duration: float) -> FastJSONResponse:
+        return self.response.json_response(
+            http_code=HTTPCode.SERVICE_UNAVAILABLE,
+            error_code=ErrorCode.ServiceUnavailable.OVERLOADED,
+            error_message=Message.ErrorMessage.ServiceUnavailable.OVERLOADED,
+            resource=path,
+            duration=duration,
+            headers={"Retry-After": str(retry_after)}
+        )
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {path: gate.snapshot() for path, gate in self.gates.items()}
+
+class AdmissionControlMiddleware:
+    """ASGI middleware that admits or sheds requests before any work is done."""
+
+    def __init__(self, app, controller: AdmissionController):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope, receive, send):
+        gate = self.controller.gate_for(scope["method"], scope["path"]) if scope["type"] == "http" else None
+        if gate is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.monotonic()
+        retry_after = await gate.acquire()
+        if retry_after is not None:
+            logger.warning(f"Shedding {scope['path']}: {gate.in_flight} in flight, {gate.queued} queued")
+            rejection = self.controller.rejection(scope["path"], retry_after, time.monotonic() - start_time)
+            await rejection(scope, receive, send)
+            return
+
+        start_time = time.monotonic()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            gate.release(time.monotonic() - start_time)
@@ -0,0 +1,192 @@
+import logging
+import math
+import threading
+import time
+
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Tuple, TypeVar
+
+from com.mhire.app.config.config import Config
+
+logger = logging.getLogger(__name__)
+
+R = TypeVar('R')
+
+class CircuitOpenError(Exception):
+    """Raised without calling the upstream while its circuit is open."""
+
+    status_code = 503
+
+    def __init__(self, name: str, retry_after: float):
+        self.name = name
+        self.retry_after = retry_after
+        self.detail = f"Upstream '{name}' is temporarily unavailable"
+        self.headers = {"Retry-After": str(max(1, math.ceil(retry_after)))}
+        super().__init__(self.detail)
+
+class CircuitBreaker:
+    """Failure-rate circuit breaker for a single upstream dependency.
+
+    CLOSED: calls flow and outcomes are recorded in a sliding window (bounded by
+    both call count and age). When the failure rate in the window reaches the
+    threshold the breaker OPENS and every call fails fast. After ``open_seconds``
+    it goes HALF_OPEN and lets a few trial calls through: a success closes it,
+    a failure opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate_threshold: float = 0.5,
+        window_size: int = 20,
+        window_seconds: float = 60.0,
+        minimum_calls: int = 5,
+        open_seconds: float = 30.0,
+        half_open_max_calls: int = 1
+    ):
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.window_seconds = window_seconds
+        self.minimum_calls = minimum_calls
+        self.open_seconds = open_seconds
+        self.half_open_max_calls = half_open_max_calls
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+        self._outcomes: Deque[Tuple[float, bool]] = deque(maxlen=window_size)
+        self._lock = threading.Lock()
+
+    def _refresh(self, now: float) -> None:
+        if self._state == self.OPEN and now - self._opened_at >= self.open_seconds:
+            self._state = self.HALF_OPEN
+            self._half_open_calls = 0
+            logger.info(f"Circuit '{self.name}' half-open, allowing trial calls")
+        while self._outcomes and now - self._outcomes[0][0] > self.window_seconds:
+            self._outcomes.popleft()
+
+    def _open(self, now: float) -> None:
+        self._state = self.OPEN
+        self._opened_at = now
+        self._outcomes.clear()
+        logger.warning(f"Circuit '{self.name}' opened for {self.open_seconds}s")
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._refresh(time.monotonic())
+            return self._state
+
+    @property
+    def is_open(self) -> bool:
+        return self.state == self.OPEN
+
+    def before_call(self) -> None:
+        """Reserve a call, or raise CircuitOpenError if the upstream must not be called."""
+        with self._lock:
+            now = time.monotonic()
+            self._refresh(now)
+            if self._state == self.OPEN:
+                raise CircuitOpenError(self.name, self.open_seconds - (now - self._opened_at))
+            if self._state == self.HALF_OPEN:
+                if self._half_open_calls >= self.half_open_max_calls:
+                    raise CircuitOpenError(self.name, self.open_seconds)
+                self._half_open_calls += 1
+
+    def record_success(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            if self._state == self.HALF_OPEN:
+                self._state = self.CLOSED
+                self._outcomes.clear()
+                logger.info(f"Circuit '{self.name}' closed")
+            self._outcomes.append((now, True))
+
+    def record_failure(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            if self._state == self.HALF_OPEN:
+                self._open(now)
+                return
+            self._outcomes.append((now, False))
+            self._refresh(now)
+            failures = sum(1 for _, ok in self._outcomes if not ok)
+            if (len(self._outcomes) >= self.minimum_calls
+                    and failures / len(self._outcomes) >= self.failure_rate_threshold):
+                self._open(now)
+
+    def release(self) -> None:
+        """Give back a reserved call whose outcome says nothing about the upstream."""
+        with self._lock:
+            if self._state == self.HALF_OPEN and self._half_open_calls > 0:
+                self._half_open_calls -= 1
+
+    async def call(self, fn: Callable[..., Awaitable[R]], *args: Any, **kwargs: Any) -> R:
+        """Await ``fn`` through the breaker, recording its outcome."""
+        self.before_call()
+        try:
+            result = await fn(*args, **kwargs)
+        except Exception as e:
+            failure = is_upstream_failure(e)
+            if failure is None:
+                self.release()
+            elif failure:
+                self.record_failure()
+            else:
+                self.record_success()
+            raise
+        except BaseException:
+            # Cancelled by the caller
+            self.release()
+            raise
+        self.record_success()
+        return result
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            self._refresh(time.monotonic())
+            failures = sum(1 for _, ok in self._outcomes if not ok)
+            return {
+                "state": self._state,
+                "calls_in_window": len(self._outcomes),
+                "failure_rate": round(failures / len(self._outcomes), 3) if self._outcomes else 0.0
+            }
+
+def is_upstream_failure(exc: Exception) -> Optional[bool]:
+    """Count connection errors, timeouts, throttling and 5xx; not caller mistakes.
+
+    Exceptions may set ``upstream_failure`` to decide for themselves; None means
+    the outcome is neutral and should not be recorded at all.
+    """
+    if hasattr(exc, "upstream_failure"):
+        return exc.upstream_failure
+    status_code = getattr(exc, "status_code", None)
+    return status_code is None or status_code == 429 or status_code >= 500
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+def get_circuit_breaker(name: str) -> CircuitBreaker:
+    """Return the process-wide breaker for an upstream, creating it from Config."""
+    with _breakers_lock:
+        if name not in _breakers:
+            config = Config()
+            _breakers[name] = CircuitBreaker(
+                name,
+                failure_rate_threshold=config.circuit_failure_rate,
+                window_size=config.circuit_window_size,
+                window_seconds=config.circuit_window_seconds,
+                minimum_calls=config.circuit_minimum_calls,
+                open_seconds=config.circuit_open_seconds,
+                half_open_max_calls=config.circuit_half_open_calls
+            )
+        return _breakers[name]
+
+def circuit_breaker_snapshot() -> Dict[str, Dict[str, Any]]:
+    """State of every breaker, for the health endpoint."""
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {breaker.name: breaker.snapshot() for breaker in breakers}
@@ -0,0 +1,112 @@
+import asyncio
+import logging
+import threading
+import time
+
+from typing import Any, Awaitable, Dict, Optional, TypeVar
+
+from fastapi import Request
+
+from com.mhire.app.common.idempotency import IdempotencyManager
+from com.mhire.app.common.request_context import remaining_time
+
+logger = logging.getLogger(__name__)
+
+R = TypeVar('R')
+
+class ClientDisconnectedError(Exception):
+    """Raised when the client went away before its request's work finished."""
+
+    status_code = 499
+    # The upstream did nothing wrong
+    upstream_failure = None
+
+    def __init__(self, detail: str = "Client closed the request"):
+        self.detail = detail
+        super().__init__(detail)
+
+class CancellationTracker:
+    """Counts requests abandoned by their clients and how much work that saved, per endpoint."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._by_endpoint: Dict[str, Dict[str, float]] = {}
+
+    def record(self, endpoint: str, elapsed: float, budget_left: Optional[float]) -> None:
+        with self._lock:
+            stats = self._by_endpoint.setdefault(
+                endpoint, {"cancelled": 0, "elapsed_seconds": 0.0, "budget_left_seconds": 0.0}
+            )
+            stats["cancelled"] += 1
+            stats["elapsed_seconds"] += elapsed
+            stats["budget_left_seconds"] += max(budget_left or 0.0, 0.0)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            by_endpoint = {endpoint: dict(stats) for endpoint, stats in self._by_endpoint.items()}
+        return {
+            endpoint: {
+                "cancelled": int(stats["cancelled"]),
+                "elapsed_mean_seconds": round(stats["elapsed_seconds"] / stats["cancelled"], 3),
+                "budget_left_mean_seconds": round(stats["budget_left_seconds"] / stats["cancelled"], 3)
+            }
+            for endpoint, stats in by_endpoint.items()
+        }
+
+_tracker: Optional[CancellationTracker] = None
+_tracker_lock = threading.Lock()
+
+def get_cancellation_tracker() -> CancellationTracker:
+    global _tracker
+    with _tracker_lock:
+        if _tracker is None:
+            _tracker = CancellationTracker()
+        return _tracker
+
+def cancellation_snapshot() -> Dict[str, Any]:
+    """Cancelled requests per endpoint for the health endpoint."""
+    return _tracker.snapshot() if _tracker is not None else {}
+
+def record_cancellation(endpoint: str, elapsed: float) -> None:
+    """Count work abandoned by a client; call inside the request's scope."""
+    get_cancellation_tracker().record(endpoint, elapsed, remaining_time())
+    logger.info(f"Client disconnected from {endpoint} after {elapsed:.3f}s; work cancelled")
+
+async def _wait_for_disconnect(http_request: Request) -> bool:
+    """True once the client disconnects; False if the connection cannot be watched."""
+    try:
+        while True:
+            message = await http_request.receive()
+            if message["type"] == "http.disconnect":
+                return True
+    except Exception as e:
+        logger.warning(f"Cannot watch for client disconnect: {str(e)}")
+        return False
+
+async def run_until_disconnect(http_request: Request, endpoint: str, work: Awaitable[R]) -> R:
+    """Await ``work``, cancelling it with everything it started if the client goes away.
+
+    The work runs as a child task so a disconnect cancels its whole tree:
+    in-flight upstream calls, pending retries and the scheduler and admission
+    slots they hold are released at once. Requests with an ``Idempotency-Key``
+    are left to finish, since a retry of the same key attaches to them.
+    """
+    if http_request.headers.get(IdempotencyManager.HEADER):
+        return await work
+
+    start_time = time.monotonic()
+    task = asyncio.ensure_future(work)
+    watcher = asyncio.ensure_future(_wait_for_disconnect(http_request))
+    try:
+        await asyncio.wait({task, watcher}, return_when=asyncio.FIRST_COMPLETED)
+        if not task.done() and watcher.result():
+            task.cancel()
+            # Let the tree unwind so its slots are free before we answer
+            await asyncio.gather(task, return_exceptions=True)
+            record_cancellation(endpoint, time.monotonic() - start_time)
+            raise ClientDisconnectedError()
+        return await task
+    finally:
+        watcher.cancel()
+        if not task.done():
+            task.cancel()
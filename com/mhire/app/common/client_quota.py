@@ -0,0 +1,282 @@
+import hashlib
+import ipaddress
+import json
+import logging
+import math
+import threading
+import time
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from com.mhire.app.config.config import Config
+from com.mhire.app.common.admin_auth import is_admin
+from com.mhire.app.common.shared_store import SharedStore, get_shared_store
+from com.mhire.app.common.network_responses import NetworkResponse, FastJSONResponse, HTTPCode, ErrorCode, Message
+
+logger = logging.getLogger(__name__)
+
+API_KEY_HEADER = "X-API-Key"
+LIMIT_HEADERS = ("X-RateLimit-Limit", "X-RateLimit-Remaining", "X-RateLimit-Reset")
+
+# Cost units charged per request, and each client's limit in units per window, per endpoint.
+# The weights follow the LLM work behind each endpoint: one essay costs several sentiment calls.
+DEFAULT_QUOTAS: Dict[str, Dict[str, float]] = {
+    "/api/v1/sentiment-analyze": {"cost": 1, "limit": 60},
+    "/api/v1/daily-schedule": {"cost": 3, "limit": 60},
+    "/api/v1/personalized-content": {"cost": 5, "limit": 50},
+    "/api/v1/multi-day-schedule": {"cost": 15, "limit": 60},
+}
+
+class QuotaDecision:
+    """Outcome of charging one request: whether it may run and the headers describing the quota."""
+
+    def __init__(
+        self, allowed: bool, limit: int, remaining: int, reset: int,
+        charged: Sequence[str] = (), cost: int = 0, charged_at: float = 0
+    ):
+        self.allowed = allowed
+        self.limit = limit
+        self.remaining = remaining
+        self.reset = reset
+        # What to give back if the request is shed after all
+        self.charged = charged
+        self.cost = cost
+        self.charged_at = charged_at
+
+    def headers(self) -> List[Tuple[bytes, bytes]]:
+        values = (self.limit, self.remaining, self.reset)
+        return [(name.lower().encode(), str(value).encode()) for name, value in zip(LIMIT_HEADERS, values)]
+
+class ClientQuotas:
+    """Sliding-window quotas per client, counted in the shared store so they hold across workers.
+
+    A client is a configured API key (``X-API-Key`` listed in ``QUOTA_API_KEYS``,
+    whose value multiplies its limits) or else the client IP. Behind a proxy
+    listed in ``trusted_proxies`` the IP comes from ``X-Real-IP`` or the last
+    untrusted hop of ``X-Forwarded-For``; from anyone else those headers are
+    ignored, since a caller could set them to dodge its quota. Each request is
+    charged its endpoint's ``cost`` against two limits: the endpoint's own and
+    ``client_limit`` across all endpoints. A window is approximated from two
+    fixed-window counters, the previous one weighted by how much of it still
+    overlaps the sliding window, so a burst at a window edge cannot double the
+    limit. A request over either limit is refunded and rejected with 429, and
+    one answered with 503 (shed by admission control, or a provider outage) is
+    refunded too, since the client got nothing for it. Admin requests are never
+    charged, and a store error lets the request through.
+    """
+
+    def __init__(
+        self,
+        window: float = 60,
+        client_limit: int = 120,
+        overrides: Optional[Dict[str, Dict[str, float]]] = None,
+        api_keys: Optional[Dict[str, float]] = None,
+        trusted_proxies: Sequence[str] = (),
+        store: Optional[SharedStore] = None
+    ):
+        self.window = window
+        self.client_limit = client_limit
+        self.quotas = {path: {**defaults, **(overrides or {}).get(path, {})} for path, defaults in DEFAULT_QUOTAS.items()}
+        # Only hashes of the keys are kept, and only hashes reach the store
+        self.api_keys = {self._hash(key): float(multiplier) for key, multiplier in (api_keys or {}).items()}
+        # "*" trusts every peer, for an app only reachable through its proxy
+        self.trust_any_proxy = "*" in trusted_proxies
+        self.trusted_proxies = [
+            ipaddress.ip_network(proxy, strict=False) for proxy in trusted_proxies if proxy != "*"
+        ]
+        self._store = store
+        self.response = NetworkResponse()
+        self._counts: Dict[str, Dict[str, int]] = {path: {"allowed": 0, "rejected": 0, "refunded": 0} for path in self.quotas}
+        self.store_errors = 0
+
+    @property
+    def store(self) -> SharedStore:
+        if self._store is None:
+            self._store = get_shared_store()
+        return self._store
+
+    @staticmethod
+    def _hash(value: str) -> str:
+        return hashlib.sha256(value.encode()).hexdigest()[:16]
+
+    def quota_for(self, method: str, path: str) -> Optional[Dict[str, float]]:
+        return self.quotas.get(path) if method == "POST" else None
+
+    def client_of(self, scope, headers: Dict[str, str]) -> Tuple[str, float]:
+        """``(client id, limit multiplier)``; unknown API keys count as their IP."""
+        api_key = headers.get(API_KEY_HEADER.title())
+        if api_key:
+            hashed = self._hash(api_key)
+            if hashed in self.api_keys:
+                return f"key:{hashed}", self.api_keys[hashed]
+        client = scope.get("client")
+        peer = client[0] if client else None
+        if peer is None or not self._is_trusted(peer):
+            return f"ip:{peer or 'unknown'}", 1.0
+        real_ip = headers.get("X-Real-Ip", "").strip()
+        if real_ip:
+            return f"ip:{real_ip}", 1.0
+        # The rightmost hop not added by one of our proxies is the caller
+        for hop in reversed([hop.strip() for hop in headers.get("X-Forwarded-For", "").split(",") if hop.strip()]):
+            if not self._is_trusted(hop):
+                return f"ip:{hop}", 1.0
+        return f"ip:{peer}", 1.0
+
+    def _is_trusted(self, address: str) -> bool:
+        if self.trust_any_proxy:
+            return True
+        try:
+            ip = ipaddress.ip_address(address)
+        except ValueError:
+            return False
+        return any(ip in network for network in self.trusted_proxies)
+
+    async def _charge(self, key: str, cost: int, limit: int, now: float) -> Tuple[bool, int]:
+        """Add ``cost`` to a sliding window; returns (within limit, units used)."""
+        index, offset = divmod(now, self.window)
+        current = await self.store.incr(f"{key}:{int(index)}", cost, ttl=2 * self.window)
+        previous = await self.store.get(f"{key}:{int(index) - 1}")
+        used = current + int(previous or 0) * (1 - offset / self.window)
+        if used > limit:
+            await self._refund(key, cost, now)
+            return False, math.ceil(used - cost)
+        return True, math.ceil(used)
+
+    async def _refund(self, key: str, cost: int, now: float) -> None:
+        await self.store.incr(f"{key}:{int(now // self.window)}", -cost, ttl=2 * self.window)
+
+    async def check(self, path: str, client: str, multiplier: float) -> QuotaDecision:
+        quota = self.quotas[path]
+        cost = int(quota["cost"])
+        limits = {
+            f"quota:{client}:{path}": int(quota["limit"] * multiplier),
+            f"quota:{client}": int(self.client_limit * multiplier),
+        }
+        now = time.time()
+        reset = math.ceil(self.window - now % self.window)
+        remaining = []
+        charged = []
+        for key, limit in limits.items():
+            allowed, used = await self._charge(key, cost, limit, now)
+            if not allowed:
+                # Give back what the other limit was already charged
+                for earlier in charged:
+                    await self._refund(earlier, cost, now)
+                self._counts[path]["rejected"] += 1
+                return QuotaDecision(False, limit, max(limit - used, 0), reset)
+            charged.append(key)
+            remaining.append((limit - used, limit))
+        self._counts[path]["allowed"] += 1
+        left, limit = min(remaining)
+        return QuotaDecision(True, limit, max(left, 0), reset, charged, cost, now)
+
+    async def refund(self, path: str, decision: QuotaDecision) -> None:
+        """Give back an allowed request's charge, counted against the window it was charged in."""
+        for key in decision.charged:
+            await self._refund(key, decision.cost, decision.charged_at)
+        self._counts[path]["refunded"] += 1
+
+    def rejection(self, path: str, decision: QuotaDecision, duration: float) -> FastJSONResponse:
+        return self.response.json_response(
+            http_code=HTTPCode.TOO_MANY_REQUESTS,
+            error_code=ErrorCode.TooManyRequests.QUOTA_EXCEEDED,
+            error_message=Message.ErrorMessage.TooManyRequests.QUOTA_EXCEEDED,
+            resource=path,
+            duration=duration,
+            headers={
+                **{name.decode(): value.decode() for name, value in decision.headers()},
+                "Retry-After": str(decision.reset)
+            }
+        )
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Requests this worker let through, rejected and refunded per endpoint."""
+        return {
+            "window_seconds": self.window,
+            "client_limit": self.client_limit,
+            "endpoints": {path: {**self._counts[path], **self.quotas[path]} for path in self.quotas},
+            "store_errors": self.store_errors
+        }
+
+class ClientQuotaMiddleware:
+    """ASGI middleware that charges each generation request to its client's quota."""
+
+    def __init__(self, app, quotas: ClientQuotas):
+        self.app = app
+        self.quotas = quotas
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self.quotas.quota_for(scope["method"], scope["path"]) is None:
+            await self.app(scope, receive, send)
+            return
+        headers = {key.decode("latin-1").title(): value.decode("latin-1") for key, value in scope["headers"]}
+        if is_admin(headers):
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.monotonic()
+        client, multiplier = self.quotas.client_of(scope, headers)
+        try:
+            decision = await self.quotas.check(scope["path"], client, multiplier)
+        except Exception as e:
+            # Quotas protect capacity; an unreachable store should not take the API down with it
+            self.quotas.store_errors += 1
+            logger.warning(f"Quota check failed, allowing request: {str(e)}")
+            await self.app(scope, receive, send)
+            return
+
+        if not decision.allowed:
+            logger.warning(f"Quota exceeded on {scope['path']} by {client}")
+            rejection = self.quotas.rejection(scope["path"], decision, time.monotonic() - start_time)
+            await rejection(scope, receive, send)
+            return
+
+        status = None
+
+        async def send_with_limits(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message = {**message, "headers": [*message.get("headers", []), *decision.headers()]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_limits)
+        finally:
+            if status == HTTPCode.SERVICE_UNAVAILABLE:
+                try:
+                    await self.quotas.refund(scope["path"], decision)
+                except Exception as e:
+                    self.quotas.store_errors += 1
+                    logger.warning(f"Quota refund failed: {str(e)}")
+
+def _load_json(name: str, raw: Optional[str]) -> Dict[str, Any]:
+    if not raw:
+        return {}
+    try:
+        return json.loads(raw)
+    except (json.JSONDecodeError, TypeError) as e:
+        logger.error(f"Invalid {name}, using defaults: {str(e)}")
+        return {}
+
+_client_quotas: Optional[ClientQuotas] = None
+_client_quotas_lock = threading.Lock()
+
+def get_client_quotas() -> ClientQuotas:
+    """Return the worker-wide quotas configured by ``QUOTA_*`` settings."""
+    global _client_quotas
+    with _client_quotas_lock:
+        if _client_quotas is None:
+            config = Config()
+            overrides = _load_json("QUOTA_ENDPOINT_LIMITS", config.quota_endpoint_limits)
+            unknown = set(overrides) - set(DEFAULT_QUOTAS)
+            if unknown:
+                logger.warning(f"Ignoring unknown paths in QUOTA_ENDPOINT_LIMITS: {sorted(unknown)}")
+            _client_quotas = ClientQuotas(
+                window=config.quota_window_seconds,
+                client_limit=config.quota_client_limit,
+                overrides=overrides,
+                api_keys=_load_json("QUOTA_API_KEYS", config.quota_api_keys),
+                trusted_proxies=config.quota_trusted_proxies
+            )
+        return _client_quotas
@@ -16,10 +16,14 @@ def rethrow_as_http_exception(exc: Exception):
     # Extract error detail
     detail = str(getattr(exc, "detail", exc))
 
+    # Keep response headers such as Retry-After
+    headers = getattr(exc, "headers", None)
+
     # Log the actual error before raising HTTPException
     logger.error(f"Rethrowing exception: status_code={status_code}, detail={detail}")
 
     raise HTTPException(
         status_code=status_code,
-        detail=detail
+        detail=detail,
+        headers=headers
     )
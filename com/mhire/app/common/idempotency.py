@@ -0,0 +1,137 @@
+import asyncio
+import hashlib
+import json
+import logging
+import time
+
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from fastapi import Request
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+from com.mhire.app.config.config import Config
+from com.mhire.app.common.shared_store import SharedStore, get_shared_store
+from com.mhire.app.common.network_responses import NetworkResponse, HTTPCode, ErrorCode, Message
+
+logger = logging.getLogger(__name__)
+
+class IdempotencyManager:
+    """Deduplicates retried POSTs that carry an ``Idempotency-Key`` header.
+
+    The first request for a key runs the handler; duplicates in the same worker
+    attach to the in-flight task, duplicates in other workers poll the shared
+    store until the stored result appears. Only successful responses are kept,
+    so a failed run can be retried with the same key.
+    """
+
+    HEADER = "Idempotency-Key"
+    REPLAY_HEADER = "Idempotent-Replayed"
+    POLL_INTERVAL = 0.5
+
+    def __init__(self, store: Optional[SharedStore] = None):
+        config = Config()
+        self.store = store or get_shared_store()
+        self.ttl = config.idempotency_ttl_seconds
+        self.wait_seconds = config.idempotency_wait_seconds
+        self.response = NetworkResponse()
+        self._in_flight: Dict[str, Tuple[str, asyncio.Task]] = {}
+
+    def _fingerprint(self, payload: BaseModel) -> str:
+        return hashlib.sha256(payload.model_dump_json().encode()).hexdigest()
+
+    def _replay(self, status_code: int, body: bytes) -> Response:
+        return Response(
+            content=body,
+            status_code=status_code,
+            media_type="application/json",
+            headers={self.REPLAY_HEADER: "true"}
+        )
+
+    def _error(self, http_code: int, error_code: int, message: str, resource: str, start_time: float) -> Response:
+        return self.response.json_response(
+            http_code=http_code,
+            error_code=error_code,
+            error_message=message,
+            resource=resource,
+            duration=time.time() - start_time
+        )
+
+    async def _execute(self, store_key: str, fingerprint: str, handler: Callable[[], Awaitable[Response]]) -> Response:
+        """Run the handler as the owner of the key and record the outcome."""
+        try:
+            result = await handler()
+        except BaseException:
+            await self.store.delete(store_key)
+            raise
+
+        if 200 <= result.status_code < 300:
+            record = {
+                "state": "completed",
+                "fingerprint": fingerprint,
+                "status_code": result.status_code,
+                "body": result.body.decode()
+            }
+            await self.store.set(store_key, json.dumps(record).encode(), self.ttl)
+        else:
+            await self.store.delete(store_key)
+        return result
+
+    async def run(self, http_request: Request, payload: BaseModel, handler: Callable[[], Awaitable[Response]]) -> Response:
+        """Run ``handler`` at most once per Idempotency-Key and replay its stored result."""
+        key = http_request.headers.get(self.HEADER)
+        if not key:
+            return await handler()
+
+        start_time = time.time()
+        resource = http_request.url.path
+        store_key = f"idempotency:{resource}:{key}"
+        fingerprint = self._fingerprint(payload)
+        deadline = start_time + self.wait_seconds
+
+        while True:
+            # Attach to a run already in progress in this worker
+            in_flight = self._in_flight.get(store_key)
+            if in_flight is not None:
+                if in_flight[0] != fingerprint:
+                    break
+                result = await asyncio.shield(in_flight[1])
+                logger.info(f"Idempotency-Key {key} attached to in-flight request")
+                return self._replay(result.status_code, result.body)
+
+            # Try to become the owner of this key
+            pending = json.dumps({"state": "pending", "fingerprint": fingerprint}).encode()
+            if await self.store.add(store_key, pending, self.wait_seconds):
+                task = asyncio.ensure_future(self._execute(store_key, fingerprint, handler))
+                self._in_flight[store_key] = (fingerprint, task)
+                task.add_done_callback(lambda _: self._in_flight.pop(store_key, None))
+                return await asyncio.shield(task)
+
+            raw = await self.store.get(store_key)
+            if raw is not None:
+                record = json.loads(raw)
+                if record.get("fingerprint") != fingerprint:
+                    break
+                if record["state"] == "completed":
+                    logger.info(f"Idempotency-Key {key} served from stored result")
+                    return self._replay(record["status_code"], record["body"].encode())
+
+            # Another worker owns the key; wait for its result or for the claim to lapse
+            if time.time() >= deadline:
+                return self._error(
+                    HTTPCode.CONFLICT,
+                    ErrorCode.Conflict.REQUEST_IN_PROGRESS,
+                    Message.ErrorMessage.Conflict.REQUEST_IN_PROGRESS,
+                    resource,
+                    start_time
+                )
+            await asyncio.sleep(self.POLL_INTERVAL)
+
+        logger.warning(f"Idempotency-Key {key} reused with a different request body")
+        return self._error(
+            HTTPCode.UNPROCESSABLE_ENTITY,
+            ErrorCode.UnprocessableEntity.IDEMPOTENCY_KEY_REUSED,
+            Message.ErrorMessage.UnprocessableEntity.IDEMPOTENCY_KEY_REUSED,
+            resource,
+            start_time
+        )
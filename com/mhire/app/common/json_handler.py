@@ -1,14 +1,40 @@
+from functools import lru_cache
 from typing import Any, Dict, Optional, Type, TypeVar
 import json
 import logging
 import re
-from pydantic import BaseModel, ValidationError
+import threading
+from pydantic import BaseModel, TypeAdapter, ValidationError
 from com.mhire.app.common.exceptions_utility import rethrow_as_http_exception
 
 logger = logging.getLogger(__name__)
 
 T = TypeVar('T', bound=BaseModel)
 
+@lru_cache(maxsize=None)
+def get_type_adapter(target: Any) -> TypeAdapter:
+    """Build the compiled validator for a model or type once and reuse it."""
+    return TypeAdapter(target)
+
+# How LLM output was parsed: as sent, after cleanup, or not at all
+_parse_outcomes: Dict[str, int] = {"clean": 0, "repaired": 0, "failed": 0}
+_parse_lock = threading.Lock()
+
+def _count_parse(outcome: str) -> None:
+    with _parse_lock:
+        _parse_outcomes[outcome] += 1
+
+def json_parse_snapshot() -> Dict[str, Any]:
+    """Parse outcome counts of this worker; repaired and failed should stay near zero with schema output."""
+    with _parse_lock:
+        counts = dict(_parse_outcomes)
+    total = sum(counts.values())
+    return {**counts, "clean_rate": round(counts["clean"] / total, 3) if total else None}
+
+def _is_json_syntax_error(error: ValidationError) -> bool:
+    """Whether a validation error was raised by the JSON parser rather than the schema."""
+    return any(err.get("type") == "json_invalid" for err in error.errors())
+
 class LLMJsonHandler:
     """Handles parsing and validation of JSON responses from LLMs."""
     
@@ -39,15 +65,20 @@ class LLMJsonHandler:
         """Parse a potentially malformed JSON string into a Python dict with retry logic."""
         try:
             # First try direct parsing
-            return json.loads(json_str)
+            data = json.loads(json_str)
+            _count_parse("clean")
+            return data
         except json.JSONDecodeError:
             if retry_count >= max_retries:
                 logger.error("Failed to parse JSON after all retries")
+                _count_parse("failed")
                 rethrow_as_http_exception(Exception("Invalid JSON response from LLM"))
             
             try:
                 cleaned_json = self.clean_json_string(json_str)
-                return json.loads(cleaned_json)
+                data = json.loads(cleaned_json)
+                _count_parse("repaired")
+                return data
             except json.JSONDecodeError:
                 logger.warning(f"Failed to parse JSON (attempt {retry_count + 1})")
                 return self.parse_json(json_str, max_retries, retry_count + 1)
@@ -55,13 +86,16 @@ class LLMJsonHandler:
     def validate_model(self, data: Dict[str, Any], model_class: Type[T]) -> T:
         """Validate parsed JSON data against a Pydantic model."""
         try:
-            return model_class(**data)
+            return get_type_adapter(model_class).validate_python(data)
         except ValidationError as e:
             logger.error(f"Data validation failed: {str(e)}")
             rethrow_as_http_exception(e)
 
     def process_llm_response(self, response_content: str, model_class: Type[T], max_retries: int = 3) -> T:
         """Process an LLM response string into a validated model instance.
+
+        Well-formed JSON is parsed and validated in a single pass by the cached
+        validator; only malformed output falls back to cleanup and retries.
         
         Args:
             response_content: The raw response content from the LLM
@@ -72,6 +106,15 @@ class LLMJsonHandler:
             An instance of the specified model class
         """
         try:
+            # Fast path: parse and validate straight from the raw string
+            try:
+                result = get_type_adapter(model_class).validate_json(response_content)
+                _count_parse("clean")
+                return result
+            except ValidationError as e:
+                if not _is_json_syntax_error(e):
+                    raise
+
             # Parse JSON with retries
             json_data = self.parse_json(response_content, max_retries)
             
@@ -0,0 +1,60 @@
+import asyncio
+import logging
+import os
+import threading
+
+from typing import Callable, Generic, List, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+_registry: List["LazyService"] = []
+
+class LazyService(Generic[T]):
+    """Builds a service on first use instead of at import time.
+
+    Construction is thread-safe and happens at most once per process: the
+    instance is rebuilt after a fork, so SDK clients (and their sockets) are
+    never shared between gunicorn workers forked from a preloaded master.
+    A failed construction is not cached and is retried on the next call.
+    """
+
+    def __init__(self, factory: Callable[[], T], name: str):
+        self.factory = factory
+        self.name = name
+        self._instance: Optional[T] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    @property
+    def initialized(self) -> bool:
+        return self._instance is not None and self._pid == os.getpid()
+
+    def get(self) -> T:
+        """Return the service, constructing it on first use in this process."""
+        if self.initialized:
+            return self._instance
+        with self._lock:
+            if not self.initialized:
+                self._instance = self.factory()
+                self._pid = os.getpid()
+                logger.info(f"Initialized service {self.name}")
+        return self._instance
+
+    async def warm(self, prewarm_connections: bool = False) -> bool:
+        """Construct the service and optionally open its upstream connections."""
+        try:
+            service = await asyncio.to_thread(self.get)
+            prewarm = getattr(service, "prewarm", None)
+            if prewarm_connections and prewarm is not None:
+                await prewarm()
+            return True
+        except Exception as e:
+            logger.error(f"Failed to warm service {self.name}: {str(getattr(e, 'detail', e))}")
+            return False
+
+async def warm_services(prewarm_connections: bool = False) -> None:
+    """Warm every registered service concurrently; failures are logged, not raised."""
+    await asyncio.gather(*(service.warm(prewarm_connections) for service in _registry))
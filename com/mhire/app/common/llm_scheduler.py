@@ -0,0 +1,215 @@
+import asyncio
+import itertools
+import json
+import logging
+import threading
+import time
+
+from contextlib import asynccontextmanager
+from enum import IntEnum
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from com.mhire.app.config.config import Config
+from com.mhire.app.common.request_context import DeadlineExceededError, current_context, remaining_time
+
+logger = logging.getLogger(__name__)
+
+class Priority(IntEnum):
+    """Lower value is served first."""
+    INTERACTIVE = 0
+    STANDARD = 1
+    BULK = 2
+    BACKGROUND = 3
+
+# Sentiment is the first step users wait on; essays and content bundles can wait,
+# and speculative work only runs on capacity nobody is waiting for.
+ENDPOINT_PRIORITIES: Dict[str, Priority] = {
+    "sentiment_analyze": Priority.INTERACTIVE,
+    "daily_schedule": Priority.STANDARD,
+    "personalized_content": Priority.BULK,
+    "multi_day_schedule": Priority.BULK,
+    "speculative_prefetch": Priority.BACKGROUND,
+}
+
+DEFAULT_WEIGHTS: Dict[Priority, float] = {
+    Priority.INTERACTIVE: 8.0,
+    Priority.STANDARD: 4.0,
+    Priority.BULK: 2.0,
+    Priority.BACKGROUND: 1.0,
+}
+
+def current_priority() -> Priority:
+    """Priority class of the request being served, STANDARD outside a request."""
+    context = current_context()
+    if context is None:
+        return Priority.STANDARD
+    return ENDPOINT_PRIORITIES.get(context.endpoint, Priority.STANDARD)
+
+class _Waiter:
+    def __init__(self, priority: Priority, sequence: int, future: asyncio.Future):
+        self.priority = priority
+        self.sequence = sequence
+        self.future = future
+        self.enqueued_at = time.monotonic()
+
+class LLMScheduler:
+    """Admits upstream LLM calls into a bounded pool by priority class.
+
+    While fewer than ``max_concurrency`` calls are running a call starts at once.
+    Otherwise it waits and freed slots go to the most urgent waiter:
+
+    - ``priority``: strict priority, FIFO within a class. A waiter's class
+      improves by one level every ``aging_seconds`` it waits, so bulk and
+      background work is never starved indefinitely.
+    - ``weighted``: weighted fair sharing. Each class has a virtual time that
+      advances by ``1 / weight`` per dispatched call; the waiting class with the
+      lowest virtual time is served, so every class gets a share of the slots
+      proportional to its weight.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        policy: str = "priority",
+        aging_seconds: float = 5.0,
+        weights: Optional[Dict[Priority, float]] = None
+    ):
+        if policy not in ("priority", "weighted"):
+            logger.warning(f"Unknown LLM scheduler policy '{policy}', using priority")
+            policy = "priority"
+        self.max_concurrency = max_concurrency
+        self.policy = policy
+        self.aging_seconds = aging_seconds
+        self.weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+        self.running = 0
+        self._waiters: List[_Waiter] = []
+        self._sequence = itertools.count()
+        self._virtual_time: Dict[Priority, float] = {priority: 0.0 for priority in Priority}
+        self._dispatched: Dict[Priority, int] = {priority: 0 for priority in Priority}
+        self._wait_total: Dict[Priority, float] = {priority: 0.0 for priority in Priority}
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def _urgency(self, waiter: _Waiter, now: float) -> tuple:
+        if self.policy == "weighted":
+            return (self._virtual_time[waiter.priority], waiter.sequence)
+        aged = waiter.priority - (now - waiter.enqueued_at) / self.aging_seconds
+        return (aged, waiter.sequence)
+
+    def _record_dispatch(self, priority: Priority, waited: float) -> None:
+        self._dispatched[priority] += 1
+        self._wait_total[priority] += waited
+        # A class that was idle restarts level with the waiting classes instead of banking credit
+        floor = min(
+            (self._virtual_time[waiter.priority] for waiter in self._waiters),
+            default=self._virtual_time[priority]
+        )
+        self._virtual_time[priority] = max(self._virtual_time[priority], floor) + 1.0 / self.weights[priority]
+
+    def _dispatch_next(self) -> bool:
+        """Hand a freed slot to the most urgent live waiter; False if none is waiting."""
+        now = time.monotonic()
+        # A cancelled waiter stays queued until its task runs again; skip it
+        self._waiters = [waiter for waiter in self._waiters if not waiter.future.done()]
+        if not self._waiters:
+            return False
+        chosen = min(self._waiters, key=lambda waiter: self._urgency(waiter, now))
+        self._waiters.remove(chosen)
+        self._record_dispatch(chosen.priority, now - chosen.enqueued_at)
+        chosen.future.set_result(None)
+        return True
+
+    async def acquire(self, priority: Priority, timeout: Optional[float] = None) -> None:
+        """Wait for a slot; raises DeadlineExceededError if ``timeout`` runs out first."""
+        if self.running < self.max_concurrency and not self._waiters:
+            self.running += 1
+            self._record_dispatch(priority, 0.0)
+            return
+
+        waiter = _Waiter(priority, next(self._sequence), asyncio.get_running_loop().create_future())
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter.future, timeout=timeout)
+        except asyncio.TimeoutError:
+            # A slot may have been handed over just as the wait ran out
+            if not (waiter.future.done() and not waiter.future.cancelled()):
+                self._discard(waiter)
+                raise DeadlineExceededError("Request time budget exhausted while queued for the model")
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                self.release()
+            else:
+                self._discard(waiter)
+            raise
+
+    def _discard(self, waiter: _Waiter) -> None:
+        if waiter in self._waiters:
+            self._waiters.remove(waiter)
+
+    def release(self) -> None:
+        if not self._dispatch_next():
+            self.running -= 1
+
+    @asynccontextmanager
+    async def slot(self, priority: Optional[Priority] = None) -> AsyncIterator[float]:
+        """Hold a slot for one upstream call, waiting at most the request's remaining budget.
+
+        Yields the seconds spent waiting for the slot.
+        """
+        remaining = remaining_time()
+        if remaining is not None and remaining <= 0:
+            raise DeadlineExceededError()
+        start_time = time.monotonic()
+        await self.acquire(current_priority() if priority is None else priority, timeout=remaining)
+        try:
+            yield time.monotonic() - start_time
+        finally:
+            self.release()
+
+    def snapshot(self) -> Dict[str, Any]:
+        queued = {priority.name.lower(): 0 for priority in Priority}
+        for waiter in self._waiters:
+            queued[waiter.priority.name.lower()] += 1
+        return {
+            "policy": self.policy,
+            "running": self.running,
+            "max_concurrency": self.max_concurrency,
+            "queued": queued,
+            "dispatched": {priority.name.lower(): count for priority, count in self._dispatched.items()},
+            "mean_wait_seconds": {
+                priority.name.lower(): round(self._wait_total[priority] / count, 3) if count else 0.0
+                for priority, count in self._dispatched.items()
+            }
+        }
+
+def _load_weights(raw: Optional[str]) -> Dict[Priority, float]:
+    if not raw:
+        return {}
+    try:
+        return {Priority[name.upper()]: float(weight) for name, weight in json.loads(raw).items()}
+    except (json.JSONDecodeError, KeyError, TypeError, ValueError, AttributeError) as e:
+        logger.error(f"Invalid LLM_SCHEDULER_WEIGHTS, using defaults: {str(e)}")
+        return {}
+
+_scheduler: Optional[LLMScheduler] = None
+_scheduler_lock = threading.Lock()
+
+def get_llm_scheduler() -> LLMScheduler:
+    """Return the worker-wide scheduler configured by ``LLM_*`` settings."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            config = Config()
+            _scheduler = LLMScheduler(
+                max_concurrency=config.llm_max_concurrency,
+                policy=config.llm_scheduler_policy,
+                aging_seconds=config.llm_scheduler_aging_seconds,
+                weights=_load_weights(config.llm_scheduler_weights)
+            )
+        return _scheduler
+
+def llm_scheduler_snapshot() -> Optional[Dict[str, Any]]:
+    """Scheduler state for the health endpoint, None before the first LLM call."""
+    return _scheduler.snapshot() if _scheduler is not None else None
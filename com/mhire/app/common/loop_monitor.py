@@ -0,0 +1,219 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+import weakref
+
+from collections import deque
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, List, Optional
+
+from com.mhire.app.config.config import Config
+
+logger = logging.getLogger(__name__)
+
+_active_route: ContextVar[Optional[str]] = ContextVar("active_route", default=None)
+
+NO_ROUTE = "(no request)"
+
+class BlockedLoopEvent:
+    """One stall of the event loop longer than the threshold."""
+
+    def __init__(self, route: str, stack: List[str], started_at: float):
+        self.route = route
+        self.stack = stack
+        self.started_at = started_at
+        self.captured_at = time.time()
+        self.duration: Optional[float] = None
+
+    def to_dict(self, with_stack: bool = True) -> Dict[str, Any]:
+        event = {
+            "route": self.route,
+            "captured_at": self.captured_at,
+            "duration_seconds": round(self.duration, 3) if self.duration is not None else None
+        }
+        if with_stack:
+            event["stack"] = self.stack
+        return event
+
+class LoopLagMonitor:
+    """Measures event-loop lag and catches calls that block the loop.
+
+    A heartbeat task sleeps ``interval`` seconds at a time; how late it wakes up
+    is the loop lag. A watchdog thread checks the heartbeat, and once it is
+    more than ``block_threshold`` seconds overdue it captures the loop thread's
+    stack while the blocking call is still on it. The stall is attributed to
+    the route of the task that is running: requests are tagged by
+    ``LoopMonitorMiddleware`` and tasks they spawn inherit the tag.
+    """
+
+    STACK_DEPTH = 15
+
+    def __init__(self, interval: float = 0.05, block_threshold: float = 0.25, window: int = 1200, max_events: int = 50):
+        self.interval = interval
+        self.block_threshold = block_threshold
+        self._lags: Deque[float] = deque(maxlen=window)
+        self._events: Deque[BlockedLoopEvent] = deque(maxlen=max_events)
+        self._by_route: Dict[str, Dict[str, float]] = {}
+        self._task_routes: "weakref.WeakKeyDictionary[asyncio.Task, str]" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self._stall: Optional[BlockedLoopEvent] = None
+        self._last_beat = time.monotonic()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._heartbeat: Optional[asyncio.Task] = None
+        self._stopped = threading.Event()
+        self._previous_factory = None
+
+    @property
+    def running(self) -> bool:
+        return self._heartbeat is not None
+
+    def start(self) -> None:
+        """Start monitoring the running loop; call from the loop thread."""
+        if self._heartbeat is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._previous_factory = self._loop.get_task_factory()
+        self._loop.set_task_factory(self._task_factory)
+        self._last_beat = time.monotonic()
+        self._stopped.clear()
+        self._heartbeat = self._loop.create_task(self._beat())
+        threading.Thread(target=self._watch, name="loop-lag-watchdog", daemon=True).start()
+        logger.info(f"Event loop monitor started (block threshold {self.block_threshold}s)")
+
+    async def stop(self) -> None:
+        self._stopped.set()
+        if self._heartbeat is not None:
+            self._heartbeat.cancel()
+            try:
+                await self._heartbeat
+            except asyncio.CancelledError:
+                pass
+            self._heartbeat = None
+        if self._loop is not None:
+            self._loop.set_task_factory(self._previous_factory)
+
+    def _task_factory(self, loop: asyncio.AbstractEventLoop, coro, **kwargs):
+        if self._previous_factory is not None:
+            task = self._previous_factory(loop, coro, **kwargs)
+        else:
+            task = asyncio.Task(coro, loop=loop, **kwargs)
+        context = kwargs.get("context")
+        route = context.get(_active_route) if context is not None else _active_route.get()
+        if route is not None:
+            self._task_routes[task] = route
+        return task
+
+    def tag_current_task(self, route: str) -> None:
+        """Attribute the running task, and the tasks it creates, to ``route``."""
+        _active_route.set(route)
+        task = asyncio.current_task()
+        if task is not None:
+            self._task_routes[task] = route
+
+    def untag_current_task(self) -> None:
+        task = asyncio.current_task()
+        if task is not None:
+            self._task_routes.pop(task, None)
+
+    async def _beat(self) -> None:
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            lag = max(now - expected, 0.0)
+            with self._lock:
+                self._last_beat = now
+                self._lags.append(lag)
+                stall, self._stall = self._stall, None
+            if stall is not None:
+                self._finish(stall, lag)
+
+    def _finish(self, stall: BlockedLoopEvent, lag: float) -> None:
+        stall.duration = lag
+        with self._lock:
+            self._events.append(stall)
+            route_stats = self._by_route.setdefault(stall.route, {"count": 0, "blocked_seconds": 0.0})
+            route_stats["count"] += 1
+            route_stats["blocked_seconds"] += lag
+        logger.warning(
+            f"Event loop blocked for {lag:.3f}s in {stall.route}; stack at detection:\n" + "".join(stall.stack)
+        )
+
+    def _watch(self) -> None:
+        while not self._stopped.wait(self.interval):
+            with self._lock:
+                overdue = time.monotonic() - self._last_beat - self.interval
+                if overdue < self.block_threshold or self._stall is not None:
+                    continue
+                self._stall = self._capture()
+
+    def _capture(self) -> BlockedLoopEvent:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        stack = traceback.format_stack(frame)[-self.STACK_DEPTH:] if frame is not None else []
+        task = asyncio.current_task(self._loop)
+        route = self._task_routes.get(task) if task is not None else None
+        return BlockedLoopEvent(route or NO_ROUTE, stack, self._last_beat)
+
+    def snapshot(self, with_stacks: bool = False) -> Dict[str, Any]:
+        with self._lock:
+            lags = sorted(self._lags)
+            current = self._lags[-1] if self._lags else 0.0
+            events = list(self._events)
+            by_route = {route: dict(stats) for route, stats in self._by_route.items()}
+        return {
+            "lag_seconds": {
+                "current": round(current, 4),
+                "p50": round(lags[len(lags) // 2], 4) if lags else 0.0,
+                "p99": round(lags[int(0.99 * (len(lags) - 1))], 4) if lags else 0.0,
+                "max": round(lags[-1], 4) if lags else 0.0
+            },
+            "block_threshold_seconds": self.block_threshold,
+            "blocked": {
+                route: {"count": int(stats["count"]), "blocked_seconds": round(stats["blocked_seconds"], 3)}
+                for route, stats in by_route.items()
+            },
+            "recent_blocks": [event.to_dict(with_stack=with_stacks) for event in reversed(events)]
+        }
+
+class LoopMonitorMiddleware:
+    """ASGI middleware that tags each request's task with its route for stall attribution."""
+
+    def __init__(self, app, monitor: LoopLagMonitor):
+        self.app = app
+        self.monitor = monitor
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = _active_route.set(None)
+        try:
+            self.monitor.tag_current_task(f"{scope['method']} {scope['path']}")
+            await self.app(scope, receive, send)
+        finally:
+            self.monitor.untag_current_task()
+            _active_route.reset(token)
+
+_monitor: Optional[LoopLagMonitor] = None
+_monitor_lock = threading.Lock()
+
+def get_loop_monitor() -> LoopLagMonitor:
+    """Return the worker-wide monitor configured by ``LOOP_*`` settings."""
+    global _monitor
+    with _monitor_lock:
+        if _monitor is None:
+            config = Config()
+            _monitor = LoopLagMonitor(
+                interval=config.loop_monitor_interval_seconds,
+                block_threshold=config.loop_block_threshold_seconds
+            )
+        return _monitor
+
+def loop_monitor_snapshot() -> Optional[Dict[str, Any]]:
+    """Loop lag summary for the health endpoint, None while the monitor is not running."""
+    return _monitor.snapshot() if _monitor is not None and _monitor.running else None
@@ -0,0 +1,110 @@
+import json
+import logging
+
+from enum import Enum
+from typing import Any, Dict, Optional
+
+from com.mhire.app.config.config import Config
+
+logger = logging.getLogger(__name__)
+
+class LLMTask(str, Enum):
+    SENTIMENT = "sentiment"
+    TOOLS = "tools"
+    SCHEDULE = "schedule"
+    SONG_SUGGESTION = "song_suggestion"
+    VIDEO_SELECTION = "video_selection"
+    ESSAY = "essay"
+
+class ModelProfile:
+    """Model and generation settings used for one kind of LLM task."""
+
+    def __init__(
+        self,
+        model: str,
+        temperature: float,
+        max_tokens: int,
+        fallback_model: Optional[str] = None,
+        slow_seconds: Optional[float] = None
+    ):
+        self.model = model
+        self.temperature = temperature
+        self.max_tokens = max_tokens
+        self.fallback_model = fallback_model if fallback_model != model else None
+        # Only enforced when there is a fallback to switch to
+        self.slow_seconds = slow_seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self.__dict__)
+
+# Classification-style tasks go to the small model; long-form writing stays on the large one.
+DEFAULT_PROFILES: Dict[LLMTask, Dict[str, Any]] = {
+    LLMTask.SENTIMENT: {"size": "small", "temperature": 0.0, "max_tokens": 10, "slow_seconds": 3},
+    LLMTask.TOOLS: {"size": "small", "temperature": 0.7, "max_tokens": 800, "slow_seconds": 8},
+    LLMTask.SCHEDULE: {"size": "large", "temperature": 0.7, "max_tokens": 2000, "slow_seconds": 30},
+    LLMTask.SONG_SUGGESTION: {"size": "large", "temperature": 0.7, "max_tokens": 300, "slow_seconds": 8},
+    LLMTask.VIDEO_SELECTION: {"size": "small", "temperature": 0.2, "max_tokens": 100, "slow_seconds": 3},
+    LLMTask.ESSAY: {"size": "large", "temperature": 0.7, "max_tokens": 1500, "slow_seconds": 30},
+}
+
+class ModelRouter:
+    """Maps each LLM task to a model profile.
+
+    ``GROQ_MODEL_NAME`` is the large model and ``GROQ_SMALL_MODEL_NAME`` the small
+    one. Small-model tasks fall back to the large model; large-model tasks fall
+    back to ``GROQ_FALLBACK_MODEL_NAME`` when set. Any field can be overridden per
+    task through ``GROQ_TASK_PROFILES``, e.g. ``{"essay": {"max_tokens": 1200}}``;
+    an invalid entry is logged and its task keeps the defaults.
+    """
+
+    def __init__(self, overrides: Optional[Dict[str, Dict[str, Any]]] = None):
+        config = Config()
+        if not config.groq_api_model:
+            raise ValueError("Missing required configuration: GROQ_MODEL_NAME")
+
+        if overrides is None:
+            overrides = self._load_overrides(config.groq_task_profiles)
+
+        models = {"large": config.groq_api_model, "small": config.groq_small_model or config.groq_api_model}
+        self.profiles: Dict[LLMTask, ModelProfile] = {}
+        for task, defaults in DEFAULT_PROFILES.items():
+            try:
+                self.profiles[task] = self._build_profile({**defaults, **overrides.get(task.value, {})}, models)
+            except (KeyError, TypeError, ValueError) as e:
+                logger.error(f"Invalid GROQ_TASK_PROFILES entry for {task.value}, using defaults: {str(e)}")
+                self.profiles[task] = self._build_profile(defaults, models)
+
+    @staticmethod
+    def _build_profile(settings: Dict[str, Any], models: Dict[str, str]) -> ModelProfile:
+        if settings["size"] not in models:
+            raise ValueError(f"unknown size '{settings['size']}'")
+        for field in ("model", "fallback_model"):
+            if settings.get(field) is not None and not isinstance(settings[field], str):
+                raise TypeError(f"{field} must be a model name")
+        default_fallback = models["large"] if settings["size"] == "small" else Config().groq_fallback_model
+        slow_seconds = settings.get("slow_seconds")
+        return ModelProfile(
+            model=settings.get("model") or models[settings["size"]],
+            temperature=float(settings["temperature"]),
+            max_tokens=int(settings["max_tokens"]),
+            fallback_model=settings.get("fallback_model", default_fallback),
+            slow_seconds=float(slow_seconds) if slow_seconds is not None else None
+        )
+
+    def _load_overrides(self, raw: Optional[str]) -> Dict[str, Dict[str, Any]]:
+        if not raw:
+            return {}
+        try:
+            overrides = json.loads(raw)
+            if not isinstance(overrides, dict):
+                raise TypeError("expected an object keyed by task")
+            unknown = set(overrides) - {task.value for task in LLMTask}
+            if unknown:
+                logger.warning(f"Ignoring unknown tasks in GROQ_TASK_PROFILES: {sorted(unknown)}")
+            return overrides
+        except (json.JSONDecodeError, TypeError) as e:
+            logger.error(f"Invalid GROQ_TASK_PROFILES, using defaults: {str(e)}")
+            return {}
+
+    def profile(self, task: LLMTask) -> ModelProfile:
+        return self.profiles[task]
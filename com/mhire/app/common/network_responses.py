@@ -1,5 +1,18 @@
-from typing import Dict, Any
-from fastapi.responses import JSONResponse
+from typing import Dict, Any, Optional, Union
+from fastapi.responses import Response
+from pydantic import BaseModel
+from pydantic_core import to_json
+
+class FastJSONResponse(Response):
+    """JSON response rendered straight to bytes by the pydantic-core encoder.
+
+    Validated models can be placed in the content as-is; they are serialized
+    by their compiled serializer without an intermediate ``model_dump()``.
+    """
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
 
 class NetworkResponse:
 
@@ -7,24 +20,26 @@ class NetworkResponse:
         self.version = version
 
     def success_response(
-        self, http_code: int, message: str, data: Dict[str, Any], resource: str, duration: float
-    ) -> JSONResponse:
-        return JSONResponse(
+        self, http_code: int, message: str, data: Union[Dict[str, Any], BaseModel], resource: str, duration: float
+    ) -> FastJSONResponse:
+        return FastJSONResponse(
             status_code=http_code,
             content={
                 "success": True,
                 "message": message,
-                "data": data,  # Direct data without serialization
+                "data": data,  # Dicts or validated models, serialized once at render time
                 "resource": resource,
                 "duration": f"{duration}s"
             }
         )
 
     def json_response(
-        self, http_code: int, error_code: int, error_message: str, resource: str, duration: float
-    ) -> JSONResponse:
-        return JSONResponse(
+        self, http_code: int, error_code: int, error_message: str, resource: str, duration: float,
+        headers: Optional[Dict[str, str]] = None
+    ) -> FastJSONResponse:
+        return FastJSONResponse(
             status_code=http_code,
+            headers=headers,
             content={
                 "code": http_code,
                 "success": False,
@@ -37,12 +52,57 @@ class NetworkResponse:
             }
         )
 
+    def upstream_error_response(self, exc: Exception, resource: str, duration: float) -> Optional[FastJSONResponse]:
+        """Error envelope for an unavailable upstream or exhausted time budget, else None."""
+        status_code = getattr(exc, "status_code", None)
+        if status_code == HTTPCode.SERVICE_UNAVAILABLE:
+            error_code = ErrorCode.ServiceUnavailable.UPSTREAM_UNAVAILABLE
+            error_message = Message.ErrorMessage.ServiceUnavailable.UPSTREAM_UNAVAILABLE
+        elif status_code == HTTPCode.GATEWAY_TIMEOUT:
+            error_code = ErrorCode.GatewayTimeout.DEADLINE_EXCEEDED
+            error_message = Message.ErrorMessage.GatewayTimeout.DEADLINE_EXCEEDED
+        else:
+            return None
+        return self.json_response(
+            http_code=status_code,
+            error_code=error_code,
+            error_message=error_message,
+            resource=resource,
+            duration=duration,
+            headers=getattr(exc, "headers", None)
+        )
+
+    def session_not_found_response(self, resource: str, duration: float) -> FastJSONResponse:
+        return self.json_response(
+            http_code=HTTPCode.NOT_FOUND,
+            error_code=ErrorCode.NotFound.SESSION_NOT_FOUND,
+            error_message=Message.ErrorMessage.NotFound.SESSION_NOT_FOUND,
+            resource=resource,
+            duration=duration
+        )
+
+    def client_disconnected_response(self, resource: str, duration: float) -> FastJSONResponse:
+        # Nobody reads it; it closes the request cleanly for logs and middleware
+        return self.json_response(
+            http_code=HTTPCode.CLIENT_CLOSED_REQUEST,
+            error_code=ErrorCode.ClientClosedRequest.CLIENT_DISCONNECTED,
+            error_message=Message.ErrorMessage.ClientClosedRequest.CLIENT_DISCONNECTED,
+            resource=resource,
+            duration=duration
+        )
+
 class HTTPCode:
     SUCCESS = 200
     BAD_REQUEST = 400
     FORBIDDEN = 403
+    NOT_FOUND = 404
+    CONFLICT = 409
     UNPROCESSABLE_ENTITY = 422
+    TOO_MANY_REQUESTS = 429
+    CLIENT_CLOSED_REQUEST = 499
     INTERNAL_SERVER_ERROR = 500
+    SERVICE_UNAVAILABLE = 503
+    GATEWAY_TIMEOUT = 504
 
 class ErrorCode:
     class BadRequest:
@@ -53,10 +113,25 @@ class ErrorCode:
     class Forbidden:
         BLOCKED_CONTENT = 40301
         INAPPROPRIATE_CONTENT = 40302
+        ADMIN_TOKEN_REQUIRED = 40303
+
+    class NotFound:
+        SESSION_NOT_FOUND = 40401
+        PROFILE_NOT_FOUND = 40402
+
+    class Conflict:
+        REQUEST_IN_PROGRESS = 40901
 
     class UnprocessableEntity:
         INVALID_CONTENT = 42213
         CONTEXT_PROCESSING_ERROR = 42202
+        IDEMPOTENCY_KEY_REUSED = 42203
+
+    class TooManyRequests:
+        QUOTA_EXCEEDED = 42901
+
+    class ClientClosedRequest:
+        CLIENT_DISCONNECTED = 49901
 
     class InternalServerError:
         UNEXPECTED_ERROR = 50001
@@ -65,6 +140,13 @@ class ErrorCode:
         CONTEXT_RETRIEVAL_ERROR = 50004
         INTERNAL_SERVER_ERROR = 50005
 
+    class ServiceUnavailable:
+        UPSTREAM_UNAVAILABLE = 50301
+        OVERLOADED = 50302
+
+    class GatewayTimeout:
+        DEADLINE_EXCEEDED = 50401
+
 class Message:
     class SuccessMessage:
         RESPONSE_GENERATED = "Response generated successfully."
@@ -78,14 +160,36 @@ class Message:
         class Forbidden:
             BLOCKED_CONTENT = "Content has been blocked by content filter."
             INAPPROPRIATE_CONTENT = "Inappropriate content detected."
+            ADMIN_TOKEN_REQUIRED = "A valid admin token is required."
+
+        class NotFound:
+            SESSION_NOT_FOUND = "Session not found or expired. Please send your inputs again."
+            PROFILE_NOT_FOUND = "Profile not found or expired."
+
+        class Conflict:
+            REQUEST_IN_PROGRESS = "A request with this Idempotency-Key is still in progress."
 
         class UnprocessableEntity:
             INVALID_MESSAGE_FORMAT = "The message format is not supported."
             CONTEXT_PROCESSING_ERROR = "Error processing grief content."
+            IDEMPOTENCY_KEY_REUSED = "Idempotency-Key was already used with a different request body."
+
+        class TooManyRequests:
+            QUOTA_EXCEEDED = "Request quota exceeded for this client. Please retry later."
+
+        class ClientClosedRequest:
+            CLIENT_DISCONNECTED = "The client closed the request before it completed."
 
         class InternalServerError:
             UNEXPECTED_ERROR = "An unexpected error occurred."
             MODEL_UNAVAILABLE = "AI model is currently unavailable."
             RESPONSE_GENERATION_FAILED = "Failed to generate response."
             CONTEXT_RETRIEVAL_ERROR = "Error retrieving conversation context."
-            INTERNAL_SERVER_ERROR = "Internal server error occurred."
\ No newline at end of file
+            INTERNAL_SERVER_ERROR = "Internal server error occurred."
+
+        class ServiceUnavailable:
+            UPSTREAM_UNAVAILABLE = "An upstream AI service is temporarily unavailable. Please retry shortly."
+            OVERLOADED = "The service is at capacity. Please retry shortly."
+
+        class GatewayTimeout:
+            DEADLINE_EXCEEDED = "The request could not be completed within its time budget."
\ No newline at end of file
@@ -0,0 +1,109 @@
+import asyncio
+import logging
+import time
+import uuid
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Iterator, Optional, TypeVar
+
+from fastapi import Request
+
+from com.mhire.app.config.config import Config
+
+logger = logging.getLogger(__name__)
+
+R = TypeVar('R')
+
+class DeadlineExceededError(Exception):
+    """Raised when the request's time budget is spent before or during a stage."""
+
+    status_code = 504
+    # Running out of our own budget says nothing about the upstream's health
+    upstream_failure = None
+
+    def __init__(self, detail: str = "Request time budget exhausted"):
+        self.detail = detail
+        super().__init__(detail)
+
+class RequestContext:
+    """Per-request state visible to every stage and upstream call of a request."""
+
+    def __init__(self, endpoint: str, deadline: Optional[float] = None):
+        self.request_id = uuid.uuid4().hex
+        self.endpoint = endpoint
+        self.deadline = deadline  # time.monotonic() based
+        self._attempts: Dict[str, int] = {}
+
+    def next_attempt(self, stage: str) -> int:
+        """Count an upstream call for ``stage``; 1 for the first, 2+ for retries."""
+        self._attempts[stage] = self._attempts.get(stage, 0) + 1
+        return self._attempts[stage]
+
+    def remaining(self) -> Optional[float]:
+        if self.deadline is None:
+            return None
+        return self.deadline - time.monotonic()
+
+    def expired(self) -> bool:
+        remaining = self.remaining()
+        return remaining is not None and remaining <= 0
+
+_current: ContextVar[Optional[RequestContext]] = ContextVar("request_context", default=None)
+
+def current_context() -> Optional[RequestContext]:
+    return _current.get()
+
+def remaining_time() -> Optional[float]:
+    """Seconds left in the current request's budget, or None without a deadline."""
+    context = _current.get()
+    return context.remaining() if context else None
+
+def check_deadline() -> None:
+    """Raise DeadlineExceededError if the current request has no time left."""
+    context = _current.get()
+    if context and context.expired():
+        raise DeadlineExceededError()
+
+def _requested_timeout(http_request: Request) -> Optional[float]:
+    raw = http_request.headers.get(Config().deadline_header)
+    if not raw:
+        return None
+    try:
+        timeout = float(raw)
+    except ValueError:
+        logger.warning(f"Ignoring invalid {Config().deadline_header} header: {raw}")
+        return None
+    return timeout if timeout > 0 else None
+
+@contextmanager
+def request_scope(http_request: Request, endpoint: str, default_timeout: float) -> Iterator[RequestContext]:
+    """Start the request's time budget from the header or the endpoint default.
+
+    The budget is capped at ``MAX_REQUEST_TIMEOUT_SECONDS`` so a client cannot
+    hold a worker longer than the deployment allows.
+    """
+    timeout = min(_requested_timeout(http_request) or default_timeout, Config().max_request_timeout_seconds)
+    with background_scope(endpoint, timeout) as context:
+        yield context
+
+@contextmanager
+def background_scope(endpoint: str, timeout: float) -> Iterator[RequestContext]:
+    """Time budget for work the server starts on its own, outside any client request."""
+    token = _current.set(RequestContext(endpoint, time.monotonic() + timeout))
+    try:
+        yield _current.get()
+    finally:
+        _current.reset(token)
+
+async def call_within_deadline(fn: Callable[..., Awaitable[R]], *args: Any, **kwargs: Any) -> R:
+    """Await an upstream call with only the remaining budget, cancelling it when it runs out."""
+    remaining = remaining_time()
+    if remaining is None:
+        return await fn(*args, **kwargs)
+    if remaining <= 0:
+        raise DeadlineExceededError()
+    try:
+        return await asyncio.wait_for(fn(*args, **kwargs), timeout=remaining)
+    except asyncio.TimeoutError:
+        raise DeadlineExceededError()
@@ -0,0 +1,290 @@
+import asyncio
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+import weakref
+
+from collections import deque
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, List, Optional
+
+from com.mhire.app.config.config import Config
+from com.mhire.app.common.admin_auth import is_admin
+from com.mhire.app.common.shared_store import SharedStore, get_shared_store
+
+logger = logging.getLogger(__name__)
+
+_active_profile: ContextVar[Optional["ProfileSession"]] = ContextVar("active_profile", default=None)
+
+PROFILE_HEADER = "X-Profile"
+PROFILE_ID_HEADER = "X-Profile-Id"
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    parts = code.co_filename.replace(os.sep, "/").rsplit("/", 2)
+    return f"{code.co_name} ({'/'.join(parts[-2:])}:{code.co_firstlineno})"
+
+def _thread_stack(frame) -> List[str]:
+    """Root-first labels of a running thread's stack, without the event loop's own frames."""
+    frames = []
+    while frame is not None:
+        code = frame.f_code
+        if code.co_name == "_run" and code.co_filename.endswith(os.path.join("asyncio", "events.py")):
+            break
+        frames.append(_frame_label(frame))
+        frame = frame.f_back
+    return frames[::-1]
+
+def _await_stack(coro: Any) -> List[str]:
+    """Root-first labels of where a suspended coroutine is waiting."""
+    frames = []
+    while coro is not None:
+        frame = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None)
+        if frame is None:
+            break
+        frames.append(_frame_label(frame))
+        coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None)
+    return frames
+
+class ProfileSession:
+    """Samples collected for one request and the tasks it started."""
+
+    def __init__(self, route: str, reason: str):
+        self.id = uuid.uuid4().hex
+        self.route = route
+        self.reason = reason
+        self.started_at = time.time()
+        self.start = time.perf_counter()
+        self.tasks: "weakref.WeakSet[asyncio.Task]" = weakref.WeakSet()
+        self.stacks: Dict[str, int] = {}
+        self.samples = 0
+
+    def add(self, state: str, frames: List[str]) -> None:
+        key = ";".join([state, *frames])
+        self.stacks[key] = self.stacks.get(key, 0) + 1
+        self.samples += 1
+
+    def to_dict(self, interval: float, status: Optional[int]) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "route": self.route,
+            "reason": self.reason,
+            "status": status,
+            "started_at": self.started_at,
+            "duration_seconds": round(time.perf_counter() - self.start, 4),
+            "interval_seconds": interval,
+            "samples": self.samples,
+            "stacks": self.stacks
+        }
+
+def collapsed_stacks(profile: Dict[str, Any]) -> str:
+    """Profile in the collapsed-stack format read by flamegraph.pl, speedscope and inferno."""
+    root = profile["route"].replace(";", ":")
+    return "".join(f"{root};{stack} {count}\n" for stack, count in sorted(profile["stacks"].items()))
+
+class RequestProfiler:
+    """Wall-clock sampling profiler for selected requests.
+
+    A request is profiled when it carries ``X-Profile: 1`` with the admin token,
+    or is picked at ``sample_rate``. A sampler thread looks at the event loop
+    every ``interval`` seconds: the request's task that is running contributes
+    its thread stack under ``cpu``, the ones that are suspended contribute
+    where they wait under ``await``, so prompt building, JSON cleanup,
+    validation and upstream waits show up side by side. Tasks spawned by the
+    request are followed and sampled separately, so concurrent work counts once
+    per task. Profiles go to the shared store for ``ttl`` seconds and the
+    response names them in ``X-Profile-Id``.
+
+    Nothing is installed unless ``PROFILING_ENABLED`` is set.
+    """
+
+    def __init__(
+        self,
+        sample_rate: float = 0.0,
+        interval: float = 0.005,
+        ttl: float = 3600,
+        max_concurrent: int = 4,
+        store: Optional[SharedStore] = None,
+        max_recent: int = 50
+    ):
+        self.sample_rate = sample_rate
+        self.interval = interval
+        self.ttl = ttl
+        self.max_concurrent = max_concurrent
+        self._store = store
+        self._sessions: Dict[str, ProfileSession] = {}
+        self._recent: Deque[Dict[str, Any]] = deque(maxlen=max_recent)
+        self._lock = threading.Lock()
+        self._has_sessions = threading.Event()
+        self._stopped = threading.Event()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._previous_factory = None
+
+    @property
+    def store(self) -> SharedStore:
+        if self._store is None:
+            self._store = get_shared_store()
+        return self._store
+
+    @property
+    def running(self) -> bool:
+        return self._loop is not None
+
+    def start(self) -> None:
+        """Start following tasks and the sampler thread; call from the loop thread."""
+        if self._loop is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._previous_factory = self._loop.get_task_factory()
+        self._loop.set_task_factory(self._task_factory)
+        self._stopped.clear()
+        threading.Thread(target=self._sample_loop, name="request-profiler", daemon=True).start()
+        logger.info(f"Request profiler started (sample rate {self.sample_rate}, interval {self.interval}s)")
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._has_sessions.set()
+        if self._loop is not None:
+            self._loop.set_task_factory(self._previous_factory)
+            self._loop = None
+
+    def _task_factory(self, loop: asyncio.AbstractEventLoop, coro, **kwargs):
+        if self._previous_factory is not None:
+            task = self._previous_factory(loop, coro, **kwargs)
+        else:
+            task = asyncio.Task(coro, loop=loop, **kwargs)
+        context = kwargs.get("context")
+        session = context.get(_active_profile) if context is not None else _active_profile.get()
+        if session is not None:
+            with self._lock:
+                session.tasks.add(task)
+        return task
+
+    def should_profile(self, headers: Dict[str, str]) -> Optional[str]:
+        """Why a request should be profiled, or None."""
+        if len(self._sessions) >= self.max_concurrent:
+            return None
+        if headers.get(PROFILE_HEADER) == "1" and is_admin(headers):
+            return "requested"
+        if self.sample_rate > 0 and random.random() < self.sample_rate:
+            return "sampled"
+        return None
+
+    def begin(self, route: str, reason: str) -> ProfileSession:
+        session = ProfileSession(route, reason)
+        _active_profile.set(session)
+        task = asyncio.current_task()
+        with self._lock:
+            if task is not None:
+                session.tasks.add(task)
+            self._sessions[session.id] = session
+            self._has_sessions.set()
+        return session
+
+    async def finish(self, session: ProfileSession, status: Optional[int]) -> None:
+        with self._lock:
+            self._sessions.pop(session.id, None)
+            if not self._sessions:
+                self._has_sessions.clear()
+            profile = session.to_dict(self.interval, status)
+        self._recent.append({key: value for key, value in profile.items() if key != "stacks"})
+        try:
+            await self.store.set(f"profile:{session.id}", json.dumps(profile).encode(), self.ttl)
+        except Exception as e:
+            logger.warning(f"Failed to store request profile: {str(e)}")
+
+    def _sample_loop(self) -> None:
+        while not self._stopped.is_set():
+            self._has_sessions.wait()
+            if self._stopped.wait(self.interval):
+                break
+            self._sample()
+
+    def _sample(self) -> None:
+        loop = self._loop
+        if loop is None:
+            return
+        frame = sys._current_frames().get(self._loop_thread_id)
+        running = asyncio.current_task(loop)
+        with self._lock:
+            for session in self._sessions.values():
+                for task in list(session.tasks):
+                    if task.done():
+                        continue
+                    try:
+                        if task is running:
+                            session.add("cpu", _thread_stack(frame))
+                        else:
+                            session.add("await", _await_stack(task.get_coro()))
+                    except Exception:
+                        # The task moved on while we looked; skip this sample
+                        continue
+
+    async def load(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        raw = await self.store.get(f"profile:{profile_id}")
+        return json.loads(raw) if raw is not None else None
+
+    def recent(self) -> List[Dict[str, Any]]:
+        """Summaries of the latest profiles taken by this worker, newest first."""
+        return list(reversed(self._recent))
+
+class ProfilingMiddleware:
+    """ASGI middleware that profiles the requests the profiler selects."""
+
+    def __init__(self, app, profiler: RequestProfiler):
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = {key.decode("latin-1").title(): value.decode("latin-1") for key, value in scope["headers"]}
+        reason = self.profiler.should_profile(headers)
+        if reason is None:
+            await self.app(scope, receive, send)
+            return
+
+        token = _active_profile.set(None)
+        session = self.profiler.begin(f"{scope['method']} {scope['path']}", reason)
+        status = None
+
+        async def send_with_profile_id(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message = {
+                    **message,
+                    "headers": [*message.get("headers", []), (PROFILE_ID_HEADER.lower().encode(), session.id.encode())]
+                }
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            _active_profile.reset(token)
+            await self.profiler.finish(session, status)
+
+_profiler: Optional[RequestProfiler] = None
+_profiler_lock = threading.Lock()
+
+def get_request_profiler() -> RequestProfiler:
+    """Return the worker-wide profiler configured by ``PROFILING_*`` settings."""
+    global _profiler
+    with _profiler_lock:
+        if _profiler is None:
+            config = Config()
+            _profiler = RequestProfiler(
+                sample_rate=config.profiling_sample_rate,
+                interval=config.profiling_interval_seconds,
+                ttl=config.profiling_ttl_seconds,
+                max_concurrent=config.profiling_max_concurrent
+            )
+        return _profiler
@@ -0,0 +1,93 @@
+import hashlib
+import logging
+import threading
+
+from typing import Any, Dict, List, Optional, Type, TypeVar
+
+from pydantic_core import to_json
+
+from com.mhire.app.common.json_handler import get_type_adapter
+from com.mhire.app.common.shared_store import SharedStore, get_shared_store
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+_registry: List[Any] = []
+_registry_lock = threading.Lock()
+
+def register_cache(cache: Any) -> None:
+    """Report a cache (anything with ``namespace`` and ``snapshot()``) in /health."""
+    with _registry_lock:
+        _registry.append(cache)
+
+class ResponseCache:
+    """Exact-key cache of validated results in the shared store.
+
+    Keys are hashed from the normalized request fields, values are stored as
+    JSON and validated back into the result type on a hit. The cache is best
+    effort: a store error counts as a miss and never fails the request.
+    """
+
+    def __init__(self, namespace: str, ttl: float, store: Optional[SharedStore] = None):
+        self.namespace = namespace
+        self.ttl = ttl
+        self._store = store
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        register_cache(self)
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    @property
+    def store(self) -> SharedStore:
+        if self._store is None:
+            self._store = get_shared_store()
+        return self._store
+
+    def key(self, *parts: str) -> str:
+        """Build a cache key; text parts are compared case and whitespace insensitive."""
+        normalized = "\x1f".join(" ".join(str(part).lower().split()) for part in parts)
+        return f"cache:{self.namespace}:{hashlib.sha256(normalized.encode()).hexdigest()}"
+
+    async def get(self, key: str, target_type: Type[T]) -> Optional[T]:
+        if not self.enabled:
+            return None
+        try:
+            raw = await self.store.get(key)
+            if raw is not None:
+                value = get_type_adapter(target_type).validate_json(raw)
+                self.hits += 1
+                return value
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Cache {self.namespace} read failed: {str(e)}")
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, value: Any) -> None:
+        if not self.enabled:
+            return
+        try:
+            await self.store.set(key, to_json(value), self.ttl)
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Cache {self.namespace} write failed: {str(e)}")
+
+    def snapshot(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0
+        }
+
+def response_cache_snapshot() -> Dict[str, Dict[str, Any]]:
+    """Hit/miss counters of every cache in this worker, for the health endpoint."""
+    with _registry_lock:
+        caches = list(_registry)
+    return {cache.namespace: cache.snapshot() for cache in caches}
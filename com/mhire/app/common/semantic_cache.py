@@ -0,0 +1,222 @@
+import logging
+import re
+import threading
+import time
+import zlib
+
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple, Type, TypeVar
+
+import numpy as np
+from pydantic_core import to_json
+
+from com.mhire.app.common.json_handler import get_type_adapter
+from com.mhire.app.common.response_cache import register_cache
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+# Spellings that mean the same thing in grief inputs, and fillers that only change emphasis
+_CANONICAL_WORDS = {
+    "mom": "mother", "mum": "mother", "mommy": "mother", "mama": "mother", "mummy": "mother",
+    "dad": "father", "daddy": "father", "papa": "father", "pa": "father",
+    "grandma": "grandmother", "granny": "grandmother", "nana": "grandmother",
+    "grandpa": "grandfather", "granddad": "grandfather",
+    "bro": "brother", "sis": "sister", "hubby": "husband",
+    "can't": "cannot", "cant": "cannot", "don't": "do not", "dont": "do not",
+    "won't": "will not", "i'm": "i am", "im": "i am", "i've": "i have", "it's": "it is",
+    "didn't": "did not", "doesn't": "does not", "isn't": "is not", "wasn't": "was not",
+    "couldn't": "could not", "wouldn't": "would not", "haven't": "have not",
+    "passed": "died", "away": "",
+    "really": "", "so": "", "very": "", "just": "", "much": "", "truly": "",
+}
+_NGRAM_SIZES = (3, 4, 5)
+
+# Words that change what a thought says rather than how it is said. They are never
+# dropped as fillers, and two texts only match when they agree on them.
+_NEGATIONS = {"not", "no", "never", "nothing", "nobody", "cannot", "without", "nor"}
+_NEGATION_SCOPE = 3
+_EMOTION_WORDS = {
+    "happy", "glad", "joy", "relieved", "relief", "grateful", "peaceful", "calm", "hopeful",
+    "sad", "sadness", "heartbroken", "devastated", "depressed", "hopeless", "lonely", "alone", "empty",
+    "angry", "anger", "mad", "furious", "rage", "bitter", "resentful", "frustrated", "upset", "hurt",
+    "numb", "shocked", "confused", "overwhelmed", "anxious", "afraid", "scared", "fear", "panic",
+    "guilty", "guilt", "ashamed", "shame", "regret", "jealous",
+}
+
+def normalize_text(text: str) -> str:
+    words = re.sub(r"[^\w\s']", " ", text.lower()).split()
+    return " ".join(filter(None, (_CANONICAL_WORDS.get(word, word) for word in words)))
+
+def emotion_signature(text: str) -> str:
+    """The emotion words of a text, each marked when a negation comes shortly before it.
+
+    "I am angry", "I am not angry" and "I feel numb" get different signatures,
+    however similar the rest of the wording is.
+    """
+    found = set()
+    negated_until = -1
+    for position, word in enumerate(normalize_text(text).split()):
+        if word in _NEGATIONS:
+            negated_until = position + _NEGATION_SCOPE
+        elif word in _EMOTION_WORDS:
+            found.add(f"not {word}" if position <= negated_until else word)
+    return ",".join(sorted(found))
+
+def embed_text(text: str, dim: int = 1024) -> np.ndarray:
+    """Unit vector of hashed words and character n-grams of the normalized text.
+
+    crc32 is used instead of ``hash()`` so vectors are identical in every worker.
+    """
+    normalized = normalize_text(text)
+    vector = np.zeros(dim, dtype=np.float32)
+    features = [b"w:" + word.encode() for word in normalized.split()]
+    padded = f" {normalized} ".encode()
+    for size in _NGRAM_SIZES:
+        features.extend(padded[i:i + size] for i in range(len(padded) - size + 1))
+    for feature in features:
+        vector[zlib.crc32(feature) % dim] += 1.0
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+class _BucketIndex:
+    """Matrix of unit vectors that grows up to ``capacity``; then the oldest entry is overwritten."""
+
+    INITIAL_ROWS = 8
+
+    def __init__(self, capacity: int, dim: int):
+        self.capacity = capacity
+        rows = min(capacity, self.INITIAL_ROWS)
+        self.vectors = np.zeros((rows, dim), dtype=np.float32)
+        self.expires_at = np.zeros(rows, dtype=np.float64)
+        self.values: List[Optional[bytes]] = [None] * rows
+        self.count = 0
+        self.next_slot = 0
+
+    def live(self, now: float) -> int:
+        return int(np.count_nonzero(self.expires_at[:self.count] > now))
+
+    def _grow(self) -> None:
+        rows = min(self.capacity, 2 * len(self.values))
+        self.vectors = np.resize(self.vectors, (rows, self.vectors.shape[1]))
+        self.expires_at = np.resize(self.expires_at, rows)
+        self.values.extend([None] * (rows - len(self.values)))
+
+    def search(self, vector: np.ndarray, now: float) -> Tuple[float, Optional[bytes]]:
+        if self.count == 0:
+            return 0.0, None
+        scores = self.vectors[:self.count] @ vector
+        scores[self.expires_at[:self.count] <= now] = -1.0
+        best = int(np.argmax(scores))
+        return float(scores[best]), self.values[best]
+
+    def add(self, vector: np.ndarray, value: bytes, expires_at: float) -> None:
+        if self.count == len(self.values) < self.capacity:
+            self._grow()
+            self.next_slot = self.count
+        slot = self.next_slot
+        self.vectors[slot] = vector
+        self.expires_at[slot] = expires_at
+        self.values[slot] = value
+        self.next_slot = (slot + 1) % len(self.values)
+        self.count = max(self.count, slot + 1)
+
+class SemanticCache:
+    """Reuses results for near-duplicate free-text inputs within a bucket.
+
+    Inputs are embedded locally and compared by cosine similarity against
+    earlier inputs of the same bucket (e.g. relationship and cause of loss); a
+    result is reused when the best match reaches ``threshold``. Inputs are only
+    compared with those that name the same emotions, negated the same way, so a
+    small change in wording that flips the meaning is never a hit. The index is
+    in memory per worker, bounded to ``max_entries`` per bucket and
+    ``max_buckets`` buckets; the least recently used bucket is dropped first, and
+    a bucket whose entries have all expired is dropped when next seen.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        threshold: float,
+        ttl: float,
+        max_entries: int = 500,
+        max_buckets: int = 256,
+        dim: int = 1024
+    ):
+        self.namespace = namespace
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_buckets = max_buckets
+        self.dim = dim
+        self._buckets: "OrderedDict[Tuple[str, ...], _BucketIndex]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._hit_similarity_total = 0.0
+        register_cache(self)
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.threshold <= 1.0
+
+    def get(self, bucket: Tuple[str, ...], text: str, target_type: Type[T]) -> Optional[T]:
+        if not self.enabled:
+            return None
+        vector = embed_text(text, self.dim)
+        bucket = (*bucket, emotion_signature(text))
+        with self._lock:
+            index = self._live_bucket(bucket, time.time())
+            similarity, value = index.search(vector, time.time()) if index else (0.0, None)
+            if value is None or similarity < self.threshold:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._hit_similarity_total += similarity
+        logger.info(f"Semantic cache {self.namespace} hit (similarity {similarity:.3f})")
+        return get_type_adapter(target_type).validate_json(value)
+
+    def set(self, bucket: Tuple[str, ...], text: str, value: Any) -> None:
+        if not self.enabled:
+            return
+        vector = embed_text(text, self.dim)
+        bucket = (*bucket, emotion_signature(text))
+        with self._lock:
+            now = time.time()
+            index = self._live_bucket(bucket, now)
+            if index is None:
+                self._prune(now)
+                index = self._buckets[bucket] = _BucketIndex(self.max_entries, self.dim)
+            index.add(vector, to_json(value), now + self.ttl)
+
+    def _live_bucket(self, bucket: Tuple[str, ...], now: float) -> Optional[_BucketIndex]:
+        """The bucket's index, marked recently used; None (and dropped) once nothing in it is live."""
+        index = self._buckets.get(bucket)
+        if index is None:
+            return None
+        if index.live(now) == 0:
+            del self._buckets[bucket]
+            return None
+        self._buckets.move_to_end(bucket)
+        return index
+
+    def _prune(self, now: float) -> None:
+        """Make room for a new bucket: drop expired buckets, then the least recently used."""
+        for bucket in [bucket for bucket, index in self._buckets.items() if index.live(now) == 0]:
+            del self._buckets[bucket]
+        while len(self._buckets) >= self.max_buckets:
+            self._buckets.popitem(last=False)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "mean_hit_similarity": round(self._hit_similarity_total / self.hits, 3) if self.hits else None,
+                "threshold": self.threshold,
+                "entries": sum(index.count for index in self._buckets.values()),
+                "buckets": len(self._buckets)
+            }
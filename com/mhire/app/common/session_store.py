@@ -0,0 +1,150 @@
+import logging
+import re
+import secrets
+
+from typing import Any, Dict, Optional, Tuple, TypeVar
+
+from pydantic import BaseModel, ValidationError
+
+from com.mhire.app.config.config import Config
+from com.mhire.app.common.shared_store import SharedStore, get_shared_store
+
+logger = logging.getLogger(__name__)
+
+M = TypeVar('M', bound=BaseModel)
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+_NUMBERING = re.compile(r"^\s*\d+[.)]\s*")
+
+class SessionNotFoundError(Exception):
+    """Raised when a request refers to a session that expired or never existed."""
+
+    status_code = 404
+
+    def __init__(self, detail: str = "Session not found or expired"):
+        self.detail = detail
+        super().__init__(detail)
+
+class SessionContext(BaseModel):
+    """What one analysis established about the user, reused by later calls."""
+    user_thoughts: str
+    relationship: str
+    cause_of_loss: str
+    mood: Optional[str] = None
+    tools: Dict[str, Dict[str, Any]] = {}
+    summary: str = ""
+
+def condense_thoughts(text: str, max_chars: int) -> str:
+    """Whitespace-collapsed thoughts without repeated sentences, cut at a sentence boundary."""
+    seen = set()
+    kept = []
+    length = 0
+    for sentence in _SENTENCE_END.split(" ".join(text.split())):
+        normalized = sentence.lower().strip(" .!?")
+        if not normalized or normalized in seen:
+            continue
+        if length + len(sentence) > max_chars:
+            if not kept:
+                kept.append(sentence[:max_chars].rsplit(" ", 1)[0] + "...")
+            break
+        seen.add(normalized)
+        kept.append(sentence)
+        length += len(sentence) + 1
+    return " ".join(kept)
+
+def tool_title_key(title: str) -> str:
+    """Comparable form of a tool title, without the "1. " numbering the model puts on titles."""
+    return _NUMBERING.sub("", title).strip().lower()
+
+def _find_tool(tools: Dict[str, Dict[str, Any]], title: str) -> Dict[str, Any]:
+    wanted = tool_title_key(title)
+    for name, tool in tools.items():
+        if tool_title_key(name) == wanted:
+            return tool
+    return {}
+
+class SessionStore:
+    """Server-side session context keyed by an opaque token.
+
+    The sentiment analysis stores the user's inputs, the detected mood, the tool
+    recommendations and a condensed form of their thoughts; the schedule and
+    content endpoints accept the token instead of the raw inputs. Sessions live
+    in the shared store for ``SESSION_TTL_SECONDS`` so every worker sees them.
+    """
+
+    TOKEN_BYTES = 24
+
+    def __init__(self, store: Optional[SharedStore] = None):
+        config = Config()
+        self._store = store
+        self.ttl = config.session_ttl_seconds
+        self.max_context_chars = config.session_context_max_chars
+
+    @property
+    def store(self) -> SharedStore:
+        if self._store is None:
+            self._store = get_shared_store()
+        return self._store
+
+    def _key(self, token: str) -> str:
+        return f"session:{token}"
+
+    async def create(
+        self, user_thoughts: str, relationship: str, cause_of_loss: str, mood: Optional[str], tools: Dict[str, Dict[str, Any]]
+    ) -> Optional[str]:
+        """Store a new session and return its token; None if the store is unavailable."""
+        if self.ttl <= 0:
+            return None
+        token = secrets.token_urlsafe(self.TOKEN_BYTES)
+        session = SessionContext(
+            user_thoughts=user_thoughts,
+            relationship=relationship,
+            cause_of_loss=cause_of_loss,
+            mood=mood,
+            tools=tools,
+            summary=condense_thoughts(user_thoughts, self.max_context_chars)
+        )
+        try:
+            await self.store.set(self._key(token), session.model_dump_json().encode(), self.ttl)
+        except Exception as e:
+            logger.warning(f"Failed to store session: {str(e)}")
+            return None
+        return token
+
+    async def get(self, token: str) -> Optional[SessionContext]:
+        try:
+            raw = await self.store.get(self._key(token))
+        except Exception as e:
+            logger.warning(f"Failed to read session: {str(e)}")
+            return None
+        if raw is None:
+            return None
+        try:
+            return SessionContext.model_validate_json(raw)
+        except ValidationError as e:
+            logger.warning(f"Discarding unreadable session: {str(e)}")
+            return None
+
+    async def resolve(self, request: M) -> Tuple[M, Optional[SessionContext]]:
+        """Fill the fields a request left out from its session.
+
+        Requests without a ``session_token`` are returned unchanged; fields sent
+        explicitly take precedence over the session's. A selected tool's
+        description is taken from the session's recommendations.
+        """
+        token = getattr(request, "session_token", None)
+        if not token:
+            return request, None
+        session = await self.get(token)
+        if session is None:
+            raise SessionNotFoundError()
+
+        explicit = request.model_dump(mode="json", exclude_none=True)
+        fields: Dict[str, Any] = {
+            "user_thoughts": session.summary or session.user_thoughts,
+            "relationship": session.relationship,
+            "cause_of_loss": session.cause_of_loss
+        }
+        if "tool_title" in explicit:
+            fields["tool_description"] = _find_tool(session.tools, explicit["tool_title"]).get("description", "")
+        return type(request).model_validate({**fields, **explicit}), session
@@ -0,0 +1,448 @@
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Optional, Sequence, Tuple, TypeVar
+from urllib.parse import unquote, urlparse
+
+from com.mhire.app.config.config import Config
+
+logger = logging.getLogger(__name__)
+
+R = TypeVar('R')
+
+# Rebuildable entries, evicted before anything else when a store is full. Everything
+# else (quota windows, idempotency claims, sessions, usage totals) controls behaviour
+# and is only evicted once no such entry is left.
+EVICTABLE_PREFIXES = ("cache:", "prefetch:", "profile:", "song_catalog:")
+
+def is_evictable(key: str) -> bool:
+    return key.startswith(EVICTABLE_PREFIXES)
+
+class SharedStore(ABC):
+    """Bounded key/value store with per-entry TTL.
+
+    Values are raw bytes so callers decide their own encoding. ``add`` only
+    writes when the key is absent (or expired) and is the primitive used to
+    claim ownership of a piece of work. ``incr`` atomically adds to an integer
+    counter, starting it at zero with ``ttl`` when absent; later increments
+    keep the original expiry, so a counter covers one fixed window.
+    """
+
+    backend = "abstract"
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        ...
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        ...
+
+    @abstractmethod
+    async def add(self, key: str, value: bytes, ttl: float) -> bool:
+        ...
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        ...
+
+    @abstractmethod
+    async def incr(self, key: str, amount: int, ttl: float) -> int:
+        ...
+
+class MemoryStore(SharedStore):
+    """In-process LRU store; entries are only visible to the current worker.
+
+    Evictable entries and control entries are kept in separate LRU orders, and
+    the least recently used evictable entry always goes first.
+    """
+
+    backend = "memory"
+
+    def __init__(self, max_entries: int = 1000):
+        self.max_entries = max_entries
+        self._evictable: "OrderedDict[str, Tuple[bytes, float]]" = OrderedDict()
+        self._control: "OrderedDict[str, Tuple[bytes, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _entries(self, key: str) -> "OrderedDict[str, Tuple[bytes, float]]":
+        return self._evictable if is_evictable(key) else self._control
+
+    def _get_live(self, key: str, now: float) -> Optional[bytes]:
+        entries = self._entries(key)
+        entry = entries.get(key)
+        if entry is None:
+            return None
+        if entry[1] <= now:
+            del entries[key]
+            return None
+        entries.move_to_end(key)
+        return entry[0]
+
+    def _put(self, key: str, value: bytes, ttl: float, now: float) -> None:
+        entries = self._entries(key)
+        entries[key] = (value, now + ttl)
+        entries.move_to_end(key)
+        while len(self._evictable) + len(self._control) > self.max_entries:
+            (self._evictable or self._control).popitem(last=False)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            return self._get_live(key, time.time())
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        with self._lock:
+            self._put(key, value, ttl, time.time())
+
+    async def add(self, key: str, value: bytes, ttl: float) -> bool:
+        with self._lock:
+            now = time.time()
+            if self._get_live(key, now) is not None:
+                return False
+            self._put(key, value, ttl, now)
+            return True
+
+    async def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries(key).pop(key, None)
+
+    async def incr(self, key: str, amount: int, ttl: float) -> int:
+        with self._lock:
+            now = time.time()
+            current = self._get_live(key, now)
+            if current is None:
+                self._put(key, str(amount).encode(), ttl, now)
+                return amount
+            value = int(current) + amount
+            entries = self._entries(key)
+            entries[key] = (str(value).encode(), entries[key][1])
+            return value
+
+class SQLiteStore(SharedStore):
+    """Single-host store in a WAL-mode SQLite file, shared by all gunicorn workers.
+
+    Connections are opened lazily per process so the store is safe to create
+    before gunicorn forks its workers. Every query runs on one thread per
+    process, so a write waiting out another worker's lock (up to the 5 s busy
+    timeout) delays store calls, never the event loop.
+    """
+
+    backend = "sqlite"
+    PRUNE_EVERY = 100
+
+    def __init__(self, path: str, max_entries: int = 1000):
+        self.path = path
+        self.max_entries = max_entries
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_pid: Optional[int] = None
+
+    async def _run(self, fn: Callable[..., R], *args: Any) -> R:
+        if self._executor is None or self._executor_pid != os.getpid():
+            # Threads do not survive a fork, so each worker starts its own
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite-store")
+            self._executor_pid = os.getpid()
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None or self._pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS kv ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL, "
+                "evictable INTEGER NOT NULL DEFAULT 1, written_at REAL NOT NULL DEFAULT 0)"
+            )
+            for column in ("evictable INTEGER NOT NULL DEFAULT 1", "written_at REAL NOT NULL DEFAULT 0"):
+                try:
+                    # Files created before eviction order was tracked
+                    conn.execute(f"ALTER TABLE kv ADD COLUMN {column}")
+                except sqlite3.OperationalError:
+                    pass
+            conn.execute("CREATE INDEX IF NOT EXISTS kv_expires_at ON kv (expires_at)")
+            conn.execute("CREATE INDEX IF NOT EXISTS kv_eviction ON kv (evictable, written_at)")
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+
+    def _prune(self, conn: sqlite3.Connection, now: float) -> None:
+        """Drop expired rows, then the oldest rows above the bound, evictable ones first."""
+        conn.execute("DELETE FROM kv WHERE expires_at <= ?", (now,))
+        conn.execute(
+            "DELETE FROM kv WHERE key IN ("
+            "SELECT key FROM kv ORDER BY evictable ASC, written_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,)
+        )
+
+    def _after_write(self, conn: sqlite3.Connection, now: float) -> None:
+        self._writes += 1
+        if self._writes % self.PRUNE_EVERY == 0:
+            self._prune(conn, now)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self._run(self._get, key)
+
+    def _get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT value FROM kv WHERE key = ? AND expires_at > ?", (key, time.time())
+            ).fetchone()
+            return bytes(row[0]) if row else None
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        await self._run(self._set, key, value, ttl)
+
+    def _set(self, key: str, value: bytes, ttl: float) -> None:
+        with self._lock:
+            conn = self._connection()
+            now = time.time()
+            conn.execute(
+                "INSERT OR REPLACE INTO kv (key, value, expires_at, evictable, written_at) VALUES (?, ?, ?, ?, ?)",
+                (key, value, now + ttl, is_evictable(key), now)
+            )
+            self._after_write(conn, now)
+
+    async def add(self, key: str, value: bytes, ttl: float) -> bool:
+        return await self._run(self._add, key, value, ttl)
+
+    def _add(self, key: str, value: bytes, ttl: float) -> bool:
+        with self._lock:
+            conn = self._connection()
+            now = time.time()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute("DELETE FROM kv WHERE key = ? AND expires_at <= ?", (key, now))
+                inserted = conn.execute(
+                    "INSERT OR IGNORE INTO kv (key, value, expires_at, evictable, written_at) VALUES (?, ?, ?, ?, ?)",
+                    (key, value, now + ttl, is_evictable(key), now)
+                ).rowcount == 1
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            if inserted:
+                self._after_write(conn, now)
+            return inserted
+
+    async def delete(self, key: str) -> None:
+        await self._run(self._delete, key)
+
+    def _delete(self, key: str) -> None:
+        with self._lock:
+            self._connection().execute("DELETE FROM kv WHERE key = ?", (key,))
+
+    async def incr(self, key: str, amount: int, ttl: float) -> int:
+        return await self._run(self._incr, key, amount, ttl)
+
+    def _incr(self, key: str, amount: int, ttl: float) -> int:
+        with self._lock:
+            conn = self._connection()
+            now = time.time()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT value, expires_at FROM kv WHERE key = ? AND expires_at > ?", (key, now)
+                ).fetchone()
+                value = int(row[0]) + amount if row else amount
+                conn.execute(
+                    "INSERT OR REPLACE INTO kv (key, value, expires_at, evictable, written_at) VALUES (?, ?, ?, ?, ?)",
+                    (key, str(value).encode(), row[1] if row else now + ttl, is_evictable(key), now)
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            if row is None:
+                self._after_write(conn, now)
+            return value
+
+class RedisError(Exception):
+    """Error reply from a Redis-protocol server."""
+
+def _encode_command(args: Sequence[Any]) -> bytes:
+    parts = [f"*{len(args)}\r\n".encode()]
+    for arg in args:
+        data = arg if isinstance(arg, bytes) else str(arg).encode()
+        parts.append(f"${len(data)}\r\n".encode())
+        parts.append(data + b"\r\n")
+    return b"".join(parts)
+
+async def _read_reply(reader: asyncio.StreamReader) -> Any:
+    line = await reader.readline()
+    if not line:
+        raise ConnectionError("Redis connection closed")
+    prefix, payload = line[:1], line[1:-2]
+    if prefix == b"+":
+        return payload.decode()
+    if prefix == b"-":
+        raise RedisError(payload.decode())
+    if prefix == b":":
+        return int(payload)
+    if prefix == b"$":
+        length = int(payload)
+        if length < 0:
+            return None
+        return (await reader.readexactly(length + 2))[:-2]
+    if prefix == b"*":
+        length = int(payload)
+        if length < 0:
+            return None
+        return [await _read_reply(reader) for _ in range(length)]
+    raise RedisError(f"Unexpected reply: {line!r}")
+
+class _RedisConnection:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+    async def execute_many(self, commands: Sequence[Sequence[Any]]) -> List[Any]:
+        """Pipeline the commands in one write and read their replies in order."""
+        self.writer.write(b"".join(_encode_command(command) for command in commands))
+        await self.writer.drain()
+        replies = []
+        error = None
+        for _ in commands:
+            try:
+                replies.append(await _read_reply(self.reader))
+            except RedisError as e:
+                # Keep reading so the connection stays in sync
+                error = error or e
+                replies.append(None)
+        if error is not None:
+            raise error
+        return replies
+
+    def close(self) -> None:
+        self.writer.close()
+
+class RedisStore(SharedStore):
+    """Store on a Redis-protocol server, shared by every worker and host.
+
+    Speaks RESP directly over asyncio streams, so no client library is needed.
+    Idle connections are pooled per process and event loop. Entries are bounded
+    by their TTL and by the server's own ``maxmemory`` policy.
+    """
+
+    backend = "redis"
+
+    def __init__(self, url: str, prefix: str = "grief:", max_idle_connections: int = 10, timeout: float = 2.0):
+        parsed = urlparse(url)
+        if parsed.scheme != "redis":
+            raise ValueError(f"Unsupported shared store URL: {url}")
+        self.host = parsed.hostname or "127.0.0.1"
+        self.port = parsed.port or 6379
+        self.password = unquote(parsed.password) if parsed.password else None
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.prefix = prefix
+        self.max_idle_connections = max_idle_connections
+        self.timeout = timeout
+        self._idle: List[_RedisConnection] = []
+        self._owner: Optional[Tuple[int, asyncio.AbstractEventLoop]] = None
+
+    async def _connect(self) -> _RedisConnection:
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(self.host, self.port), self.timeout)
+        connection = _RedisConnection(reader, writer)
+        setup = []
+        if self.password:
+            setup.append(("AUTH", self.password))
+        if self.db:
+            setup.append(("SELECT", self.db))
+        if setup:
+            try:
+                await connection.execute_many(setup)
+            except BaseException:
+                connection.close()
+                raise
+        return connection
+
+    async def _execute(self, *commands: Sequence[Any]) -> List[Any]:
+        owner = (os.getpid(), asyncio.get_running_loop())
+        if self._owner != owner:
+            # Connections belong to the loop (and process) that opened them
+            self._idle = []
+            self._owner = owner
+        connection = self._idle.pop() if self._idle else await self._connect()
+        try:
+            replies = await asyncio.wait_for(connection.execute_many(commands), self.timeout)
+        except RedisError:
+            # Error replies were fully read, the connection is still usable
+            self._release(connection)
+            raise
+        except BaseException:
+            # The reply stream may be out of sync now, never reuse it
+            connection.close()
+            raise
+        self._release(connection)
+        return replies
+
+    def _release(self, connection: _RedisConnection) -> None:
+        if len(self._idle) < self.max_idle_connections:
+            self._idle.append(connection)
+        else:
+            connection.close()
+
+    def _key(self, key: str) -> str:
+        return self.prefix + key
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return (await self._execute(("GET", self._key(key))))[0]
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        await self._execute(("SET", self._key(key), value, "PX", max(1, int(ttl * 1000))))
+
+    async def add(self, key: str, value: bytes, ttl: float) -> bool:
+        reply = await self._execute(("SET", self._key(key), value, "PX", max(1, int(ttl * 1000)), "NX"))
+        return reply[0] is not None
+
+    async def delete(self, key: str) -> None:
+        await self._execute(("DEL", self._key(key)))
+
+    async def incr(self, key: str, amount: int, ttl: float) -> int:
+        # Create the counter with its expiry first, so INCRBY never leaves a key without TTL
+        replies = await self._execute(
+            ("SET", self._key(key), 0, "PX", max(1, int(ttl * 1000)), "NX"),
+            ("INCRBY", self._key(key), amount)
+        )
+        return replies[1]
+
+def create_shared_store(backend: str, path: str, max_entries: int, url: Optional[str] = None) -> SharedStore:
+    """Build a store for the configured backend name ("memory", "sqlite" or "redis")."""
+    if backend == "redis":
+        if url:
+            return RedisStore(url)
+        logger.warning("SHARED_STORE_URL is not set, falling back to sqlite")
+        backend = "sqlite"
+    if backend == "sqlite":
+        return SQLiteStore(path, max_entries=max_entries)
+    if backend != "memory":
+        logger.warning(f"Unknown shared store backend '{backend}', falling back to memory")
+    return MemoryStore(max_entries=max_entries)
+
+_shared_store: Optional[SharedStore] = None
+_shared_store_lock = threading.Lock()
+
+def get_shared_store() -> SharedStore:
+    """Return the process-wide store configured by ``SHARED_STORE_*``."""
+    global _shared_store
+    with _shared_store_lock:
+        if _shared_store is None:
+            config = Config()
+            _shared_store = create_shared_store(
+                config.shared_store_backend,
+                config.shared_store_path,
+                config.shared_store_max_entries,
+                config.shared_store_url
+            )
+            logger.info(f"Using {_shared_store.backend} shared store")
+        return _shared_store
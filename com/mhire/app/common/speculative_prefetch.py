@@ -0,0 +1,215 @@
+import asyncio
+import logging
+import threading
+
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Type, TypeVar
+
+from pydantic_core import to_json
+
+from com.mhire.app.config.config import Config
+from com.mhire.app.common.json_handler import get_type_adapter
+from com.mhire.app.common.llm_scheduler import get_llm_scheduler
+from com.mhire.app.common.request_context import background_scope, remaining_time
+from com.mhire.app.common.shared_store import SharedStore, get_shared_store
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+PREFETCH_ENDPOINT = "speculative_prefetch"
+
+def prefetch_key(request: Any, step: str) -> Optional[str]:
+    """Key of the speculative result for ``step``, if the request only refers to its session.
+
+    Requests that send their own inputs may differ from what was speculated,
+    so they never use a prefetched result.
+    """
+    token = getattr(request, "session_token", None)
+    if not token or any(getattr(request, field, None) is not None for field in ("user_thoughts", "relationship", "cause_of_loss")):
+        return None
+    return f"{token}:{step}"
+
+class SpeculativePrefetcher:
+    """Runs the likely next steps of a session before the client asks for them.
+
+    Jobs run in the background at the scheduler's lowest priority, at most
+    ``max_in_flight`` at a time per worker, and are skipped outright while
+    real requests are queued for the model. Results are kept in the shared
+    store for ``ttl`` seconds and handed out once: a follow-up request claims
+    the result, or joins the job if it is still running in this worker.
+    Results nobody claimed before they expire are counted as wasted.
+    """
+
+    # Check for an unclaimed result just before it expires
+    WASTE_CHECK_FRACTION = 0.95
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        max_in_flight: int = 4,
+        ttl: float = 600,
+        timeout: float = 60,
+        store: Optional[SharedStore] = None
+    ):
+        self.enabled = enabled
+        self.max_in_flight = max_in_flight
+        self.ttl = ttl
+        self.timeout = timeout
+        self._store = store
+        self._running: Dict[str, asyncio.Task] = {}
+        self._pending: Set[asyncio.Task] = set()
+        self.submitted = 0
+        self.skipped = 0
+        self.completed = 0
+        self.failed = 0
+        self.hits = 0
+        self.joined = 0
+        self.misses = 0
+        self.wasted = 0
+
+    @property
+    def store(self) -> SharedStore:
+        if self._store is None:
+            self._store = get_shared_store()
+        return self._store
+
+    def _store_key(self, key: str) -> str:
+        return f"prefetch:{key}"
+
+    def _track(self, task: asyncio.Task) -> None:
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    def run_in_background(self, coro: Awaitable[Any]) -> None:
+        """Run bookkeeping that no request should wait for."""
+        self._track(asyncio.ensure_future(coro))
+
+    def submit(self, key: str, job: Callable[[], Awaitable[Any]]) -> bool:
+        """Start ``job`` in the background unless it is running or capacity is short."""
+        if not self.enabled or key in self._running:
+            return False
+        if len(self._running) >= self.max_in_flight or get_llm_scheduler().queued:
+            self.skipped += 1
+            return False
+        task = asyncio.ensure_future(self._run(key, job))
+        self._running[key] = task
+        task.add_done_callback(lambda _: self._running.pop(key, None))
+        self.submitted += 1
+        return True
+
+    async def _run(self, key: str, job: Callable[[], Awaitable[Any]]) -> Optional[Any]:
+        try:
+            with background_scope(PREFETCH_ENDPOINT, self.timeout):
+                result = await job()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.failed += 1
+            logger.info(f"Speculative prefetch {key.split(':', 1)[-1]} failed: {str(getattr(e, 'detail', e))}")
+            return None
+        self.completed += 1
+        try:
+            await self.store.set(self._store_key(key), to_json(result), self.ttl)
+        except Exception as e:
+            logger.warning(f"Failed to store speculative result: {str(e)}")
+            return result
+        self._track(asyncio.ensure_future(self._count_if_unclaimed(key)))
+        return result
+
+    async def _count_if_unclaimed(self, key: str) -> None:
+        await asyncio.sleep(self.ttl * self.WASTE_CHECK_FRACTION)
+        try:
+            if await self.store.get(self._store_key(key)) is not None:
+                self.wasted += 1
+        except Exception as e:
+            logger.warning(f"Failed to check speculative result: {str(e)}")
+
+    async def claim(self, key: Optional[str], target_type: Type[T]) -> Optional[T]:
+        """The speculative result for ``key``, or None if there is none to use."""
+        if not self.enabled or key is None:
+            return None
+        task = self._running.get(key)
+        if task is not None:
+            try:
+                # Shielded: a cancelled request must not cancel the job for a retry
+                result = await asyncio.wait_for(asyncio.shield(task), timeout=remaining_time())
+            except asyncio.TimeoutError:
+                result = None
+            if result is not None:
+                self.joined += 1
+                await self._forget(key)
+                return result
+        try:
+            raw = await self.store.get(self._store_key(key))
+            if raw is not None:
+                await self._forget(key)
+                self.hits += 1
+                return get_type_adapter(target_type).validate_json(raw)
+        except Exception as e:
+            logger.warning(f"Failed to read speculative result: {str(e)}")
+        self.misses += 1
+        return None
+
+    async def _forget(self, key: str) -> None:
+        try:
+            await self.store.delete(self._store_key(key))
+        except Exception as e:
+            logger.warning(f"Failed to drop claimed speculative result: {str(e)}")
+
+    async def record_choice(self, group: str, choice: str) -> None:
+        """Count what users picked, so later speculation favours the usual choices."""
+        if not self.enabled:
+            return
+        try:
+            await self.store.incr(f"prefetch:choices:{group}:{choice}", 1, ttl=30 * 86400)
+        except Exception as e:
+            logger.warning(f"Failed to record choice: {str(e)}")
+
+    async def rank(self, group: str, choices: List[str]) -> List[str]:
+        """``choices`` ordered by how often they were picked; ties keep their order."""
+        counts: Dict[str, int] = {}
+        for choice in choices:
+            try:
+                raw = await self.store.get(f"prefetch:choices:{group}:{choice}")
+            except Exception:
+                raw = None
+            counts[choice] = int(raw) if raw else 0
+        return sorted(choices, key=lambda choice: -counts[choice])
+
+    def snapshot(self) -> Dict[str, Any]:
+        served = self.hits + self.joined
+        return {
+            "enabled": self.enabled,
+            "running": len(self._running),
+            "max_in_flight": self.max_in_flight,
+            "submitted": self.submitted,
+            "skipped": self.skipped,
+            "completed": self.completed,
+            "failed": self.failed,
+            "hits": self.hits,
+            "joined": self.joined,
+            "misses": self.misses,
+            "wasted": self.wasted,
+            "hit_rate": round(served / (served + self.misses), 3) if served + self.misses else 0.0
+        }
+
+_prefetcher: Optional[SpeculativePrefetcher] = None
+_prefetcher_lock = threading.Lock()
+
+def get_prefetcher() -> SpeculativePrefetcher:
+    """Return the worker-wide prefetcher configured by ``SPECULATIVE_PREFETCH_*`` settings."""
+    global _prefetcher
+    with _prefetcher_lock:
+        if _prefetcher is None:
+            config = Config()
+            _prefetcher = SpeculativePrefetcher(
+                enabled=config.speculative_prefetch_enabled,
+                max_in_flight=config.speculative_prefetch_max_in_flight,
+                ttl=config.speculative_prefetch_ttl_seconds,
+                timeout=config.speculative_prefetch_timeout_seconds
+            )
+        return _prefetcher
+
+def prefetch_snapshot() -> Optional[Dict[str, Any]]:
+    """Prefetch counters for the health endpoint, None before first use."""
+    return _prefetcher.snapshot() if _prefetcher is not None else None
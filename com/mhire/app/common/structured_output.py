@@ -0,0 +1,85 @@
+import logging
+
+from enum import Enum
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+from com.mhire.app.common.json_handler import get_type_adapter
+
+logger = logging.getLogger(__name__)
+
+class StructuredOutputMode(str, Enum):
+    # JSON mode with the format described in the prompt
+    PROMPT = "prompt"
+    # Provider-side JSON Schema constrained decoding
+    JSON_SCHEMA = "json_schema"
+    # A single forced function call whose parameters are the schema
+    TOOL = "tool"
+
+def _inline_refs(node: Any, defs: Dict[str, Any]) -> Any:
+    """Replace ``$ref`` pointers with their definitions; not every model follows references."""
+    if isinstance(node, dict):
+        ref = node.get("$ref")
+        if isinstance(ref, str) and ref.startswith("#/$defs/"):
+            siblings = {key: value for key, value in node.items() if key != "$ref"}
+            return {**_inline_refs(defs[ref.split("/")[-1]], defs), **siblings}
+        return {key: _inline_refs(value, defs) for key, value in node.items() if key != "$defs"}
+    if isinstance(node, list):
+        return [_inline_refs(item, defs) for item in node]
+    return node
+
+@lru_cache(maxsize=None)
+def output_schema(target: Any, exclude: Tuple[str, ...] = ()) -> Dict[str, Any]:
+    """Self-contained JSON Schema of a model or type, without the fields in ``exclude``.
+
+    Built from the same pydantic models the responses are validated against,
+    so the schema sent to the model cannot drift from what the service accepts.
+    """
+    schema = get_type_adapter(target).json_schema()
+    schema = _inline_refs(schema, schema.get("$defs", {}))
+    if exclude:
+        schema["properties"] = {name: value for name, value in schema["properties"].items() if name not in exclude}
+        schema["required"] = [name for name in schema.get("required", []) if name not in exclude]
+    return schema
+
+class StructuredOutput:
+    """Request parameters and response extraction for one structured-output mode.
+
+    In ``prompt`` mode the services keep describing the JSON format in their
+    prompts and ask for JSON mode. In the schema modes the format goes to the
+    provider as a JSON Schema, either as ``response_format`` or as the only tool
+    the model must call, and the prompts leave the format description out.
+    """
+
+    def __init__(self, mode: str = StructuredOutputMode.PROMPT.value):
+        try:
+            self.mode = StructuredOutputMode(mode)
+        except ValueError:
+            logger.warning(f"Unknown STRUCTURED_OUTPUT_MODE {mode}, describing the format in prompts")
+            self.mode = StructuredOutputMode.PROMPT
+
+    @property
+    def schema_enforced(self) -> bool:
+        """Whether the provider is given the schema, so prompts can skip the format description."""
+        return self.mode != StructuredOutputMode.PROMPT
+
+    def params(self, name: str, target: Any, description: str = "", exclude: Tuple[str, ...] = ()) -> Dict[str, Any]:
+        """Completion parameters that ask for output shaped like ``target``."""
+        if self.mode == StructuredOutputMode.PROMPT:
+            return {"response_format": {"type": "json_object"}}
+        schema = output_schema(target, exclude)
+        if self.mode == StructuredOutputMode.JSON_SCHEMA:
+            return {"response_format": {"type": "json_schema", "json_schema": {"name": name, "schema": schema}}}
+        return {
+            "tools": [{"type": "function", "function": {"name": name, "description": description, "parameters": schema}}],
+            "tool_choice": {"type": "function", "function": {"name": name}}
+        }
+
+    def content(self, completion: Any) -> Optional[str]:
+        """The JSON text of a completion: the forced call's arguments, or the message content."""
+        if not completion.choices:
+            return None
+        message = completion.choices[0].message
+        if self.mode == StructuredOutputMode.TOOL and getattr(message, "tool_calls", None):
+            return message.tool_calls[0].function.arguments
+        return message.content
@@ -0,0 +1,115 @@
+import asyncio
+import logging
+import time
+
+from typing import Any, Dict, List, Optional
+
+from groq import AsyncGroq
+from tavily import AsyncTavilyClient
+
+from com.mhire.app.common.circuit_breaker import CircuitOpenError, get_circuit_breaker, is_upstream_failure
+from com.mhire.app.common.model_router import LLMTask, ModelRouter
+from com.mhire.app.common.llm_scheduler import get_llm_scheduler
+from com.mhire.app.common.usage_tracker import get_usage_tracker
+from com.mhire.app.common.request_context import call_within_deadline, current_context
+
+logger = logging.getLogger(__name__)
+
+class SlowUpstreamError(Exception):
+    """Raised when a model does not answer within its task's ``slow_seconds``."""
+
+    upstream_failure = True
+
+    def __init__(self, model: str, seconds: float):
+        self.detail = f"Model '{model}' did not answer within {seconds}s"
+        super().__init__(self.detail)
+
+class GroqChatClient:
+    """Groq chat completions routed by task and guarded by per-model circuit breakers.
+
+    Calls wait for a slot in the worker's LLM scheduler, so interactive endpoints
+    go ahead of bulk generation when capacity is limited. Each call only gets the
+    time left in the current request's budget and is cancelled (closing its HTTP
+    request) when that runs out. When the task's primary model is slow,
+    rate-limited or failing, the call is retried once on the task's fallback model.
+    """
+
+    def __init__(self, api_key: str, router: Optional[ModelRouter] = None):
+        self.client = AsyncGroq(api_key=api_key)
+        self.router = router or ModelRouter()
+
+    async def _request(self, task: LLMTask, soft_timeout: Optional[float], **kwargs: Any) -> Any:
+        context = current_context()
+        attempt = context.next_attempt(task.value) if context else 1
+        start_time = time.perf_counter()
+        scheduler_wait = 0.0
+        completion = None
+        outcome = "error"
+        try:
+            async with get_llm_scheduler().slot() as scheduler_wait:
+                call = call_within_deadline(self.client.chat.completions.create, **kwargs)
+                if soft_timeout is None:
+                    completion = await call
+                else:
+                    try:
+                        completion = await asyncio.wait_for(call, timeout=soft_timeout)
+                    except asyncio.TimeoutError:
+                        raise SlowUpstreamError(kwargs["model"], soft_timeout)
+            outcome = "ok"
+            return completion
+        except asyncio.CancelledError:
+            # Abandoned by its request, which says nothing about the model
+            outcome = "cancelled"
+            raise
+        finally:
+            get_usage_tracker().record(
+                request_id=context.request_id if context else None,
+                endpoint=context.endpoint if context else "none",
+                stage=task.value,
+                attempt=attempt,
+                model=kwargs["model"],
+                outcome=outcome,
+                latency=time.perf_counter() - start_time,
+                scheduler_wait=scheduler_wait,
+                completion=completion
+            )
+
+    async def _create(self, task: LLMTask, model: str, soft_timeout: Optional[float] = None, **kwargs: Any) -> Any:
+        breaker = get_circuit_breaker(f"groq:{model}")
+        return await breaker.call(self._request, task, soft_timeout, model=model, **kwargs)
+
+    async def complete(self, task: LLMTask, messages: List[Dict[str, str]], **overrides: Any) -> Any:
+        """Create a chat completion with the model profile routed for ``task``."""
+        profile = self.router.profile(task)
+        params = {"temperature": profile.temperature, "max_tokens": profile.max_tokens, **overrides}
+        start_time = time.perf_counter()
+
+        if profile.fallback_model is None:
+            completion = await self._create(task, profile.model, messages=messages, **params)
+        else:
+            try:
+                completion = await self._create(
+                    task, profile.model, soft_timeout=profile.slow_seconds, messages=messages, **params
+                )
+            except Exception as e:
+                if not isinstance(e, CircuitOpenError) and not is_upstream_failure(e):
+                    raise
+                logger.warning(f"Task {task.value}: {profile.model} unavailable ({str(e)}), using {profile.fallback_model}")
+                completion = await self._create(task, profile.fallback_model, messages=messages, **params)
+
+        logger.debug(f"Task {task.value} completed by {completion.model} in {time.perf_counter() - start_time:.3f}s")
+        return completion
+
+    async def prewarm(self) -> None:
+        """Open the connection pool before the first request arrives."""
+        await self.client.models.list()
+
+class TavilySearchClient:
+    """Tavily web search guarded by the shared ``tavily`` circuit breaker."""
+
+    def __init__(self, api_key: str):
+        self.client = AsyncTavilyClient(api_key=api_key)
+        self.breaker = get_circuit_breaker("tavily")
+
+    async def search(self, **kwargs: Any) -> Dict[str, Any]:
+        return await self.breaker.call(call_within_deadline, self.client.search, **kwargs)
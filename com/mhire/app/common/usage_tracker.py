@@ -0,0 +1,245 @@
+import asyncio
+import json
+import logging
+import threading
+import time
+
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+
+from com.mhire.app.config.config import Config
+from com.mhire.app.common.shared_store import SharedStore, get_shared_store
+
+logger = logging.getLogger(__name__)
+
+# USD per million (prompt, completion) tokens; override with GROQ_MODEL_PRICES
+DEFAULT_PRICES: Dict[str, Tuple[float, float]] = {
+    "llama-3.3-70b-versatile": (0.59, 0.79),
+    "llama-3.1-8b-instant": (0.05, 0.08),
+    "llama3-70b-8192": (0.59, 0.79),
+    "llama3-8b-8192": (0.05, 0.08),
+    "gemma2-9b-it": (0.20, 0.20),
+}
+
+BUDGET_WARNING_FRACTIONS = (0.8, 1.0)
+
+class UsageRecord:
+    """One upstream completion attempt."""
+
+    __slots__ = (
+        "timestamp", "request_id", "endpoint", "stage", "attempt", "model", "outcome",
+        "prompt_tokens", "completion_tokens", "cost_usd", "latency", "scheduler_wait",
+        "queue_time", "generation_time"
+    )
+
+    def __init__(self, **fields: Any):
+        for name in self.__slots__:
+            setattr(self, name, fields.get(name))
+
+def _mean(values: List[float]) -> Optional[float]:
+    return round(sum(values) / len(values), 4) if values else None
+
+def _p95(values: List[float]) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return round(ordered[int(0.95 * (len(ordered) - 1))], 4)
+
+class UsageTracker:
+    """Token, cost and latency accounting for upstream LLM calls.
+
+    Every attempt is kept for ``window_seconds`` in this worker and aggregated
+    per endpoint and stage on demand. Daily token and cost totals are counted
+    in the shared store so the budget covers every worker; the worker whose
+    increment crosses a budget threshold logs the warning.
+    """
+
+    def __init__(
+        self,
+        window_seconds: float = 3600,
+        max_records: int = 20000,
+        prices: Optional[Dict[str, Tuple[float, float]]] = None,
+        daily_token_budget: int = 0,
+        daily_cost_budget_usd: float = 0.0,
+        store: Optional[SharedStore] = None
+    ):
+        self.window_seconds = window_seconds
+        self.prices = {**DEFAULT_PRICES, **(prices or {})}
+        self.daily_token_budget = daily_token_budget
+        self.daily_cost_budget_usd = daily_cost_budget_usd
+        self._store = store
+        self._records: Deque[UsageRecord] = deque(maxlen=max_records)
+        self._lock = threading.Lock()
+        self._pending: Set[asyncio.Task] = set()
+
+    @property
+    def store(self) -> SharedStore:
+        if self._store is None:
+            self._store = get_shared_store()
+        return self._store
+
+    def cost(self, model: str, prompt_tokens: int, completion_tokens: int) -> float:
+        prompt_price, completion_price = self.prices.get(model, (0.0, 0.0))
+        return (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1_000_000
+
+    def record(
+        self,
+        request_id: Optional[str],
+        endpoint: str,
+        stage: str,
+        attempt: int,
+        model: str,
+        outcome: str,
+        latency: float,
+        scheduler_wait: float,
+        completion: Any = None
+    ) -> None:
+        """Record an attempt; ``completion`` supplies Groq's usage block when it succeeded."""
+        usage = getattr(completion, "usage", None)
+        prompt_tokens = getattr(usage, "prompt_tokens", None) or 0
+        completion_tokens = getattr(usage, "completion_tokens", None) or 0
+        record = UsageRecord(
+            timestamp=time.time(),
+            request_id=request_id,
+            endpoint=endpoint,
+            stage=stage,
+            attempt=attempt,
+            model=model,
+            outcome=outcome,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            cost_usd=self.cost(model, prompt_tokens, completion_tokens),
+            latency=latency,
+            scheduler_wait=scheduler_wait,
+            queue_time=getattr(usage, "queue_time", None),
+            generation_time=getattr(usage, "completion_time", None)
+        )
+        with self._lock:
+            self._records.append(record)
+        if prompt_tokens or completion_tokens:
+            # Counted in the background so a cancelled call still gets billed
+            task = asyncio.ensure_future(self._count_daily(record))
+            self._pending.add(task)
+            task.add_done_callback(self._pending.discard)
+
+    def _day(self) -> str:
+        return datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+    async def _count_daily(self, record: UsageRecord) -> None:
+        day = self._day()
+        tokens = record.prompt_tokens + record.completion_tokens
+        micro_usd = round(record.cost_usd * 1_000_000)
+        try:
+            total_tokens = await self.store.incr(f"usage:{day}:tokens", tokens, ttl=2 * 86400)
+            total_micro_usd = await self.store.incr(f"usage:{day}:cost_microusd", micro_usd, ttl=2 * 86400)
+        except Exception as e:
+            logger.warning(f"Failed to count daily usage: {str(e)}")
+            return
+        self._check_budget("token", total_tokens - tokens, total_tokens, self.daily_token_budget)
+        self._check_budget(
+            "cost", (total_micro_usd - micro_usd) / 1_000_000, total_micro_usd / 1_000_000, self.daily_cost_budget_usd
+        )
+
+    def _check_budget(self, name: str, before: float, after: float, budget: float) -> None:
+        if budget <= 0:
+            return
+        for fraction in BUDGET_WARNING_FRACTIONS:
+            threshold = budget * fraction
+            if before < threshold <= after:
+                logger.warning(
+                    f"Daily {name} usage reached {fraction:.0%} of budget: {after:g} of {budget:g} ({self._day()} UTC)"
+                )
+
+    async def daily_totals(self) -> Dict[str, Any]:
+        day = self._day()
+        tokens = await self.store.get(f"usage:{day}:tokens")
+        micro_usd = await self.store.get(f"usage:{day}:cost_microusd")
+        return {
+            "day": day,
+            "tokens": int(tokens) if tokens else 0,
+            "cost_usd": round(int(micro_usd) / 1_000_000, 6) if micro_usd else 0.0,
+            "token_budget": self.daily_token_budget or None,
+            "cost_budget_usd": self.daily_cost_budget_usd or None
+        }
+
+    def aggregates(self) -> Dict[str, Any]:
+        """Rolling per-stage and per-endpoint aggregates, most expensive stages first."""
+        cutoff = time.time() - self.window_seconds
+        with self._lock:
+            while self._records and self._records[0].timestamp < cutoff:
+                self._records.popleft()
+            records = list(self._records)
+
+        stages: Dict[Tuple[str, str], List[UsageRecord]] = {}
+        requests: Dict[str, Set[str]] = {}
+        for record in records:
+            stages.setdefault((record.endpoint, record.stage), []).append(record)
+            if record.request_id:
+                requests.setdefault(record.endpoint, set()).add(record.request_id)
+
+        by_stage = []
+        for (endpoint, stage), group in stages.items():
+            succeeded = [record for record in group if record.outcome == "ok"]
+            request_count = len(requests.get(endpoint, ())) or None
+            cost = sum(record.cost_usd for record in group)
+            by_stage.append({
+                "endpoint": endpoint,
+                "stage": stage,
+                "calls": len(group),
+                "errors": sum(1 for record in group if record.outcome == "error"),
+                "cancelled": sum(1 for record in group if record.outcome == "cancelled"),
+                "retries": sum(1 for record in group if record.attempt > 1),
+                "models": sorted({record.model for record in group}),
+                "prompt_tokens": sum(record.prompt_tokens for record in group),
+                "completion_tokens": sum(record.completion_tokens for record in group),
+                "cost_usd": round(cost, 6),
+                "cost_per_request_usd": round(cost / request_count, 6) if request_count else None,
+                "latency_mean_seconds": _mean([record.latency for record in group]),
+                "latency_p95_seconds": _p95([record.latency for record in group]),
+                "scheduler_wait_mean_seconds": _mean([record.scheduler_wait for record in group]),
+                "queue_time_mean_seconds": _mean([r.queue_time for r in succeeded if r.queue_time is not None]),
+                "generation_time_mean_seconds": _mean([r.generation_time for r in succeeded if r.generation_time is not None])
+            })
+        by_stage.sort(key=lambda stage: stage["cost_usd"], reverse=True)
+
+        by_endpoint = {}
+        for endpoint, request_ids in requests.items():
+            endpoint_records = [record for record in records if record.endpoint == endpoint]
+            cost = sum(record.cost_usd for record in endpoint_records)
+            tokens = sum(record.prompt_tokens + record.completion_tokens for record in endpoint_records)
+            by_endpoint[endpoint] = {
+                "requests": len(request_ids),
+                "cost_usd": round(cost, 6),
+                "cost_per_request_usd": round(cost / len(request_ids), 6),
+                "tokens_per_request": round(tokens / len(request_ids), 1)
+            }
+
+        return {"window_seconds": self.window_seconds, "by_stage": by_stage, "by_endpoint": by_endpoint}
+
+def _load_prices(raw: Optional[str]) -> Dict[str, Tuple[float, float]]:
+    if not raw:
+        return {}
+    try:
+        return {model: (float(prices[0]), float(prices[1])) for model, prices in json.loads(raw).items()}
+    except (json.JSONDecodeError, TypeError, ValueError, IndexError, AttributeError) as e:
+        logger.error(f"Invalid GROQ_MODEL_PRICES, using defaults: {str(e)}")
+        return {}
+
+_tracker: Optional[UsageTracker] = None
+_tracker_lock = threading.Lock()
+
+def get_usage_tracker() -> UsageTracker:
+    """Return the worker-wide tracker configured by ``USAGE_*`` and budget settings."""
+    global _tracker
+    with _tracker_lock:
+        if _tracker is None:
+            config = Config()
+            _tracker = UsageTracker(
+                window_seconds=config.usage_window_seconds,
+                max_records=config.usage_max_records,
+                prices=_load_prices(config.groq_model_prices),
+                daily_token_budget=config.daily_token_budget,
+                daily_cost_budget_usd=config.daily_cost_budget_usd
+            )
+        return _tracker
@@ -13,4 +13,116 @@ class Config:
             cls._instance.groq_api_model = os.getenv("GROQ_MODEL_NAME")
             cls._instance.tavily_api_key = os.getenv("TAVILY_API_KEY")
 
+            # Task-based model routing (see common/model_router.py)
+            cls._instance.groq_small_model = os.getenv("GROQ_SMALL_MODEL_NAME", "llama-3.1-8b-instant")
+            cls._instance.groq_fallback_model = os.getenv("GROQ_FALLBACK_MODEL_NAME")
+            cls._instance.groq_task_profiles = os.getenv("GROQ_TASK_PROFILES")
+
+            # How JSON output is requested: prompt, json_schema or tool (see common/structured_output.py)
+            cls._instance.structured_output_mode = os.getenv("STRUCTURED_OUTPUT_MODE", "prompt").lower()
+
+            # How a day's schedule is generated: single (one completion) or per_period (one per period, concurrently)
+            cls._instance.schedule_generation_mode = os.getenv("SCHEDULE_GENERATION_MODE", "single").lower()
+
+            # Priority scheduling of LLM calls within a worker
+            cls._instance.llm_max_concurrency = int(os.getenv("LLM_MAX_CONCURRENCY", "16"))
+            cls._instance.llm_scheduler_policy = os.getenv("LLM_SCHEDULER_POLICY", "priority")
+            cls._instance.llm_scheduler_aging_seconds = float(os.getenv("LLM_SCHEDULER_AGING_SECONDS", "5"))
+            cls._instance.llm_scheduler_weights = os.getenv("LLM_SCHEDULER_WEIGHTS")
+
+            # Token usage and cost accounting
+            cls._instance.usage_window_seconds = float(os.getenv("USAGE_WINDOW_SECONDS", "3600"))
+            cls._instance.usage_max_records = int(os.getenv("USAGE_MAX_RECORDS", "20000"))
+            cls._instance.groq_model_prices = os.getenv("GROQ_MODEL_PRICES")
+            cls._instance.daily_token_budget = int(os.getenv("DAILY_TOKEN_BUDGET", "0"))
+            cls._instance.daily_cost_budget_usd = float(os.getenv("DAILY_COST_BUDGET_USD", "0"))
+
+            # Admin endpoints are disabled unless a token is set
+            cls._instance.admin_token = os.getenv("ADMIN_TOKEN")
+
+            # Event-loop lag monitor and blocking-call detector
+            cls._instance.loop_monitor_enabled = os.getenv("LOOP_MONITOR_ENABLED", "true").lower() == "true"
+            cls._instance.loop_monitor_interval_seconds = float(os.getenv("LOOP_MONITOR_INTERVAL_SECONDS", "0.05"))
+            cls._instance.loop_block_threshold_seconds = float(os.getenv("LOOP_BLOCK_THRESHOLD_SECONDS", "0.25"))
+
+            # On-demand request profiling (nothing is installed unless enabled)
+            cls._instance.profiling_enabled = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+            cls._instance.profiling_sample_rate = float(os.getenv("PROFILING_SAMPLE_RATE", "0"))
+            cls._instance.profiling_interval_seconds = float(os.getenv("PROFILING_INTERVAL_SECONDS", "0.005"))
+            cls._instance.profiling_ttl_seconds = float(os.getenv("PROFILING_TTL_SECONDS", "3600"))
+            cls._instance.profiling_max_concurrent = int(os.getenv("PROFILING_MAX_CONCURRENT", "4"))
+
+            # Open upstream connections while each worker starts
+            cls._instance.prewarm_connections = os.getenv("PREWARM_CONNECTIONS", "true").lower() == "true"
+
+            # Circuit breakers around Groq and Tavily
+            cls._instance.circuit_failure_rate = float(os.getenv("CIRCUIT_FAILURE_RATE", "0.5"))
+            cls._instance.circuit_window_size = int(os.getenv("CIRCUIT_WINDOW_SIZE", "20"))
+            cls._instance.circuit_window_seconds = float(os.getenv("CIRCUIT_WINDOW_SECONDS", "60"))
+            cls._instance.circuit_minimum_calls = int(os.getenv("CIRCUIT_MINIMUM_CALLS", "5"))
+            cls._instance.circuit_open_seconds = float(os.getenv("CIRCUIT_OPEN_SECONDS", "30"))
+            cls._instance.circuit_half_open_calls = int(os.getenv("CIRCUIT_HALF_OPEN_CALLS", "1"))
+
+            # Per-request time budgets (seconds), overridable per request by header
+            cls._instance.deadline_header = os.getenv("DEADLINE_HEADER", "X-Request-Timeout")
+            cls._instance.max_request_timeout_seconds = float(os.getenv("MAX_REQUEST_TIMEOUT_SECONDS", "120"))
+            cls._instance.sentiment_timeout_seconds = float(os.getenv("SENTIMENT_TIMEOUT_SECONDS", "20"))
+            cls._instance.schedule_timeout_seconds = float(os.getenv("SCHEDULE_TIMEOUT_SECONDS", "45"))
+            cls._instance.content_timeout_seconds = float(os.getenv("CONTENT_TIMEOUT_SECONDS", "60"))
+            cls._instance.multi_day_schedule_timeout_seconds = float(os.getenv("MULTI_DAY_SCHEDULE_TIMEOUT_SECONDS", "120"))
+
+            # Days of a multi-day schedule generated at the same time
+            cls._instance.multi_day_parallel_days = int(os.getenv("MULTI_DAY_PARALLEL_DAYS", "3"))
+
+            # Admission control for the generation endpoints (limits per worker)
+            cls._instance.admission_control_enabled = os.getenv("ADMISSION_CONTROL_ENABLED", "true").lower() == "true"
+            cls._instance.admission_endpoint_limits = os.getenv("ADMISSION_ENDPOINT_LIMITS")
+
+            # Per-client quotas in cost units per sliding window, counted in the shared store
+            cls._instance.quota_enabled = os.getenv("QUOTA_ENABLED", "true").lower() == "true"
+            cls._instance.quota_window_seconds = float(os.getenv("QUOTA_WINDOW_SECONDS", "60"))
+            cls._instance.quota_client_limit = int(os.getenv("QUOTA_CLIENT_LIMIT", "120"))
+            cls._instance.quota_endpoint_limits = os.getenv("QUOTA_ENDPOINT_LIMITS")
+            cls._instance.quota_api_keys = os.getenv("QUOTA_API_KEYS")
+            # Proxies (addresses or CIDR networks, "*" for any peer) whose X-Real-IP/X-Forwarded-For name the caller
+            cls._instance.quota_trusted_proxies = [proxy.strip() for proxy in os.getenv("QUOTA_TRUSTED_PROXIES", "").split(",") if proxy.strip()]
+
+            # Origins allowed by CORS, comma-separated
+            cls._instance.cors_allow_origins = [origin.strip() for origin in os.getenv("CORS_ALLOW_ORIGINS", "*").split(",") if origin.strip()]
+
+            # Store shared by all workers for caches, idempotency records and job results
+            cls._instance.shared_store_backend = os.getenv("SHARED_STORE_BACKEND", "sqlite")
+            cls._instance.shared_store_path = os.getenv("SHARED_STORE_PATH", "/tmp/grief_shared_store.sqlite3")
+            cls._instance.shared_store_url = os.getenv("SHARED_STORE_URL")
+            cls._instance.shared_store_max_entries = int(os.getenv("SHARED_STORE_MAX_ENTRIES", "5000"))
+
+            # Exact-match response caches (0 disables)
+            cls._instance.sentiment_cache_ttl_seconds = float(os.getenv("SENTIMENT_CACHE_TTL_SECONDS", "86400"))
+
+            # Near-duplicate reuse for user_thoughts (TTL 0 disables)
+            cls._instance.semantic_cache_threshold = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.95"))
+            cls._instance.semantic_cache_ttl_seconds = float(os.getenv("SEMANTIC_CACHE_TTL_SECONDS", "3600"))
+            cls._instance.semantic_cache_max_entries = int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", "500"))
+            cls._instance.semantic_cache_max_buckets = int(os.getenv("SEMANTIC_CACHE_MAX_BUCKETS", "256"))
+
+            # Local song catalog (unset path uses the bundled catalog)
+            cls._instance.song_catalog_path = os.getenv("SONG_CATALOG_PATH")
+            cls._instance.song_catalog_misses_path = os.getenv("SONG_CATALOG_MISSES_PATH", "/tmp/grief_song_catalog_misses.jsonl")
+            cls._instance.song_catalog_learned_ttl_seconds = float(os.getenv("SONG_CATALOG_LEARNED_TTL_SECONDS", "2592000"))
+
+            # Server-side session context shared by the generation endpoints
+            cls._instance.session_ttl_seconds = float(os.getenv("SESSION_TTL_SECONDS", "86400"))
+            cls._instance.session_context_max_chars = int(os.getenv("SESSION_CONTEXT_MAX_CHARS", "1200"))
+
+            # Speculative generation of the next UI steps after sentiment analysis (opt-in)
+            cls._instance.speculative_prefetch_enabled = os.getenv("SPECULATIVE_PREFETCH_ENABLED", "false").lower() == "true"
+            cls._instance.speculative_prefetch_max_in_flight = int(os.getenv("SPECULATIVE_PREFETCH_MAX_IN_FLIGHT", "4"))
+            cls._instance.speculative_prefetch_ttl_seconds = float(os.getenv("SPECULATIVE_PREFETCH_TTL_SECONDS", "600"))
+            cls._instance.speculative_prefetch_timeout_seconds = float(os.getenv("SPECULATIVE_PREFETCH_TIMEOUT_SECONDS", "60"))
+            cls._instance.speculative_prefetch_tools = int(os.getenv("SPECULATIVE_PREFETCH_TOOLS", "2"))
+
+            # Idempotency-Key support for generation endpoints
+            cls._instance.idempotency_ttl_seconds = float(os.getenv("IDEMPOTENCY_TTL_SECONDS", "3600"))
+            cls._instance.idempotency_wait_seconds = float(os.getenv("IDEMPOTENCY_WAIT_SECONDS", "120"))
+
         return cls._instance
\ No newline at end of file
@@ -1,13 +1,26 @@
 import time, logging
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
+from com.mhire.app.config.config import Config
+from com.mhire.app.common.lazy_service import warm_services
+from com.mhire.app.common.admission_control import AdmissionController, AdmissionControlMiddleware
+from com.mhire.app.common.circuit_breaker import circuit_breaker_snapshot, CircuitBreaker
+from com.mhire.app.common.response_cache import response_cache_snapshot
+from com.mhire.app.common.llm_scheduler import llm_scheduler_snapshot
+from com.mhire.app.common.speculative_prefetch import prefetch_snapshot
+from com.mhire.app.common.client_disconnect import cancellation_snapshot
+from com.mhire.app.common.client_quota import ClientQuotaMiddleware, LIMIT_HEADERS, get_client_quotas
+from com.mhire.app.common.loop_monitor import LoopMonitorMiddleware, get_loop_monitor, loop_monitor_snapshot
+from com.mhire.app.common.request_profiler import ProfilingMiddleware, get_request_profiler
 from com.mhire.app.common.network_responses import (NetworkResponse, HTTPCode)
 from com.mhire.app.services.schedule_builder.schedule_builder_router import router as schedule_builder_router 
 from com.mhire.app.services.sentiment_toolkit.sentiment_toolkit_router import router as sentiment_toolkit_router
 from com.mhire.app.services.personalized_content.personalized_content_router import router as personalized_content_router 
+from com.mhire.app.services.admin.admin_router import router as admin_router
 
 # Configure logging with proper format
 logging.basicConfig(
@@ -16,38 +29,87 @@ logging.basicConfig(
     handlers=[logging.StreamHandler()]
 )
 
+logger = logging.getLogger(__name__)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Build services and open upstream connections in each worker after fork."""
+    start_time = time.time()
+    config = Config()
+    if config.loop_monitor_enabled:
+        get_loop_monitor().start()
+    if config.profiling_enabled:
+        get_request_profiler().start()
+    await warm_services(prewarm_connections=config.prewarm_connections)
+    logger.info(f"Services warmed in {time.time() - start_time:.3f}s")
+    yield
+    if config.profiling_enabled:
+        get_request_profiler().stop()
+    if config.loop_monitor_enabled:
+        await get_loop_monitor().stop()
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Grief Counseling AI",
     description="An AI-powered platform for personalized grief counseling and support",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
+# Shed load before it queues up; added first so CORS headers still wrap the 503s
+admission_controller = AdmissionController()
+app.add_middleware(AdmissionControlMiddleware, controller=admission_controller)
+
+# Charge each client before admission, so one caller's burst is refused before it takes a slot;
+# requests admission then sheds with a 503 are refunded
+if Config().quota_enabled:
+    app.add_middleware(ClientQuotaMiddleware, quotas=get_client_quotas())
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # In production, replace with your Vercel frontend URL
+    allow_origins=Config().cors_allow_origins,  # In production, set CORS_ALLOW_ORIGINS to your Vercel frontend URL
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[*LIMIT_HEADERS, "Retry-After"],
 )
 
+# Wraps everything but the profiler, so a stall anywhere in a request is attributed to its route
+if Config().loop_monitor_enabled:
+    app.add_middleware(LoopMonitorMiddleware, monitor=get_loop_monitor())
+
+# Only installed when enabled, so unprofiled deployments pay nothing
+if Config().profiling_enabled:
+    app.add_middleware(ProfilingMiddleware, profiler=get_request_profiler())
+
 # Register routers
 app.include_router(schedule_builder_router)
 app.include_router(sentiment_toolkit_router)
 app.include_router(personalized_content_router)
+app.include_router(admin_router)
 
 # Health check endpoint
 @app.get("/health", response_class=JSONResponse)
 async def health_check(http_request: Request):
     """Health check endpoint"""
     start_time = time.time()
+    breakers = circuit_breaker_snapshot()
+    degraded = any(breaker["state"] != CircuitBreaker.CLOSED for breaker in breakers.values())
     return NetworkResponse().success_response(
         http_code=HTTPCode.SUCCESS,
         message="Health check successful",
         data={
-            "status": "healthy",
-            "message": "Grief Counseling AI is running and healthy"
+            "status": "degraded" if degraded else "healthy",
+            "message": "Grief Counseling AI is running and healthy",
+            "circuit_breakers": breakers,
+            "response_caches": response_cache_snapshot(),
+            "admission": admission_controller.snapshot(),
+            "llm_scheduler": llm_scheduler_snapshot(),
+            "event_loop": loop_monitor_snapshot(),
+            "speculative_prefetch": prefetch_snapshot(),
+            "cancellations": cancellation_snapshot(),
+            "quotas": get_client_quotas().snapshot() if Config().quota_enabled else None
         },
         resource=http_request.url.path,
         duration=start_time
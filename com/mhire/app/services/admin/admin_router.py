@@ -0,0 +1,114 @@
+import logging
+import time
+
+from fastapi import APIRouter, Request
+from fastapi.responses import PlainTextResponse
+
+from com.mhire.app.common.admin_auth import is_admin
+from com.mhire.app.common.usage_tracker import get_usage_tracker
+from com.mhire.app.common.json_handler import json_parse_snapshot
+from com.mhire.app.common.loop_monitor import get_loop_monitor
+from com.mhire.app.common.request_profiler import collapsed_stacks, get_request_profiler
+from com.mhire.app.common.network_responses import NetworkResponse, HTTPCode, ErrorCode, Message
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+response = NetworkResponse()
+
+def _forbidden(http_request: Request, start_time: float):
+    logger.warning(f"Rejected admin request to {http_request.url.path}")
+    return response.json_response(
+        http_code=HTTPCode.FORBIDDEN,
+        error_code=ErrorCode.Forbidden.ADMIN_TOKEN_REQUIRED,
+        error_message=Message.ErrorMessage.Forbidden.ADMIN_TOKEN_REQUIRED,
+        resource=http_request.url.path,
+        duration=time.time() - start_time
+    )
+
+@router.get("/api/v1/admin/usage")
+async def get_usage(http_request: Request):
+    """Rolling token, cost and latency aggregates of this worker plus today's totals for the deployment."""
+    start_time = time.time()
+    if not is_admin(http_request.headers):
+        return _forbidden(http_request, start_time)
+
+    tracker = get_usage_tracker()
+    try:
+        daily = await tracker.daily_totals()
+    except Exception as e:
+        logger.warning(f"Failed to read daily usage: {str(e)}")
+        daily = None
+    return response.success_response(
+        http_code=HTTPCode.SUCCESS,
+        message=Message.SuccessMessage.RESPONSE_GENERATED,
+        data={"daily": daily, **tracker.aggregates(), "json_parsing": json_parse_snapshot()},
+        resource=http_request.url.path,
+        duration=time.time() - start_time
+    )
+
+@router.get("/api/v1/admin/event-loop")
+async def get_event_loop(http_request: Request):
+    """Event-loop lag of this worker and the recent stalls with the stacks that caused them."""
+    start_time = time.time()
+    if not is_admin(http_request.headers):
+        return _forbidden(http_request, start_time)
+
+    monitor = get_loop_monitor()
+    return response.success_response(
+        http_code=HTTPCode.SUCCESS,
+        message=Message.SuccessMessage.RESPONSE_GENERATED,
+        data={"running": monitor.running, **monitor.snapshot(with_stacks=True)},
+        resource=http_request.url.path,
+        duration=time.time() - start_time
+    )
+
+@router.get("/api/v1/admin/profiles")
+async def list_profiles(http_request: Request):
+    """Summaries of the latest request profiles taken by this worker."""
+    start_time = time.time()
+    if not is_admin(http_request.headers):
+        return _forbidden(http_request, start_time)
+
+    profiler = get_request_profiler()
+    return response.success_response(
+        http_code=HTTPCode.SUCCESS,
+        message=Message.SuccessMessage.RESPONSE_GENERATED,
+        data={"running": profiler.running, "profiles": profiler.recent()},
+        resource=http_request.url.path,
+        duration=time.time() - start_time
+    )
+
+@router.get("/api/v1/admin/profiles/{profile_id}")
+async def get_profile(profile_id: str, http_request: Request, format: str = "collapsed"):
+    """One stored profile, from any worker.
+
+    ``format=collapsed`` (the default) returns folded stacks for flamegraph.pl,
+    speedscope or inferno; ``format=json`` returns the profile with its metadata.
+    """
+    start_time = time.time()
+    if not is_admin(http_request.headers):
+        return _forbidden(http_request, start_time)
+
+    try:
+        profile = await get_request_profiler().load(profile_id)
+    except Exception as e:
+        logger.warning(f"Failed to read profile: {str(e)}")
+        profile = None
+    if profile is None:
+        return response.json_response(
+            http_code=HTTPCode.NOT_FOUND,
+            error_code=ErrorCode.NotFound.PROFILE_NOT_FOUND,
+            error_message=Message.ErrorMessage.NotFound.PROFILE_NOT_FOUND,
+            resource=http_request.url.path,
+            duration=time.time() - start_time
+        )
+    if format == "json":
+        return response.success_response(
+            http_code=HTTPCode.SUCCESS,
+            message=Message.SuccessMessage.RESPONSE_GENERATED,
+            data=profile,
+            resource=http_request.url.path,
+            duration=time.time() - start_time
+        )
+    return PlainTextResponse(collapsed_stacks(profile))
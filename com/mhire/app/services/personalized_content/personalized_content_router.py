@@ -1,25 +1,48 @@
 import logging
 import time
 
+from typing import Optional
+
 from fastapi import APIRouter, Request
 
 from com.mhire.app.services.personalized_content.personalized_content import PersonalizedContent
 from com.mhire.app.services.personalized_content.personalized_content_schema import GriefContentRequest, GriefContentResponse
+from com.mhire.app.common.idempotency import IdempotencyManager
+from com.mhire.app.config.config import Config
+from com.mhire.app.common.lazy_service import LazyService
+from com.mhire.app.common.request_context import request_scope
+from com.mhire.app.common.client_disconnect import ClientDisconnectedError, run_until_disconnect
+from com.mhire.app.common.session_store import SessionContext, SessionStore, SessionNotFoundError
+from com.mhire.app.common.speculative_prefetch import get_prefetcher, prefetch_key
 from com.mhire.app.common.network_responses import NetworkResponse, HTTPCode, ErrorCode, Message
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
-personalized_content = PersonalizedContent()
+config = Config()
+personalized_content = LazyService(PersonalizedContent, "personalized_content")
 response = NetworkResponse()
+idempotency = IdempotencyManager()
+sessions = SessionStore()
+prefetcher = get_prefetcher()
 
 @router.post("/api/v1/personalized-content", response_model=GriefContentResponse)
 async def get_personalized_content(request: GriefContentRequest, http_request: Request):
     """Generate personalized grief content based on user input"""
+    return await idempotency.run(http_request, request, lambda: _generate_content(request, http_request))
+
+async def _generate_content(request: GriefContentRequest, http_request: Request):
     start_time = time.time()
     
     try:
-        content_result = await personalized_content.generate_personalized_content(request)
+        speculative_key = prefetch_key(request, f"content:{request.tool_title.value}:{request.tool_name}")
+        request, session = await sessions.resolve(request)
+        if session is not None and session.mood:
+            prefetcher.run_in_background(prefetcher.record_choice(session.mood, request.tool_title.value))
+        with request_scope(http_request, endpoint="personalized_content", default_timeout=config.content_timeout_seconds):
+            content_result = await run_until_disconnect(
+                http_request, "personalized_content", _claim_or_generate(request, speculative_key, session)
+            )
         return response.success_response(
             http_code=HTTPCode.SUCCESS,
             message=Message.SuccessMessage.RESPONSE_GENERATED,
@@ -27,12 +50,31 @@ async def get_personalized_content(request: GriefContentRequest, http_request: R
             resource=http_request.url.path,
             duration=time.time() - start_time
         )
-    
+
+
+    except SessionNotFoundError:
+        return response.session_not_found_response(http_request.url.path, time.time() - start_time)
+
+    except ClientDisconnectedError:
+        return response.client_disconnected_response(http_request.url.path, time.time() - start_time)
+
     except Exception as e:
+        upstream_error = response.upstream_error_response(e, http_request.url.path, time.time() - start_time)
+        if upstream_error is not None:
+            logger.warning(f"Upstream error: {str(getattr(e, 'detail', e))}")
+            return upstream_error
         return response.json_response(
             http_code=HTTPCode.UNPROCESSABLE_ENTITY,
             error_code=ErrorCode.UnprocessableEntity.CONTEXT_PROCESSING_ERROR,
             error_message=f"{Message.ErrorMessage.UnprocessableEntity.CONTEXT_PROCESSING_ERROR}",
             resource=http_request.url.path,
             duration=time.time() - start_time
-        )
\ No newline at end of file
+        )
+
+async def _claim_or_generate(request: GriefContentRequest, speculative_key: Optional[str], session: Optional[SessionContext]):
+    content_result = await prefetcher.claim(speculative_key, GriefContentResponse)
+    if content_result is None:
+        content_result = await personalized_content.get().generate_personalized_content(
+            request, mood=session.mood if session else None
+        )
+    return content_result
@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import List
+from pydantic import BaseModel, Field, model_validator
+from typing import List, Optional
 from enum import Enum
 
 class Relationship(str, Enum):
@@ -27,19 +27,47 @@ class ToolTitle(str, Enum):
     GET_MOVING = "Get Moving"
 
 class GriefContentRequest(BaseModel):
-    user_thoughts: str
-    relationship: Relationship
-    cause_of_loss: CauseOfLoss
+    # The inputs and tool_description can come from the session_token instead
+    user_thoughts: Optional[str] = None
+    relationship: Optional[Relationship] = None
+    cause_of_loss: Optional[CauseOfLoss] = None
     tool_title: ToolTitle
-    tool_description: str
+    tool_description: Optional[str] = None
     tool_name: str
+    session_token: Optional[str] = None
+
+    @model_validator(mode="after")
+    def require_inputs_or_session(self) -> "GriefContentRequest":
+        required = (self.user_thoughts, self.relationship, self.cause_of_loss, self.tool_description)
+        if self.session_token is None and None in required:
+            raise ValueError(
+                "user_thoughts, relationship, cause_of_loss and tool_description are required without a session_token"
+            )
+        return self
+
+class SongSuggestion(BaseModel):
+    title: str = Field(description="Song or music title, released 2010 or later")
+    artist: str
+    why_relevant: str = Field(description="Why this song matches their situation")
+
+class VideoSelection(BaseModel):
+    selected_index: int = Field(description="Index of the chosen video in the list")
+    reason: str = Field(description="One very short line on why this version will be most healing")
 
 class SongRecommendation(BaseModel):
     title: str
     url: str
     reason: str
 
+# Field descriptions double as format instructions in the structured-output schema
+class Essay(BaseModel):
+    quote: str = Field(description="Quote text - Author Name (10-15 words)")
+    welcome_to_grief_works: str = Field(description="How grief work begins, personalized to them (130 words)")
+    grief_is_hard_work: str = Field(description="Challenges of grieving specific to their loss (100 words)")
+    about_your_grief: str = Field(description="Guidance personalized to their situation (130 words)")
+    heal_and_grow: str = Field(description="Actionable steps forward with a ritual to calm the soul (125 words)")
+
 class GriefContentResponse(BaseModel):
-    motivation_cards: List[str]
-    song_recommendation: SongRecommendation
-    essay: dict
\ No newline at end of file
+    motivation_cards: List[str] = Field(description="Three actionable, comforting sentences without quotes")
+    song_recommendation: Optional[SongRecommendation] = None
+    essay: Essay
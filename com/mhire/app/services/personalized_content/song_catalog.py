@@ -0,0 +1,182 @@
+import asyncio
+import json
+import logging
+import os
+import re
+import time
+
+from typing import Any, Dict, List, Optional, Set
+
+from com.mhire.app.common.response_cache import register_cache
+from com.mhire.app.common.shared_store import SharedStore, get_shared_store
+
+logger = logging.getLogger(__name__)
+
+BUNDLED_CATALOG_PATH = os.path.join(os.path.dirname(__file__), "song_catalog.json")
+
+_BRACKETED = re.compile(r"[\(\[][^\)\]]*[\)\]]")
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+_ARTIST_STOPWORDS = {"feat", "ft", "featuring", "and", "with", "x", "the", "vs"}
+
+def normalize_text(text: str) -> str:
+    """Lowercase words only; bracketed parts like "(Official Video)" are dropped."""
+    text = _BRACKETED.sub(" ", text.lower()).replace("&", " and ")
+    return " ".join(_NON_WORD.sub(" ", text).split())
+
+def trigrams(text: str) -> Set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def title_similarity(a: str, b: str) -> float:
+    """Jaccard similarity of the character trigrams of two normalized titles."""
+    grams_a, grams_b = trigrams(a), trigrams(b)
+    return len(grams_a & grams_b) / len(grams_a | grams_b) if grams_a and grams_b else 0.0
+
+def artist_similarity(a: str, b: str) -> float:
+    """Share of the shorter artist credit found in the other, so "Adele" matches "Adele feat. X"."""
+    tokens_a = set(a.split()) - _ARTIST_STOPWORDS
+    tokens_b = set(b.split()) - _ARTIST_STOPWORDS
+    if not tokens_a or not tokens_b:
+        return 0.0
+    return len(tokens_a & tokens_b) / min(len(tokens_a), len(tokens_b))
+
+class CatalogSong:
+    def __init__(self, title: str, artist: str, video_id: str, themes: Optional[List[str]] = None, year: Optional[int] = None):
+        self.title = title
+        self.artist = artist
+        self.video_id = video_id
+        self.themes = themes or []
+        self.year = year
+        self.normalized_title = normalize_text(title)
+        self.normalized_artist = normalize_text(artist)
+
+    @property
+    def url(self) -> str:
+        return f"https://www.youtube.com/watch?v={self.video_id}"
+
+class SongCatalog:
+    """Maps suggested songs to canonical YouTube videos without a web search.
+
+    Entries come from a bundled JSON file (``SONG_CATALOG_PATH`` to use another)
+    and are matched fuzzily: titles by character-trigram similarity, artists by
+    token overlap. Entries tagged with the relationship's theme (``parent``,
+    ``partner``, ...) win near ties between versions. Songs resolved by live search are learned into the shared
+    store, so every worker reuses them, and are appended to a misses file that
+    can be curated back into the catalog.
+    """
+
+    TITLE_THRESHOLD = 0.75
+    ARTIST_THRESHOLD = 0.5
+    # Scores this close count as a tie, broken by theme
+    TIE_MARGIN = 0.05
+    namespace = "song_catalog"
+
+    def __init__(
+        self,
+        path: str = BUNDLED_CATALOG_PATH,
+        misses_path: Optional[str] = None,
+        learned_ttl: float = 30 * 86400,
+        store: Optional[SharedStore] = None
+    ):
+        self.misses_path = misses_path
+        self.learned_ttl = learned_ttl
+        self._store = store
+        self.songs: List[CatalogSong] = []
+        self._index: Dict[str, Set[int]] = {}
+        self.hits = 0
+        self.learned_hits = 0
+        self.misses = 0
+        self._load(path)
+        register_cache(self)
+
+    @property
+    def store(self) -> SharedStore:
+        if self._store is None:
+            self._store = get_shared_store()
+        return self._store
+
+    def _load(self, path: str) -> None:
+        try:
+            with open(path, encoding="utf-8") as catalog_file:
+                entries = json.load(catalog_file).get("songs", [])
+        except (OSError, ValueError, AttributeError) as e:
+            logger.error(f"Failed to load song catalog {path}: {str(e)}")
+            return
+        for position, entry in enumerate(entries):
+            try:
+                song = CatalogSong(**entry)
+            except (TypeError, AttributeError) as e:
+                logger.error(f"Skipping invalid song catalog entry {position} in {path}: {str(e)}")
+                continue
+            for gram in trigrams(song.normalized_title):
+                self._index.setdefault(gram, set()).add(len(self.songs))
+            self.songs.append(song)
+        logger.info(f"Loaded {len(self.songs)} songs from catalog {path}")
+
+    def match(self, title: str, artist: str, theme: Optional[str] = None) -> Optional[CatalogSong]:
+        """Best catalog entry for the song, or None if nothing is close enough."""
+        normalized_title, normalized_artist = normalize_text(title), normalize_text(artist)
+        candidates = set().union(*(self._index.get(gram, set()) for gram in trigrams(normalized_title)))
+        scored = []
+        for index in candidates:
+            song = self.songs[index]
+            title_score = title_similarity(normalized_title, song.normalized_title)
+            if title_score < self.TITLE_THRESHOLD:
+                continue
+            artist_score = artist_similarity(normalized_artist, song.normalized_artist)
+            if artist_score < self.ARTIST_THRESHOLD:
+                continue
+            scored.append((0.7 * title_score + 0.3 * artist_score, song))
+        if not scored:
+            return None
+        best_score = max(score for score, _ in scored)
+        tied = [(score, song) for score, song in scored if score >= best_score - self.TIE_MARGIN]
+        return max(tied, key=lambda item: (theme is not None and theme in item[1].themes, item[0]))[1]
+
+    def _learned_key(self, title: str, artist: str) -> str:
+        return f"song_catalog:learned:{normalize_text(title)}|{normalize_text(artist)}"
+
+    async def lookup(self, title: str, artist: str, relationship: Optional[str] = None) -> Optional[str]:
+        """Canonical video URL from the catalog or from songs learned earlier, else None."""
+        song = self.match(title, artist, relationship.lower() if relationship else None)
+        if song is not None:
+            self.hits += 1
+            return song.url
+        try:
+            learned = await self.store.get(self._learned_key(title, artist))
+        except Exception as e:
+            logger.warning(f"Song catalog overlay read failed: {str(e)}")
+            learned = None
+        if learned is not None:
+            self.learned_hits += 1
+            return learned.decode()
+        self.misses += 1
+        return None
+
+    async def record_miss(self, title: str, artist: str, url: Optional[str] = None) -> None:
+        """Remember a song the catalog did not know, with the video live search found for it."""
+        if url:
+            try:
+                await self.store.set(self._learned_key(title, artist), url.encode(), self.learned_ttl)
+            except Exception as e:
+                logger.warning(f"Song catalog overlay write failed: {str(e)}")
+        if self.misses_path:
+            line = json.dumps({"title": title, "artist": artist, "url": url, "recorded_at": time.time()})
+            try:
+                await asyncio.to_thread(self._append_miss, line)
+            except OSError as e:
+                logger.warning(f"Failed to record song catalog miss: {str(e)}")
+
+    def _append_miss(self, line: str) -> None:
+        with open(self.misses_path, "a", encoding="utf-8") as misses_file:
+            misses_file.write(line + "\n")
+
+    def snapshot(self) -> Dict[str, Any]:
+        lookups = self.hits + self.learned_hits + self.misses
+        return {
+            "songs": len(self.songs),
+            "hits": self.hits,
+            "learned_hits": self.learned_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.learned_hits) / lookups, 3) if lookups else 0.0
+        }
@@ -0,0 +1,111 @@
+import asyncio
+import logging
+import re
+
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+from com.mhire.app.common.upstream_clients import TavilySearchClient
+
+logger = logging.getLogger(__name__)
+
+_VIDEO_ID = re.compile(r"^[A-Za-z0-9_-]{11}$")
+_YOUTUBE_HOSTS = {"youtube.com", "www.youtube.com", "m.youtube.com", "music.youtube.com"}
+_PATH_PREFIXES = ("/shorts/", "/embed/", "/live/", "/v/")
+
+def youtube_video_id(url: str) -> Optional[str]:
+    """Extract the video ID from any common YouTube URL form, or None if it is not a video."""
+    try:
+        parsed = urlparse(url.strip())
+    except ValueError:
+        return None
+    host = (parsed.hostname or "").lower()
+    candidate = None
+    if host == "youtu.be":
+        candidate = parsed.path.lstrip("/").split("/")[0]
+    elif host in _YOUTUBE_HOSTS:
+        if parsed.path == "/watch":
+            candidate = parse_qs(parsed.query).get("v", [None])[0]
+        else:
+            for prefix in _PATH_PREFIXES:
+                if parsed.path.startswith(prefix):
+                    candidate = parsed.path[len(prefix):].split("/")[0]
+                    break
+    return candidate if candidate and _VIDEO_ID.match(candidate) else None
+
+def normalize_youtube_url(url: str) -> Optional[str]:
+    """Canonical ``https://www.youtube.com/watch?v=ID`` form; tracking and playlist parameters are dropped."""
+    video_id = youtube_video_id(url)
+    return f"https://www.youtube.com/watch?v={video_id}" if video_id else None
+
+class SongVideoSearch:
+    """Finds YouTube videos for a song with a cheap first pass.
+
+    Alternate queries (official video, lyric video) run concurrently at
+    ``basic`` depth; only when they yield fewer than ``min_candidates`` distinct
+    videos is the search repeated at ``advanced`` depth. Results are merged and
+    deduplicated by video ID, official-video hits first.
+    """
+
+    QUERY_TEMPLATES = (
+        "{title} {artist} official music video",
+        "{title} {artist} lyric video",
+    )
+    INCLUDE_DOMAINS = ["youtube.com", "youtu.be"]
+
+    def __init__(self, tavily_client: TavilySearchClient, min_candidates: int = 3, max_candidates: int = 5):
+        self.tavily_client = tavily_client
+        self.min_candidates = min_candidates
+        self.max_candidates = max_candidates
+
+    async def _search_tier(self, queries: List[str], depth: str) -> List[Dict[str, Any]]:
+        """Run the queries concurrently; failures are tolerated while any query succeeds."""
+        outcomes = await asyncio.gather(
+            *(
+                self.tavily_client.search(
+                    query=query,
+                    search_depth=depth,
+                    max_results=self.max_candidates,
+                    include_domains=self.INCLUDE_DOMAINS
+                )
+                for query in queries
+            ),
+            return_exceptions=True
+        )
+        errors = [outcome for outcome in outcomes if isinstance(outcome, BaseException)]
+        if len(errors) == len(outcomes):
+            raise errors[0]
+        for error in errors:
+            logger.warning(f"Song search query failed at {depth} depth: {str(getattr(error, 'detail', error))}")
+        return [result for outcome in outcomes if isinstance(outcome, dict) for result in outcome.get("results", [])]
+
+    def _merge(self, candidates: List[Dict[str, str]], seen: set, results: List[Dict[str, Any]]) -> None:
+        for result in results:
+            url = normalize_youtube_url(result.get("url", ""))
+            if url is None or url in seen:
+                continue
+            seen.add(url)
+            candidates.append({
+                "title": result.get("title", ""),
+                "url": url,
+                "description": (result.get("content") or result.get("description") or "")[:200]
+            })
+
+    async def find_videos(self, title: str, artist: str) -> List[Dict[str, str]]:
+        """Up to ``max_candidates`` distinct videos for the song, best matches first."""
+        queries = [template.format(title=title, artist=artist) for template in self.QUERY_TEMPLATES]
+        candidates: List[Dict[str, str]] = []
+        seen: set = set()
+
+        self._merge(candidates, seen, await self._search_tier(queries, "basic"))
+        if len(candidates) < self.min_candidates:
+            logger.info(f"Only {len(candidates)} videos at basic depth for '{title}', escalating to advanced")
+            try:
+                self._merge(candidates, seen, await self._search_tier(queries, "advanced"))
+            except Exception as e:
+                # Fewer choices beat no song at all
+                if not candidates:
+                    raise
+                logger.warning(f"Advanced song search failed, using basic results: {str(getattr(e, 'detail', e))}")
+
+        return candidates[:self.max_candidates]
@@ -1,56 +1,74 @@
+import asyncio
 import logging
 
-from datetime import datetime
-from typing import Dict
-from groq import Groq
+from enum import Enum
+from datetime import date, datetime, timedelta
+from typing import AsyncIterator, List, Optional, Tuple, Union
 
 from com.mhire.app.config.config import Config
+from com.mhire.app.common.upstream_clients import GroqChatClient
+from com.mhire.app.common.model_router import LLMTask
+from com.mhire.app.common.circuit_breaker import CircuitOpenError
+from com.mhire.app.common.request_context import DeadlineExceededError
 from com.mhire.app.common.exceptions_utility import rethrow_as_http_exception
 from com.mhire.app.common.json_handler import LLMJsonHandler
-from com.mhire.app.services.schedule_builder.schedule_builder_schema import ScheduleRequest, DailySchedule
+from com.mhire.app.common.structured_output import StructuredOutput
+from com.mhire.app.common.semantic_cache import SemanticCache
+from com.mhire.app.services.schedule_builder.schedule_builder_schema import (
+    ScheduleRequest, DailySchedule, Activity, PeriodActivities
+)
+from com.mhire.app.services.schedule_builder.schedule_normalizer import (
+    SECTIONS, PERIOD_WINDOWS, ScheduleNormalizer, format_clock
+)
 
 logger = logging.getLogger(__name__)
 
-class ScheduleBuilder:
-    MAX_RETRIES = 3
+# One emphasis per day of a multi-day plan so days generated side by side still differ
+DAY_FOCUSES = (
+    "honoring memories of your loved one",
+    "gentle movement and caring for your body",
+    "reconnecting with friends and family",
+    "creative expression",
+    "time outdoors and in nature",
+    "rest and small comforts",
+    "meaning, hope and looking ahead",
+)
 
-    def __init__(self):
-        try:
-            config = Config()
-            self.client = Groq(api_key=config.groq_api_key)
-            self.model = config.groq_api_model
-            self.json_handler = LLMJsonHandler()
-            
-            if not self.client or not self.model:
-                raise ValueError("Failed to initialize: Missing required components")
-                
-        except Exception as e:
-            rethrow_as_http_exception(e)
+# What each period must contain when the periods are generated separately
+PERIOD_CONSTRAINTS = {
+    "morning": "Include a specific breakfast with exact foods, and start the day gently",
+    "noon": "Include a specific lunch with exact foods",
+    "afternoon": "Include one specific physical activity with exact movements, duration and location",
+    "evening": "Include a specific dinner and one grief ritual with a specific prompt or theme",
+    "night": "Focus on gentle wind-down activities before sleep",
+}
 
-    def _validate_schedule_structure(self, data: Dict) -> None:
-        """Basic validation of schedule structure."""
-        try:
-            # Check each section has activities
-            for section, activities in data.items():
-                if section == 'date':
-                    continue
-                    
-                if not isinstance(activities, list):
-                    raise ValueError(f"Invalid activities format in {section}")
-                    
-                if len(activities) == 0:
-                    raise ValueError(f"No activities found in {section}")
+class ScheduleGenerationMode(str, Enum):
+    # One completion writes the whole day
+    SINGLE = "single"
+    # Five concurrent completions, one per period, merged into one schedule
+    PER_PERIOD = "per_period"
 
-        except ValueError as e:
-            rethrow_as_http_exception(e)
-        except Exception as e:
-            logger.error(f"Unexpected error in schedule validation: {str(e)}", exc_info=True)
-            rethrow_as_http_exception(Exception("Invalid schedule structure"))
+def summarize_schedule(schedule: DailySchedule, max_chars: int = 400) -> str:
+    """One line naming a day's activities, passed to later days so they do not repeat them."""
+    names = "; ".join(activity.activity for section in SECTIONS for activity in getattr(schedule, section))
+    if len(names) > max_chars:
+        names = names[:max_chars].rsplit(";", 1)[0]
+    return f"{schedule.date}: {names}"
 
-    async def generate_daily_schedule(self, request: ScheduleRequest) -> DailySchedule:
-        """Generate a personalized daily schedule based on user's grief context."""
-        try:
-            system_prompt = """You are a compassionate grief counselor creating a SPECIFIC daily schedule in JSON format.
+class ScheduleBuilder:
+    MAX_RETRIES = 3
+    # Periods regenerated at most per schedule, and the budget for each
+    MAX_REPAIRED_PERIODS = 2
+    PERIOD_MAX_TOKENS = 700
+
+    PERIOD_SYSTEM_PROMPT = """You are a compassionate grief counselor planning ONE period of a grieving person's day in JSON format.
+Return only that period's activities. Every activity must specify EXACTLY what to do - no vague suggestions:
+❌ "Do some stretching" (too vague)
+✅ "10-minute gentle yoga focusing on shoulder release"
+Personalize every activity to their loss and emotional state."""
+
+    SYSTEM_PROMPT = """You are a compassionate grief counselor creating a SPECIFIC daily schedule in JSON format.
 Your task is to return a valid JSON response with exactly 4-5 activities for each time period.
 
 CRUCIAL REQUIREMENTS:
@@ -84,9 +102,57 @@ Create a detailed JSON schedule with:
    - Give step-by-step instructions
    - Specify materials/duration"""
 
-            user_prompt = f"""Create a highly specific daily schedule as a JSON object for someone grieving their {request.relationship.value} lost to {request.cause_of_loss.value}.
+    def __init__(self):
+        try:
+            config = Config()
+            self.client = GroqChatClient(api_key=config.groq_api_key)
+            self.json_handler = LLMJsonHandler()
+            self.structured = StructuredOutput(config.structured_output_mode)
+            self.normalizer = ScheduleNormalizer()
+            try:
+                self.generation_mode = ScheduleGenerationMode(config.schedule_generation_mode)
+            except ValueError:
+                logger.warning(f"Unknown SCHEDULE_GENERATION_MODE {config.schedule_generation_mode}, generating whole days")
+                self.generation_mode = ScheduleGenerationMode.SINGLE
+            self.semantic_cache = SemanticCache(
+                "schedule_semantic",
+                threshold=config.semantic_cache_threshold,
+                ttl=config.semantic_cache_ttl_seconds,
+                max_entries=config.semantic_cache_max_entries,
+                max_buckets=config.semantic_cache_max_buckets
+            )
+            
+            if not self.client:
+                raise ValueError("Failed to initialize: Missing required components")
+                
+        except Exception as e:
+            rethrow_as_http_exception(e)
+
+    async def prewarm(self) -> None:
+        """Open the Groq connection pool before the first request arrives."""
+        await self.client.prewarm()
 
-Their current state: {request.user_thoughts}
+    def _validate_schedule_structure(self, schedule: DailySchedule) -> None:
+        """Basic validation of schedule structure."""
+        try:
+            # Check each section has activities
+            for section in SECTIONS:
+                if len(getattr(schedule, section)) == 0:
+                    raise ValueError(f"No activities found in {section}")
+
+        except ValueError as e:
+            rethrow_as_http_exception(e)
+        except Exception as e:
+            logger.error(f"Unexpected error in schedule validation: {str(e)}", exc_info=True)
+            rethrow_as_http_exception(Exception("Invalid schedule structure"))
+
+    def _user_prompt(
+        self, request: ScheduleRequest, day: str, plan_note: Optional[str] = None, mood: Optional[str] = None
+    ) -> str:
+        mood_line = f"\nTheir mood from an earlier check-in: {mood}" if mood else ""
+        user_prompt = f"""Create a highly specific daily schedule as a JSON object for {day} for someone grieving their {request.relationship.value} lost to {request.cause_of_loss.value}.
+
+Their current state: {request.user_thoughts}{mood_line}
 
 CRUCIAL: Make every activity in the JSON response specific and actionable:
 
@@ -98,40 +164,44 @@ CRUCIAL: Make every activity in the JSON response specific and actionable:
 
 ❌ "Get some exercise" (too vague)
 ✅ "Walk 10 minutes in backyard listening to calm piano"
-
+"""
+        if not self.structured.schema_enforced:
+            # The provider already holds the schema in the other modes
+            user_prompt += f"""
 The JSON response must follow this exact format:
 {{
-    "date": "{datetime.now().strftime('%Y-%m-%d')}",
-
-    "morning": [
-        {{
-            "time_frame": "7:00 AM - 7:30 AM",
-            "activity": "Specific Activity Name",
-            "description": "Detailed, step-by-step instructions"
-        }},
-        // 3-4 more morning activities with specific details
-    ],
-    
-    "noon": [
-        // MUST include 4-5 activities with appropriate spacing
-    ],
-    
-    "afternoon": [
-        // MUST include 4-5 activities with appropriate spacing
-        // Include at least one physical activity here
-    ],
-    
-    "evening": [
-        // MUST include 4-5 activities with appropriate spacing
-        // Include one grief ritual here
-    ],
-    
-    "night": [
-        // MUST include 4-5 activities with appropriate spacing
-        // Focus on gentle wind-down activities
-    ]
-}}
+"date": "{day}",
+
+"morning": [
+    {{
+        "time_frame": "7:00 AM - 7:30 AM",
+        "activity": "Specific Activity Name",
+        "description": "Detailed, step-by-step instructions"
+    }},
+    // 3-4 more morning activities with specific details
+],
 
+"noon": [
+    // MUST include 4-5 activities with appropriate spacing
+],
+
+"afternoon": [
+    // MUST include 4-5 activities with appropriate spacing
+    // Include at least one physical activity here
+],
+
+"evening": [
+    // MUST include 4-5 activities with appropriate spacing
+    // Include one grief ritual here
+],
+
+"night": [
+    // MUST include 4-5 activities with appropriate spacing
+    // Focus on gentle wind-down activities
+]
+}}
+"""
+        user_prompt += """
 Requirements for JSON output:
 1. Each period MUST have EXACTLY 4-5 activities
 2. Space activities 15-30 minutes apart
@@ -140,35 +210,256 @@ Requirements for JSON output:
 5. Include specific grief ritual in evening
 6. Make all instructions detailed and exact
 7. Personalize to their loss and emotions"""
+        if plan_note:
+            user_prompt += f"\n\n{plan_note}"
+        return user_prompt
 
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                response_format={"type": "json_object"},
-                temperature=0.7,
-                max_tokens=2000
-            )
+    async def _generate_whole_day(
+        self, request: ScheduleRequest, day: str, plan_note: Optional[str] = None, mood: Optional[str] = None
+    ) -> DailySchedule:
+        response = await self.client.complete(
+            LLMTask.SCHEDULE,
+            messages=[
+                {"role": "system", "content": self.SYSTEM_PROMPT},
+                {"role": "user", "content": self._user_prompt(request, day, plan_note, mood)}
+            ],
+            **self.structured.params("daily_schedule", DailySchedule, "Record the daily schedule")
+        )
 
-            if not response.choices or not response.choices[0].message.content:
-                raise ValueError("Invalid response from language model")
+        content = self.structured.content(response)
+        if not content:
+            raise ValueError("Invalid response from language model")
 
-            # Parse and validate JSON structure
-            schedule_data = self.json_handler.parse_json(
-                response.choices[0].message.content,
-                max_retries=self.MAX_RETRIES
-            )
-            
-            # Basic structure validation
-            self._validate_schedule_structure(schedule_data)
+        # Parse and validate into DailySchedule in a single pass
+        return self.json_handler.process_llm_response(
+            content,
+            DailySchedule,
+            max_retries=self.MAX_RETRIES
+        )
+
+    async def _generate_by_period(
+        self, request: ScheduleRequest, day: str, plan_note: Optional[str] = None, mood: Optional[str] = None
+    ) -> DailySchedule:
+        """All five periods as concurrent small completions, merged into one schedule.
+
+        Each call gets the same compact context plus its own period's constraints,
+        so the day takes about as long as its slowest period. A period whose call
+        fails is left empty for the repair pass to regenerate.
+        """
+        results = await asyncio.gather(
+            *(self._generate_period(request, day, period, mood, plan_note) for period in SECTIONS),
+            return_exceptions=True
+        )
+
+        periods = {}
+        errors = []
+        for period, result in zip(SECTIONS, results):
+            if isinstance(result, BaseException):
+                if not isinstance(result, Exception):
+                    raise result
+                logger.warning(f"Could not generate {period} for {day}: {str(result)}")
+                errors.append(result)
+                result = []
+            periods[period] = result
+        if len(errors) == len(SECTIONS):
+            raise errors[0]
+        return DailySchedule(date=day, **periods)
+
+    async def _generate_day(
+        self, request: ScheduleRequest, day: str, plan_note: Optional[str] = None, mood: Optional[str] = None
+    ) -> DailySchedule:
+        """One schedule for ``day``; ``plan_note`` places it within a multi-day plan."""
+        if self.generation_mode == ScheduleGenerationMode.PER_PERIOD:
+            schedule = await self._generate_by_period(request, day, plan_note, mood)
+        else:
+            schedule = await self._generate_whole_day(request, day, plan_note, mood)
+
+        schedule = self.normalizer.normalize(schedule, day)
+        schedule = await self._repair(request, schedule, mood)
+        self._validate_schedule_structure(schedule)
+        return schedule
+
+    def _period_prompt(
+        self,
+        request: ScheduleRequest,
+        day: str,
+        period: str,
+        mood: Optional[str] = None,
+        plan_note: Optional[str] = None,
+        planned: Optional[str] = None,
+        reasons: Optional[List[str]] = None
+    ) -> str:
+        window_start, window_end = PERIOD_WINDOWS[period]
+        mood_line = f"\nTheir mood from an earlier check-in: {mood}" if mood else ""
+        user_prompt = f"""Plan only the {period} of {day}, between {format_clock(window_start)} and {format_clock(min(window_end, 24 * 60))}, for someone grieving their {request.relationship.value} lost to {request.cause_of_loss.value}.
+
+Their current state: {request.user_thoughts}{mood_line}
+
+Requirements for the {period}:
+1. EXACTLY 4-5 activities, spaced 15-30 minutes apart
+2. {PERIOD_CONSTRAINTS[period]}
+3. Make all instructions detailed and exact
+"""
+        if reasons:
+            user_prompt += f"\nThe first version of this {period} was set aside because it had {'; '.join(reasons)}.\n"
+        if planned:
+            user_prompt += f"\nActivities already in the schedule - do not repeat them:\n{planned}\n"
+        if plan_note:
+            user_prompt += f"\n{plan_note}\n"
+        if not self.structured.schema_enforced:
+            user_prompt += f"""
+The JSON response must follow this exact format:
+{{
+"activities": [
+    {{
+        "time_frame": "{format_clock(window_start)} - {format_clock(window_start + 30)}",
+        "activity": "Specific Activity Name",
+        "description": "Detailed, step-by-step instructions"
+    }},
+    // 3-4 more activities with specific details
+]
+}}
+"""
+        return user_prompt
+
+    async def _generate_period(
+        self,
+        request: ScheduleRequest,
+        day: str,
+        period: str,
+        mood: Optional[str] = None,
+        plan_note: Optional[str] = None,
+        planned: Optional[str] = None,
+        reasons: Optional[List[str]] = None
+    ) -> List[Activity]:
+        """The activities of one period, from a small completion of its own."""
+        response = await self.client.complete(
+            LLMTask.SCHEDULE,
+            messages=[
+                {"role": "system", "content": self.PERIOD_SYSTEM_PROMPT},
+                {"role": "user", "content": self._period_prompt(request, day, period, mood, plan_note, planned, reasons)}
+            ],
+            max_tokens=self.PERIOD_MAX_TOKENS,
+            **self.structured.params("schedule_period", PeriodActivities, f"Record the {period} activities")
+        )
+
+        content = self.structured.content(response)
+        if not content:
+            raise ValueError("Invalid response from language model")
+        return self.json_handler.process_llm_response(content, PeriodActivities, max_retries=self.MAX_RETRIES).activities
+
+    async def _repair(self, request: ScheduleRequest, schedule: DailySchedule, mood: Optional[str]) -> DailySchedule:
+        """Regenerate only the periods the normalizer finds deficient, side by side.
+
+        A period that cannot be regenerated keeps what the model first wrote, so
+        one failed call costs that period's fix rather than the whole schedule.
+        """
+        deficient = self.normalizer.deficiencies(schedule, self.MAX_REPAIRED_PERIODS)
+        if not deficient:
+            return schedule
+
+        summary = ", ".join(f"{period} ({'; '.join(reasons)})" for period, reasons in deficient.items())
+        logger.info(f"Regenerating {summary} for {schedule.date}")
+        planned = summarize_schedule(schedule)
+        results = await asyncio.gather(
+            *(
+                self._generate_period(request, schedule.date, period, mood, planned=planned, reasons=reasons)
+                for period, reasons in deficient.items()
+            ),
+            return_exceptions=True
+        )
+
+        updates = {}
+        for period, result in zip(deficient, results):
+            if isinstance(result, BaseException):
+                if not isinstance(result, Exception):
+                    raise result
+                logger.warning(f"Could not regenerate {period} for {schedule.date}: {str(result)}")
+            elif result:
+                updates[period] = result
+        if not updates:
+            return schedule
+
+        repaired = self.normalizer.normalize(schedule.model_copy(update=updates))
+        remaining = self.normalizer.deficiencies(repaired, len(SECTIONS))
+        if remaining:
+            logger.info(f"Schedule {schedule.date} still lacks: {remaining}")
+        return repaired
+
+    async def generate_daily_schedule(self, request: ScheduleRequest, mood: Optional[str] = None) -> DailySchedule:
+        """Generate a personalized daily schedule based on user's grief context.
+
+        ``mood`` is the mood detected by an earlier sentiment analysis, if known.
+        """
+        try:
+            # Schedules are dated, so only reuse one made today for a near-identical input
+            today = datetime.now().strftime('%Y-%m-%d')
+            bucket = (request.relationship.value, request.cause_of_loss.value, today, mood or "")
+            cached = self.semantic_cache.get(bucket, request.user_thoughts, DailySchedule)
+            if cached is not None:
+                return cached
+
+            schedule = await self._generate_day(request, today, mood=mood)
+            self.semantic_cache.set(bucket, request.user_thoughts, schedule)
             
-            # Convert to DailySchedule model
-            return self.json_handler.validate_model(schedule_data, DailySchedule)
+            return schedule
 
-        except ValueError as e:
+        except (ValueError, CircuitOpenError, DeadlineExceededError) as e:
             rethrow_as_http_exception(e)
         except Exception as e:
             logger.error(f"Error generating schedule: {str(e)}", exc_info=True)
             rethrow_as_http_exception(Exception("Failed to generate daily schedule"))
+
+    def _plan_note(self, index: int, days: int, earlier: List[str]) -> str:
+        note = f"This is day {index + 1} of a {days}-day plan. Give this day a gentle emphasis on {DAY_FOCUSES[index % len(DAY_FOCUSES)]}."
+        if earlier:
+            note += (
+                "\nActivities already planned for other days - do not repeat them, and vary the meals, "
+                "physical activity and grief ritual:\n" + "\n".join(earlier)
+            )
+        return note
+
+    async def _generate_plan_day(
+        self, request: ScheduleRequest, dates: List[str], index: int, earlier: List[str], mood: Optional[str]
+    ) -> Tuple[int, Union[DailySchedule, Exception]]:
+        day = dates[index]
+        try:
+            return index, await self._generate_day(request, day, self._plan_note(index, len(dates), earlier), mood)
+        except Exception as e:
+            if isinstance(e, (ValueError, CircuitOpenError, DeadlineExceededError)) or hasattr(e, "status_code"):
+                return index, e
+            logger.error(f"Error generating schedule for {day}: {str(e)}", exc_info=True)
+            return index, Exception("Failed to generate daily schedule")
+
+    async def generate_multi_day_schedule(
+        self, request: ScheduleRequest, days: int, parallel_days: int, mood: Optional[str] = None
+    ) -> AsyncIterator[Tuple[str, Union[DailySchedule, Exception]]]:
+        """Yield ``(date, schedule or error)`` for each of ``days`` days as each one completes.
+
+        Up to ``parallel_days`` days are generated at once, as LLM calls under the
+        shared scheduler. Whenever a day finishes the next one starts, seeded with
+        a summary of every day finished so far; days running side by side are
+        kept apart by their own emphasis instead.
+        """
+        start = date.today()
+        dates = [(start + timedelta(days=offset)).isoformat() for offset in range(days)]
+        earlier: List[str] = []
+        next_index = 0
+        running = set()
+        try:
+            while next_index < days or running:
+                while next_index < days and len(running) < parallel_days:
+                    running.add(asyncio.ensure_future(
+                        self._generate_plan_day(request, dates, next_index, list(earlier), mood)
+                    ))
+                    next_index += 1
+                finished, running = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in finished:
+                    index, result = task.result()
+                    if isinstance(result, DailySchedule):
+                        earlier.append(summarize_schedule(result))
+                    yield dates[index], result
+        finally:
+            # The client went away or the plan was abandoned; stop paying for the rest
+            for task in running:
+                task.cancel()
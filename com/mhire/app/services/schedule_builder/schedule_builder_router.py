@@ -1,33 +1,69 @@
+import asyncio
 import logging
 import time
+from typing import AsyncIterator, Dict, Optional, Union
+
 from fastapi import APIRouter, Request, HTTPException
+from fastapi.responses import StreamingResponse
+from pydantic_core import to_json
 
 from com.mhire.app.services.schedule_builder.schedule_builder import ScheduleBuilder
-from com.mhire.app.services.schedule_builder.schedule_builder_schema import ScheduleRequest, DailySchedule
+from com.mhire.app.services.schedule_builder.schedule_builder_schema import (
+    ScheduleRequest, DailySchedule, MultiDayScheduleRequest, MultiDaySchedule
+)
+from com.mhire.app.common.idempotency import IdempotencyManager
+from com.mhire.app.config.config import Config
+from com.mhire.app.common.lazy_service import LazyService
+from com.mhire.app.common.request_context import request_scope
+from com.mhire.app.common.client_disconnect import ClientDisconnectedError, record_cancellation, run_until_disconnect
+from com.mhire.app.common.session_store import SessionContext, SessionStore, SessionNotFoundError
+from com.mhire.app.common.speculative_prefetch import get_prefetcher, prefetch_key
 from com.mhire.app.common.network_responses import NetworkResponse, HTTPCode, ErrorCode, Message
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
-schedule_builder = ScheduleBuilder()
+config = Config()
+schedule_builder = LazyService(ScheduleBuilder, "schedule_builder")
 response = NetworkResponse()
+idempotency = IdempotencyManager()
+sessions = SessionStore()
+prefetcher = get_prefetcher()
 
 @router.post("/api/v1/daily-schedule")
 async def get_daily_schedule(request: ScheduleRequest, http_request: Request):
     """Generate a personalized daily schedule based on user input"""
+    return await idempotency.run(http_request, request, lambda: _generate_schedule(request, http_request))
+
+async def _generate_schedule(request: ScheduleRequest, http_request: Request):
     start_time = time.time()
     
     try:
-        schedule_result = await schedule_builder.generate_daily_schedule(request)
+        speculative_key = prefetch_key(request, "schedule")
+        request, session = await sessions.resolve(request)
+        with request_scope(http_request, endpoint="daily_schedule", default_timeout=config.schedule_timeout_seconds):
+            schedule_result = await run_until_disconnect(
+                http_request, "daily_schedule", _claim_or_generate(request, speculative_key, session)
+            )
         return response.success_response(
             http_code=HTTPCode.SUCCESS,
             message=Message.SuccessMessage.RESPONSE_GENERATED,
-            data=schedule_result.model_dump(),
+            data=schedule_result,
             resource=http_request.url.path,
             duration=time.time() - start_time
         )
-    
+
+    except SessionNotFoundError:
+        return response.session_not_found_response(http_request.url.path, time.time() - start_time)
+
+    except ClientDisconnectedError:
+        return response.client_disconnected_response(http_request.url.path, time.time() - start_time)
+
     except HTTPException as http_e:
+        upstream_error = response.upstream_error_response(http_e, http_request.url.path, time.time() - start_time)
+        if upstream_error is not None:
+            logger.warning(f"Upstream error: {str(http_e.detail)}")
+            return upstream_error
         logger.error(f"Business logic error: {str(http_e.detail)}")
         return response.json_response(
             http_code=http_e.status_code,
@@ -45,4 +81,142 @@ async def get_daily_schedule(request: ScheduleRequest, http_request: Request):
             error_message=Message.ErrorMessage.InternalServerError.INTERNAL_SERVER_ERROR,
             resource=http_request.url.path,
             duration=time.time() - start_time
-        )
\ No newline at end of file
+        )
+
+async def _claim_or_generate(request: ScheduleRequest, speculative_key: Optional[str], session: Optional[SessionContext]):
+    schedule_result = await prefetcher.claim(speculative_key, DailySchedule)
+    if schedule_result is None:
+        schedule_result = await schedule_builder.get().generate_daily_schedule(
+            request, mood=session.mood if session else None
+        )
+    return schedule_result
+
+@router.post("/api/v1/multi-day-schedule")
+async def get_multi_day_schedule(request: MultiDayScheduleRequest, http_request: Request, stream: bool = False):
+    """Generate a personalized schedule for each of the next ``days`` days.
+
+    With ``?stream=true`` each day is sent as an NDJSON line as soon as it is
+    ready, followed by a summary line; otherwise all days are returned at once.
+    """
+    if stream:
+        try:
+            request, session = await sessions.resolve(request)
+        except SessionNotFoundError:
+            return response.session_not_found_response(http_request.url.path, 0.0)
+        return StreamingResponse(_stream_days(request, http_request, session), media_type="application/x-ndjson")
+    return await idempotency.run(http_request, request, lambda: _generate_days(request, http_request))
+
+def _day_error(error: Exception) -> Dict[str, Union[int, str]]:
+    status_code = getattr(error, "status_code", None)
+    if status_code == HTTPCode.SERVICE_UNAVAILABLE:
+        return {
+            "code": ErrorCode.ServiceUnavailable.UPSTREAM_UNAVAILABLE,
+            "message": Message.ErrorMessage.ServiceUnavailable.UPSTREAM_UNAVAILABLE
+        }
+    if status_code == HTTPCode.GATEWAY_TIMEOUT:
+        return {
+            "code": ErrorCode.GatewayTimeout.DEADLINE_EXCEEDED,
+            "message": Message.ErrorMessage.GatewayTimeout.DEADLINE_EXCEEDED
+        }
+    return {
+        "code": ErrorCode.UnprocessableEntity.CONTEXT_PROCESSING_ERROR,
+        "message": str(getattr(error, "detail", error))
+    }
+
+async def _stream_days(
+    request: MultiDayScheduleRequest, http_request: Request, session: Optional[SessionContext]
+) -> AsyncIterator[bytes]:
+    start_time = time.time()
+    completed = 0
+    with request_scope(http_request, endpoint="multi_day_schedule", default_timeout=config.multi_day_schedule_timeout_seconds):
+        days = schedule_builder.get().generate_multi_day_schedule(
+            request, request.days, config.multi_day_parallel_days, mood=session.mood if session else None
+        )
+        try:
+            async for day, result in days:
+                if isinstance(result, DailySchedule):
+                    completed += 1
+                    yield to_json({"date": day, "schedule": result}) + b"\n"
+                else:
+                    logger.warning(f"Multi-day schedule failed for {day}: {str(getattr(result, 'detail', result))}")
+                    yield to_json({"date": day, "error": _day_error(result)}) + b"\n"
+        except (asyncio.CancelledError, GeneratorExit):
+            # The response stops the stream when the client disconnects
+            record_cancellation("multi_day_schedule", time.time() - start_time)
+            raise
+        finally:
+            await days.aclose()
+    yield to_json({
+        "success": completed > 0,
+        "days": completed,
+        "failed": request.days - completed,
+        "resource": http_request.url.path,
+        "duration": f"{time.time() - start_time}s"
+    }) + b"\n"
+
+async def _generate_days(request: MultiDayScheduleRequest, http_request: Request):
+    start_time = time.time()
+    schedules: Dict[str, DailySchedule] = {}
+    errors: Dict[str, Exception] = {}
+
+    try:
+        request, session = await sessions.resolve(request)
+        with request_scope(http_request, endpoint="multi_day_schedule", default_timeout=config.multi_day_schedule_timeout_seconds):
+            await run_until_disconnect(http_request, "multi_day_schedule", _collect_days(request, session, schedules, errors))
+
+        if not schedules:
+            # Nothing usable; answer with the first day's error
+            raise next(iter(errors.values()))
+        for day, error in errors.items():
+            logger.warning(f"Multi-day schedule failed for {day}: {str(getattr(error, 'detail', error))}")
+
+        return response.success_response(
+            http_code=HTTPCode.SUCCESS,
+            message=Message.SuccessMessage.RESPONSE_GENERATED,
+            data=MultiDaySchedule(days=[schedules[day] for day in sorted(schedules)], failed_dates=sorted(errors)),
+            resource=http_request.url.path,
+            duration=time.time() - start_time
+        )
+
+    except SessionNotFoundError:
+        return response.session_not_found_response(http_request.url.path, time.time() - start_time)
+
+    except ClientDisconnectedError:
+        return response.client_disconnected_response(http_request.url.path, time.time() - start_time)
+
+    except Exception as e:
+        upstream_error = response.upstream_error_response(e, http_request.url.path, time.time() - start_time)
+        if upstream_error is not None:
+            logger.warning(f"Upstream error: {str(getattr(e, 'detail', e))}")
+            return upstream_error
+        if isinstance(e, (HTTPException, ValueError)):
+            logger.error(f"Business logic error: {str(getattr(e, 'detail', e))}")
+            return response.json_response(
+                http_code=getattr(e, "status_code", HTTPCode.UNPROCESSABLE_ENTITY),
+                error_code=ErrorCode.UnprocessableEntity.CONTEXT_PROCESSING_ERROR,
+                error_message=str(getattr(e, "detail", e)),
+                resource=http_request.url.path,
+                duration=time.time() - start_time
+            )
+        logger.error(f"Unexpected error: {str(e)}", exc_info=True)
+        return response.json_response(
+            http_code=HTTPCode.INTERNAL_SERVER_ERROR,
+            error_code=ErrorCode.InternalServerError.INTERNAL_SERVER_ERROR,
+            error_message=Message.ErrorMessage.InternalServerError.INTERNAL_SERVER_ERROR,
+            resource=http_request.url.path,
+            duration=time.time() - start_time
+        )
+
+async def _collect_days(
+    request: MultiDayScheduleRequest,
+    session: Optional[SessionContext],
+    schedules: Dict[str, DailySchedule],
+    errors: Dict[str, Exception]
+) -> None:
+    async for day, result in schedule_builder.get().generate_multi_day_schedule(
+        request, request.days, config.multi_day_parallel_days, mood=session.mood if session else None
+    ):
+        if isinstance(result, DailySchedule):
+            schedules[day] = result
+        else:
+            errors[day] = result
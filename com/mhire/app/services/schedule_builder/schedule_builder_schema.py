@@ -1,6 +1,6 @@
 from enum import Enum
-from pydantic import BaseModel, ConfigDict
-from typing import List, Dict
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+from typing import List, Dict, Optional
 from datetime import datetime
 
 class Relationship(str, Enum):
@@ -20,21 +20,41 @@ class CauseOfLoss(str, Enum):
     OTHER = "Other"
 
 class ScheduleRequest(BaseModel):
-    user_thoughts: str
-    relationship: Relationship
-    cause_of_loss: CauseOfLoss
+    # Either the inputs or the session_token returned by sentiment analysis
+    user_thoughts: Optional[str] = None
+    relationship: Optional[Relationship] = None
+    cause_of_loss: Optional[CauseOfLoss] = None
+    session_token: Optional[str] = None
 
+    @model_validator(mode="after")
+    def require_inputs_or_session(self) -> "ScheduleRequest":
+        if self.session_token is None and None in (self.user_thoughts, self.relationship, self.cause_of_loss):
+            raise ValueError("user_thoughts, relationship and cause_of_loss are required without a session_token")
+        return self
+
+# Field descriptions double as format instructions in the structured-output schema
 class Activity(BaseModel):
-    time_frame: str
-    activity: str
-    description: str | None = None
+    time_frame: str = Field(description="Time range, e.g. 7:00 AM - 7:30 AM")
+    activity: str = Field(description="Specific activity name")
+    description: str | None = Field(default=None, description="Detailed, step-by-step instructions")
 
 class DailySchedule(BaseModel):
-    date: str
-    morning: List[Activity]
-    noon: List[Activity]
-    afternoon: List[Activity]
-    evening: List[Activity]
-    night: List[Activity]
+    date: str = Field(description="The schedule's date, YYYY-MM-DD")
+    morning: List[Activity] = Field(description="4-5 activities spaced 15-30 minutes apart")
+    noon: List[Activity] = Field(description="4-5 activities spaced 15-30 minutes apart")
+    afternoon: List[Activity] = Field(description="4-5 activities, including one specific physical activity")
+    evening: List[Activity] = Field(description="4-5 activities, including one specific grief ritual")
+    night: List[Activity] = Field(description="4-5 gentle wind-down activities")
     
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+class PeriodActivities(BaseModel):
+    # One regenerated period of a schedule
+    activities: List[Activity] = Field(description="4-5 activities in time order, spaced 15-30 minutes apart")
+
+class MultiDayScheduleRequest(ScheduleRequest):
+    days: int = Field(default=7, ge=1, le=7)
+
+class MultiDaySchedule(BaseModel):
+    days: List[DailySchedule]
+    failed_dates: List[str] = []
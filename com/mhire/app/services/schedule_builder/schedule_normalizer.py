@@ -0,0 +1,244 @@
+import logging
+import re
+
+from typing import Dict, List, Optional, Set, Tuple
+
+from com.mhire.app.services.schedule_builder.schedule_builder_schema import Activity, DailySchedule
+
+logger = logging.getLogger(__name__)
+
+SECTIONS = ('morning', 'noon', 'afternoon', 'evening', 'night')
+
+# Minutes since midnight; night runs past midnight
+PERIOD_WINDOWS: Dict[str, Tuple[int, int]] = {
+    "morning": (5 * 60, 11 * 60),
+    "noon": (11 * 60, 14 * 60),
+    "afternoon": (14 * 60, 17 * 60 + 30),
+    "evening": (17 * 60 + 30, 20 * 60 + 30),
+    "night": (20 * 60 + 30, 26 * 60),
+}
+
+MIN_ACTIVITIES = 4
+MAX_ACTIVITIES = 5
+MIN_MEALS = 2
+# Longer ranges are read as a typo and get the default duration
+MAX_ACTIVITY_MINUTES = 4 * 60
+
+# Keywords that mark the activities the prompt requires
+MEAL_WORDS = {
+    "breakfast", "brunch", "lunch", "dinner", "supper", "meal", "eat", "cook", "bake", "snack",
+    "soup", "salad", "sandwich", "oatmeal", "smoothie", "toast", "omelette", "pasta", "stew"
+}
+PHYSICAL_WORDS = {
+    "walk", "walking", "yoga", "stretch", "stretching", "exercise", "jog", "jogging", "run", "running",
+    "bike", "cycling", "swim", "swimming", "dance", "dancing", "hike", "hiking", "workout", "pilates",
+    "gardening", "tai", "chi"
+}
+RITUAL_WORDS = {
+    "letter", "journal", "journaling", "memory", "memories", "candle", "photo", "photos", "ritual",
+    "remember", "remembering", "honor", "honoring", "memorial", "grave", "keepsake", "altar", "tribute"
+}
+# Where a missing meal is best added, in order
+MEAL_PERIODS = ("morning", "noon", "evening")
+
+_CLOCK = r"(\d{1,2})(?:[:.](\d{2}))?\s*([ap])?\.?\s*(?:m\.?)?"
+_RANGE = re.compile(rf"^\s*{_CLOCK}\s*(?:-|–|—|to|until)\s*{_CLOCK}\s*$", re.IGNORECASE)
+_SINGLE = re.compile(rf"^\s*{_CLOCK}\s*$", re.IGNORECASE)
+_WORD = re.compile(r"[a-z]+")
+
+def _to_minutes(hour: str, minute: Optional[str], meridiem: Optional[str]) -> Optional[int]:
+    h, m = int(hour), int(minute or 0)
+    if m > 59 or h > 23 or (meridiem and not 1 <= h <= 12):
+        return None
+    if meridiem:
+        h = h % 12 + (12 if meridiem.lower() == "p" else 0)
+    return h * 60 + m
+
+def _place_in_period(minutes: int, period: str) -> int:
+    """Pick the 12-hour reading of an unqualified time that lands nearest the period."""
+    window_start, window_end = PERIOD_WINDOWS[period]
+    candidates = [minutes, minutes + 12 * 60, minutes + 24 * 60]
+    return min(candidates, key=lambda value: 0 if window_start <= value < window_end else min(
+        abs(value - window_start), abs(value - window_end)
+    ))
+
+def parse_time_frame(text: str, period: str, default_minutes: int = 30) -> Optional[Tuple[int, int]]:
+    """``(start, end)`` minutes since midnight for "7:00 AM - 7:30 AM" style ranges, or None.
+
+    Times without AM/PM take the meridiem of the other end or the reading that
+    fits the period; times after midnight in the night period count past 24:00.
+    """
+    match = _RANGE.match(text or "")
+    if match:
+        start_hour, start_minute, start_meridiem, end_hour, end_minute, end_meridiem = match.groups()
+    else:
+        match = _SINGLE.match(text or "")
+        if not match:
+            return None
+        start_hour, start_minute, start_meridiem = match.groups()
+        end_hour = end_minute = end_meridiem = None
+
+    start = _to_minutes(start_hour, start_minute, start_meridiem or end_meridiem)
+    if start is None:
+        return None
+    end = _to_minutes(end_hour, end_minute, end_meridiem or start_meridiem) if end_hour is not None else None
+    if start_meridiem is None and end_meridiem and end is not None:
+        # The start borrowed the end's AM/PM: "11:30 - 12:15 PM" starts in the morning,
+        # "11:30 - 12:00 AM" at night, so take the reading closest before the end
+        ends = (end, end + 24 * 60)
+        start = min(
+            (value for value in (start - 12 * 60, start, start + 12 * 60) if value >= 0 and value < ends[1]),
+            key=lambda value: min(candidate - value for candidate in ends if candidate > value)
+        )
+    elif not (start_meridiem or end_meridiem) and int(start_hour) <= 12:
+        start = _place_in_period(start, period)
+    if period == "night" and start < PERIOD_WINDOWS["morning"][0]:
+        start += 24 * 60
+
+    if end is None:
+        return start, start + default_minutes
+    # Bring the end after the start, e.g. "11:30 PM - 12:00 AM" or "7:00 - 7:30" read as evening
+    for _ in range(2):
+        if end > start:
+            break
+        end += 12 * 60
+    if end <= start or end - start > MAX_ACTIVITY_MINUTES:
+        end = start + default_minutes
+    return start, end
+
+def format_clock(minutes: int) -> str:
+    hour, minute = divmod(minutes % (24 * 60), 60)
+    return f"{hour % 12 or 12}:{minute:02d} {'AM' if hour < 12 else 'PM'}"
+
+def format_time_frame(start: int, end: int) -> str:
+    return f"{format_clock(start)} - {format_clock(end)}"
+
+def period_of(minutes: int) -> Optional[str]:
+    for period, (window_start, window_end) in PERIOD_WINDOWS.items():
+        if window_start <= minutes < window_end:
+            return period
+    return None
+
+def _words(activity: Activity) -> Set[str]:
+    return set(_WORD.findall(f"{activity.activity} {activity.description or ''}".lower()))
+
+def is_meal(activity: Activity) -> bool:
+    return bool(_words(activity) & MEAL_WORDS)
+
+def is_physical(activity: Activity) -> bool:
+    return bool(_words(activity) & PHYSICAL_WORDS)
+
+def is_ritual(activity: Activity) -> bool:
+    return bool(_words(activity) & RITUAL_WORDS)
+
+class ScheduleNormalizer:
+    """Puts a generated schedule on a consistent timeline and finds what is really missing.
+
+    Time frames are parsed into minute intervals. Activities whose time falls
+    well inside another period are moved there, each period is sorted, overlaps
+    are pushed back and long gaps closed, and every time frame is rewritten in
+    one format. Periods with more than ``MAX_ACTIVITIES`` are trimmed, keeping
+    required activities. ``deficiencies`` then names the periods that need to
+    be regenerated: too few activities, no afternoon physical activity or
+    evening grief ritual anywhere in the day, or too few meals. Smaller misses,
+    like a period one activity short, are only logged.
+    """
+
+    STANDARD_GAP = 15
+    MAX_GAP = 90
+    # How far outside its window an activity may start before it is moved
+    PERIOD_TOLERANCE = 30
+    DEFAULT_DURATION = 30
+
+    def normalize(self, schedule: DailySchedule, day: Optional[str] = None) -> DailySchedule:
+        periods: Dict[str, List[Tuple[int, int, Activity]]] = {period: [] for period in SECTIONS}
+        for period in SECTIONS:
+            cursor = None
+            for activity in getattr(schedule, period):
+                interval = parse_time_frame(activity.time_frame, period, self.DEFAULT_DURATION)
+                if interval is None:
+                    # Keep it where the model put it: right after the previous activity
+                    start = (cursor + self.STANDARD_GAP) if cursor is not None else PERIOD_WINDOWS[period][0]
+                    interval = (start, start + self.DEFAULT_DURATION)
+                target = self._target_period(period, interval[0])
+                if target != period:
+                    logger.info(f"Moving '{activity.activity}' at {activity.time_frame} from {period} to {target}")
+                periods[target].append((interval[0], interval[1], activity))
+                cursor = interval[1]
+
+        normalized: Dict[str, List[Activity]] = {}
+        previous_end = None
+        for period in SECTIONS:
+            items = sorted(periods[period], key=lambda item: item[0])
+            if len(items) > MAX_ACTIVITIES:
+                items = self._trim(period, items)
+            activities = []
+            period_start = True
+            for start, end, activity in items:
+                duration = end - start
+                if previous_end is not None and start < previous_end:
+                    start = previous_end
+                elif previous_end is not None and not period_start and start - previous_end > self.MAX_GAP:
+                    start = previous_end + self.STANDARD_GAP
+                end = start + duration
+                previous_end = end
+                period_start = False
+                time_frame = format_time_frame(start, end)
+                activities.append(
+                    activity if activity.time_frame == time_frame else activity.model_copy(update={"time_frame": time_frame})
+                )
+            normalized[period] = activities
+        return schedule.model_copy(update={**normalized, "date": day or schedule.date})
+
+    def _target_period(self, period: str, start: int) -> str:
+        window_start, window_end = PERIOD_WINDOWS[period]
+        if window_start - self.PERIOD_TOLERANCE <= start < window_end + self.PERIOD_TOLERANCE:
+            return period
+        return period_of(start) or period
+
+    def _trim(self, period: str, items: List[Tuple[int, int, Activity]]) -> List[Tuple[int, int, Activity]]:
+        """Drop the latest activities beyond the limit, sparing the ones the day requires."""
+        required = {"afternoon": is_physical, "evening": is_ritual}.get(period)
+        kept = list(items)
+        for item in reversed(items):
+            if len(kept) <= MAX_ACTIVITIES:
+                break
+            if required is not None and required(item[2]) and sum(1 for other in kept if required(other[2])) == 1:
+                continue
+            if is_meal(item[2]) and period in MEAL_PERIODS:
+                continue
+            kept.remove(item)
+        return kept[:MAX_ACTIVITIES]
+
+    def deficiencies(self, schedule: DailySchedule, max_periods: int = 2) -> Dict[str, List[str]]:
+        """Periods worth regenerating and why, most lacking first; minor misses are logged."""
+        found: Dict[str, List[str]] = {}
+        everything = [activity for period in SECTIONS for activity in getattr(schedule, period)]
+
+        for period in SECTIONS:
+            count = len(getattr(schedule, period))
+            if count < MIN_ACTIVITIES - 1:
+                found.setdefault(period, []).append(f"too few activities ({count})")
+            elif count < MIN_ACTIVITIES:
+                logger.info(f"Schedule {schedule.date}: {period} has {count} activities")
+
+        if not any(is_physical(activity) for activity in schedule.afternoon):
+            if any(is_physical(activity) for activity in everything):
+                logger.info(f"Schedule {schedule.date}: physical activity is outside the afternoon")
+            else:
+                found.setdefault("afternoon", []).append("no physical activity")
+
+        if not any(is_ritual(activity) for activity in schedule.evening):
+            if any(is_ritual(activity) for activity in everything):
+                logger.info(f"Schedule {schedule.date}: grief ritual is outside the evening")
+            else:
+                found.setdefault("evening", []).append("no grief ritual")
+
+        if sum(1 for activity in everything if is_meal(activity)) < MIN_MEALS:
+            for period in MEAL_PERIODS:
+                if not any(is_meal(activity) for activity in getattr(schedule, period)):
+                    found.setdefault(period, []).append("no meal")
+                    break
+
+        ranked = sorted(found, key=lambda period: (len(getattr(schedule, period)), -len(found[period])))
+        return {period: found[period] for period in ranked[:max_periods]}
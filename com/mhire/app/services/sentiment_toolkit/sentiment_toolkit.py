@@ -1,12 +1,17 @@
 import logging
 
-from typing import Dict, Any
-from groq import Groq
+from typing import Dict
 
 from com.mhire.app.config.config import Config
+from com.mhire.app.common.upstream_clients import GroqChatClient
+from com.mhire.app.common.model_router import LLMTask
 from com.mhire.app.common.json_handler import LLMJsonHandler
+from com.mhire.app.common.structured_output import StructuredOutput
+from com.mhire.app.common.response_cache import ResponseCache
+from com.mhire.app.common.semantic_cache import SemanticCache
 from com.mhire.app.common.exceptions_utility import rethrow_as_http_exception
-from com.mhire.app.services.sentiment_toolkit.sentiment_toolkit_schema import UserInput, ToolsResponse, Emotion
+from com.mhire.app.common.request_context import DeadlineExceededError
+from com.mhire.app.services.sentiment_toolkit.sentiment_toolkit_schema import UserInput, ToolsResponse, ToolInfo, Emotion
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +23,10 @@ class SentimentToolkit:
 
     MAX_RETRIES = 3
     ALLOWED_EMOTIONS = set(emotion.value for emotion in Emotion)
+    TOOL_CATEGORIES = (
+        "1. Stay Connected", "2. Work Through Emotions", "3. Find Strength",
+        "4. Mindfulness", "5. Check In", "6. Get Moving"
+    )
 
     def __init__(self):
         """Initialize the SentimentToolkit with required configurations."""
@@ -26,14 +35,26 @@ class SentimentToolkit:
             if not config.groq_api_key or not config.groq_api_model:
                 raise ValueError("Missing required configuration: GROQ_API_KEY or GROQ_MODEL_NAME")
                 
-            self.client = Groq(api_key=config.groq_api_key)
-            self.model = config.groq_api_model
+            self.client = GroqChatClient(api_key=config.groq_api_key)
             self.json_handler = LLMJsonHandler()
+            self.structured = StructuredOutput(config.structured_output_mode)
+            self.cache = ResponseCache("sentiment", ttl=config.sentiment_cache_ttl_seconds)
+            self.semantic_cache = SemanticCache(
+                "sentiment_semantic",
+                threshold=config.semantic_cache_threshold,
+                ttl=config.semantic_cache_ttl_seconds,
+                max_entries=config.semantic_cache_max_entries,
+                max_buckets=config.semantic_cache_max_buckets
+            )
             
         except Exception as e:
             logger.error(f"Failed to initialize SentimentToolkit: {str(e)}")
             rethrow_as_http_exception(e)
 
+    async def prewarm(self) -> None:
+        """Open the Groq connection pool before the first request arrives."""
+        await self.client.prewarm()
+
     async def _analyze_sentiment(self, user_thoughts: str) -> str:
         """Analyze the sentiment of user's grief-related thoughts."""
         try:
@@ -49,8 +70,8 @@ class SentimentToolkit:
             3. Choose the most relevant emotion for grief counseling
             """
 
-            sentiment_response = self.client.chat.completions.create(
-                model=self.model,
+            sentiment_response = await self.client.complete(
+                LLMTask.SENTIMENT,
                 messages=[{"role": "user", "content": sentiment_prompt}],
                 response_format={"type": "text"}
             )
@@ -69,7 +90,7 @@ class SentimentToolkit:
             logger.error(f"Error in sentiment analysis: {str(e)}")
             rethrow_as_http_exception(e)
 
-    async def analyze_grief(self, request: UserInput) -> Dict[str, Any]:
+    async def analyze_grief(self, request: UserInput) -> ToolsResponse:
         """
         Analyze grief input and provide personalized tool recommendations.
         
@@ -77,14 +98,30 @@ class SentimentToolkit:
             request: UserInput model containing user's grief context
             
         Returns:
-            Dict containing mood analysis and personalized tool recommendations
+            Validated ToolsResponse with mood analysis and personalized tool recommendations
             
         Raises:
             HTTPException: For any errors in processing or invalid responses
         """
         try:
-            # First, analyze sentiment
-            mood = await self._analyze_sentiment(request.user_thoughts)            # Generate tools based on input and mood
+            # Identical inputs get the same analysis, whichever worker produced it
+            cache_key = self.cache.key(request.relationship.value, request.cause_of_loss.value, request.user_thoughts)
+            cached = await self.cache.get(cache_key, ToolsResponse)
+            if cached is not None:
+                return cached
+
+            # The mood is always analyzed; it is the cheap call and the one a paraphrase can get wrong
+            mood = await self._analyze_sentiment(request.user_thoughts)
+
+            # Near-paraphrases from the same kind of loss with the same mood reuse the tools
+            bucket = (request.relationship.value, request.cause_of_loss.value, mood)
+            cached = self.semantic_cache.get(bucket, request.user_thoughts, ToolsResponse)
+            if cached is not None:
+                result = ToolsResponse.model_construct(mood=Emotion(mood), titles=cached.titles)
+                await self.cache.set(cache_key, result)
+                return result
+
+            # Generate tools based on input and mood
             tools_prompt = f"""
             Based on:
             - User thoughts: {request.user_thoughts}
@@ -106,7 +143,13 @@ Descriptions should be written in a kind, hopeful tone.
 
 Avoid medical jargon — keep the language accessible and empathetic.
 Focus on emotional support, mindfulness, physical well-being, and personal reflection.:
-Generate a JSON response with this exact structure for grief support tools.
+"""
+            if self.structured.schema_enforced:
+                # The schema fixes the shape; only the category names need spelling out
+                tools_prompt += f"""Use exactly these six categories as keys: {', '.join(self.TOOL_CATEGORIES)}.
+            Make the descriptions concise and tool names specific to grief support."""
+            else:
+                tools_prompt += f"""Generate a JSON response with this exact structure for grief support tools.
 
             {{
               "1. Stay Connected": {{
@@ -136,29 +179,33 @@ Generate a JSON response with this exact structure for grief support tools.
             }}            Make the descriptions concise and tool names specific to grief support.
             Return only the JSON object, no other text."""
 
-            tools_response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[{"role": "user", "content": tools_prompt}],
-                response_format={"type": "json_object"}
-            )
-
-            if not tools_response.choices or not tools_response.choices[0].message.content:
+            try:
+                tools_response = await self.client.complete(
+                    LLMTask.TOOLS,
+                    messages=[{"role": "user", "content": tools_prompt}],
+                    **self.structured.params(
+                        "tool_recommendations", Dict[str, ToolInfo], "Record the tools recommended for each category"
+                    )
+                )
+            except DeadlineExceededError:
+                # Return the part that finished rather than failing the request
+                logger.warning("Time budget exhausted before tool recommendations, returning mood only")
+                return ToolsResponse.model_construct(mood=Emotion(mood), titles={})
+
+            content = self.structured.content(tools_response)
+            if not content:
                 raise ValueError("Invalid tools generation response")
 
-            # Process and validate response
-            content = tools_response.choices[0].message.content
-            titles = self.json_handler.parse_json(content, max_retries=self.MAX_RETRIES)
+            # Parse and validate the tool categories in a single pass
+            titles = self.json_handler.process_llm_response(
+                content, Dict[str, ToolInfo], max_retries=self.MAX_RETRIES
+            )
 
-            # Construct and validate final response
-            result = {
-                "mood": mood,
-                "titles": titles
-            }
-            
-            # Validate with model but return dictionary instead of model object
-            validated_model = self.json_handler.validate_model(result, ToolsResponse)
-            return validated_model.model_dump()  # For Pydantic v2
-            # If using Pydantic v1, use: return validated_model.dict()
+            # Both parts are already validated, so assemble without re-validating
+            result = ToolsResponse.model_construct(mood=Emotion(mood), titles=titles)
+            await self.cache.set(cache_key, result)
+            self.semantic_cache.set(bucket, request.user_thoughts, result)
+            return result
 
         except Exception as e:
             logger.error(f"Error in analyze_grief: {str(e)}", exc_info=True)
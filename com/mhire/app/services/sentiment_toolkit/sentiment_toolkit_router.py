@@ -1,17 +1,34 @@
 import logging
 import time
 
+from typing import Optional
+
 from fastapi import APIRouter, Request
 
 from com.mhire.app.services.sentiment_toolkit.sentiment_toolkit import SentimentToolkit
 from com.mhire.app.services.sentiment_toolkit.sentiment_toolkit_schema import UserInput, ToolsResponse
+from com.mhire.app.services.schedule_builder.schedule_builder_router import schedule_builder
+from com.mhire.app.services.schedule_builder.schedule_builder_schema import ScheduleRequest
+from com.mhire.app.services.personalized_content.personalized_content_router import personalized_content
+from com.mhire.app.services.personalized_content.personalized_content_schema import GriefContentRequest, ToolTitle
+from com.mhire.app.config.config import Config
+from com.mhire.app.common.lazy_service import LazyService
+from com.mhire.app.common.request_context import request_scope
+from com.mhire.app.common.client_disconnect import ClientDisconnectedError, run_until_disconnect
+from com.mhire.app.common.session_store import SessionStore, tool_title_key
+from com.mhire.app.common.speculative_prefetch import get_prefetcher, prefetch_key
 from com.mhire.app.common.network_responses import NetworkResponse, HTTPCode, ErrorCode, Message
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
-sentiment_toolkit = SentimentToolkit()
+config = Config()
+sentiment_toolkit = LazyService(SentimentToolkit, "sentiment_toolkit")
 response = NetworkResponse()
+sessions = SessionStore()
+prefetcher = get_prefetcher()
+
+_TOOL_TITLES = {tool_title_key(title.value): title for title in ToolTitle}
 
 @router.post("/api/v1/sentiment-analyze", response_model=ToolsResponse)
 async def analyze_sentiment(request: UserInput, http_request: Request):
@@ -21,7 +38,21 @@ async def analyze_sentiment(request: UserInput, http_request: Request):
     start_time = time.time()
     
     try:
-        analysis_result = await sentiment_toolkit.analyze_grief(request)
+        with request_scope(http_request, endpoint="sentiment_analyze", default_timeout=config.sentiment_timeout_seconds):
+            analysis_result = await run_until_disconnect(
+                http_request, "sentiment_analyze", sentiment_toolkit.get().analyze_grief(request)
+            )
+        session_token = await sessions.create(
+            user_thoughts=request.user_thoughts,
+            relationship=request.relationship.value,
+            cause_of_loss=request.cause_of_loss.value,
+            mood=analysis_result.mood.value,
+            tools=analysis_result.model_dump(mode="json")["titles"]
+        )
+        # Cached results are shared, so the token goes on a copy
+        analysis_result = analysis_result.model_copy(update={"session_token": session_token})
+        if session_token and prefetcher.enabled:
+            _prefetch_next_steps(session_token, analysis_result)
         return response.success_response(
             http_code=HTTPCode.SUCCESS,
             message=Message.SuccessMessage.RESPONSE_GENERATED,
@@ -29,8 +60,15 @@ async def analyze_sentiment(request: UserInput, http_request: Request):
             resource=http_request.url.path,
             duration=time.time() - start_time
         )
-    
+
+    except ClientDisconnectedError:
+        return response.client_disconnected_response(http_request.url.path, time.time() - start_time)
+
     except Exception as e:
+        upstream_error = response.upstream_error_response(e, http_request.url.path, time.time() - start_time)
+        if upstream_error is not None:
+            logger.warning(f"Upstream error: {str(getattr(e, 'detail', e))}")
+            return upstream_error
         logger.error(f"Error analyzing sentiment: {str(e)}", exc_info=True)
         return response.json_response(
             http_code=HTTPCode.UNPROCESSABLE_ENTITY,
@@ -38,4 +76,35 @@ async def analyze_sentiment(request: UserInput, http_request: Request):
             error_message=f"{Message.ErrorMessage.UnprocessableEntity.CONTEXT_PROCESSING_ERROR}",
             resource=http_request.url.path,
             duration=time.time() - start_time
-        )
\ No newline at end of file
+        )
+
+def _prefetch_next_steps(session_token: str, analysis: ToolsResponse) -> None:
+    """Speculatively start the daily schedule and the content for the likeliest tools.
+
+    The UI always asks for the schedule next and then content for one of the
+    recommended tools, referring to the analysis by its session token.
+    """
+    schedule_request = ScheduleRequest(session_token=session_token)
+    prefetcher.submit(prefetch_key(schedule_request, "schedule"), lambda: _speculate_schedule(schedule_request))
+    prefetcher.run_in_background(_prefetch_content(session_token, analysis))
+
+async def _speculate_schedule(request: ScheduleRequest):
+    request, session = await sessions.resolve(request)
+    return await schedule_builder.get().generate_daily_schedule(request, mood=session.mood)
+
+async def _prefetch_content(session_token: str, analysis: ToolsResponse) -> None:
+    candidates = {}
+    for name, info in analysis.titles.items():
+        title = _TOOL_TITLES.get(tool_title_key(name))
+        if title is not None and info.tools:
+            candidates[title.value] = info.tools[0]
+    ranked = await prefetcher.rank(analysis.mood.value, list(candidates))
+    for title in ranked[:config.speculative_prefetch_tools]:
+        content_request = GriefContentRequest(session_token=session_token, tool_title=title, tool_name=candidates[title])
+        prefetcher.submit(
+            prefetch_key(content_request, f"content:{title}:{content_request.tool_name}"), lambda request=content_request: _speculate_content(request)
+        )
+
+async def _speculate_content(request: GriefContentRequest) -> Optional[dict]:
+    request, session = await sessions.resolve(request)
+    return await personalized_content.get().generate_personalized_content(request, mood=session.mood)
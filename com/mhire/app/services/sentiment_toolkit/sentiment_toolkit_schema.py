@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Dict, List
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
 from enum import Enum
 
 class Emotion(str, Enum):
@@ -31,12 +31,14 @@ class UserInput(BaseModel):
     cause_of_loss: CauseOfDeath
 
 class ToolInfo(BaseModel):
-    description: str
-    tools: List[str]
+    description: str = Field(description="One gentle line on the category's purpose and how it helps with grief")
+    tools: List[str] = Field(description="Two specific, actionable tool titles of 4-5 words each")
 
 class ToolsResponse(BaseModel):
     mood: Emotion
     titles: Dict[str, ToolInfo]
+    # Lets later calls refer to this analysis instead of resending the inputs
+    session_token: Optional[str] = None
 
 # Response models for API validation
 class ErrorResponse(BaseModel):
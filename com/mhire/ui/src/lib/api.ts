@@ -1,9 +1,10 @@
-import { UserInputs, SentimentResponse, ScheduleResponse, PersonalizedContentResponse } from './storage';
+import { storage, UserInputs, SentimentResponse, ScheduleResponse, PersonalizedContentResponse } from './storage';
 
 const API_BASE_URL = 'http://localhost:8000/api/v1';
 
 // Generic API call function
-const apiCall = async <T,>(endpoint: string, data: any): Promise<{data: T | null; error: string | null;}> => {
+const apiCall = async <T,>(endpoint: string, data: any): Promise<{data: T | null; error: string | null; status?: number;}> => {
+  let status: number | undefined;
   try {
     const response = await fetch(`${API_BASE_URL}${endpoint}`, {
       method: 'POST',
@@ -12,6 +13,7 @@ const apiCall = async <T,>(endpoint: string, data: any): Promise<{data: T | null
       },
       body: JSON.stringify(data)
     });
+    status = response.status;
 
     if (!response.ok) {
       throw new Error(`HTTP error! status: ${response.status}`);
@@ -23,34 +25,54 @@ const apiCall = async <T,>(endpoint: string, data: any): Promise<{data: T | null
       throw new Error(result.message || 'API call failed');
     }
 
-    return { data: result.data, error: null };
+    return { data: result.data, error: null, status };
   } catch (error) {
     console.error(`API call to ${endpoint} failed:`, error);
     return {
       data: null,
-      error: error instanceof Error ? error.message : 'An unexpected error occurred'
+      error: error instanceof Error ? error.message : 'An unexpected error occurred',
+      status
     };
   }
 };
 
+// Send the session token instead of the raw inputs; resend the inputs if the session has expired
+const sessionCall = async <T,>(endpoint: string, inputs: UserInputs, extra: Record<string, string> = {}) => {
+  const sessionToken = storage.getSessionToken();
+  if (sessionToken) {
+    const result = await apiCall<T>(endpoint, { session_token: sessionToken, ...extra });
+    if (result.status !== 404) {
+      return result;
+    }
+    storage.clearSessionToken();
+  }
+  return apiCall<T>(endpoint, { ...inputs, ...extra });
+};
+
 // API functions
 export const api = {
   // Sentiment analysis
   analyzeSentiment: async (inputs: UserInputs) => {
-    return apiCall<SentimentResponse>('/sentiment-analyze', inputs);
+    const result = await apiCall<SentimentResponse>('/sentiment-analyze', inputs);
+    if (result.data?.session_token) {
+      storage.setSessionToken(result.data.session_token);
+    } else if (result.data) {
+      storage.clearSessionToken();
+    }
+    return result;
   },
 
   // Daily schedule generation
   generateSchedule: async (inputs: UserInputs) => {
-    return apiCall<ScheduleResponse>('/daily-schedule', inputs);
+    return sessionCall<ScheduleResponse>('/daily-schedule', inputs);
   },
 
   // Personalized content
-  getPersonalizedContent: async (inputs: UserInputs & {
+  getPersonalizedContent: async ({ tool_title, tool_description, tool_name, ...inputs }: UserInputs & {
     tool_title: string;
     tool_description: string;
     tool_name: string;
   }) => {
-    return apiCall<PersonalizedContentResponse>('/personalized-content', inputs);
+    return sessionCall<PersonalizedContentResponse>('/personalized-content', inputs, { tool_title, tool_description, tool_name });
   }
-};
\ No newline at end of file
+};
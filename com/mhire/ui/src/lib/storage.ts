@@ -12,6 +12,7 @@ export interface SentimentResponse {
     description: string;
     tools: string[];
   }>;
+  session_token?: string | null;
 }
 
 export interface ScheduleActivity {
@@ -34,7 +35,7 @@ export interface PersonalizedContentResponse {
     title: string;
     url: string;
     reason: string;
-  };
+  } | null;
   essay: {
     quote: string;
     welcome_to_grief_works: string;
@@ -50,7 +51,8 @@ const STORAGE_KEYS = {
   SENTIMENT_RESPONSE: 'sentimentResponse',
   SCHEDULE_RESPONSE: 'scheduleResponse',
   PERSONALIZED_CONTENT_RESPONSE: 'personalizedContentResponse',
-  SELECTED_TOOL: 'selectedTool'
+  SELECTED_TOOL: 'selectedTool',
+  SESSION_TOKEN: 'sessionToken'
 } as const;
 
 // Generic storage functions
@@ -94,6 +96,11 @@ export const storage = {
   setSelectedTool: (tool: string) => setStorageItem(STORAGE_KEYS.SELECTED_TOOL, tool),
   getSelectedTool: (): string | null => getStorageItem<string>(STORAGE_KEYS.SELECTED_TOOL),
 
+  // Server-side session token from the sentiment analysis
+  setSessionToken: (token: string) => setStorageItem(STORAGE_KEYS.SESSION_TOKEN, token),
+  getSessionToken: (): string | null => getStorageItem<string>(STORAGE_KEYS.SESSION_TOKEN),
+  clearSessionToken: () => sessionStorage.removeItem(STORAGE_KEYS.SESSION_TOKEN),
+
   // Clear all data
   clearAll: () => {
     Object.values(STORAGE_KEYS).forEach((key) => {
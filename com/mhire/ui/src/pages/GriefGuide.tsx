@@ -241,33 +241,35 @@ const GriefGuide = () => {
         </div>
 
         {/* Song Recommendation */}
-        <Card className="bg-gradient-to-r from-purple-50 to-blue-50 border-purple-200">
-          <CardHeader>
-            <CardTitle className="bg-gradient-to-r from-purple-600 to-blue-600 bg-clip-text text-transparent">Song Recommendation</CardTitle>
-          </CardHeader>
-          <CardContent>
-            <h3 className="font-semibold mb-2 text-gray-800">{personalizedContent.song_recommendation.title}</h3>
-            <a 
-              href={personalizedContent.song_recommendation.url} 
-              target="_blank" 
-              rel="noopener noreferrer"
-              className="block aspect-video mb-4 rounded-lg overflow-hidden shadow-lg bg-gradient-to-br from-red-500 to-red-600 hover:from-red-600 hover:to-red-700 transition-all duration-300 transform hover:scale-105 group"
-            >
-              <div className="w-full h-full flex flex-col items-center justify-center text-white">
-                <div className="mb-4 p-6 bg-white/20 rounded-full backdrop-blur-sm group-hover:bg-white/30 transition-all duration-300">
-                  <svg className="w-16 h-16" viewBox="0 0 24 24" fill="currentColor">
-                    <path d="M23.498 6.186a3.016 3.016 0 0 0-2.122-2.136C19.505 3.545 12 3.545 12 3.545s-7.505 0-9.377.505A3.017 3.017 0 0 0 .502 6.186C0 8.07 0 12 0 12s0 3.93.502 5.814a3.016 3.016 0 0 0 2.122 2.136c1.871.505 9.376.505 9.376.505s7.505 0 9.377-.505a3.015 3.015 0 0 0 2.122-2.136C24 15.93 24 12 24 12s0-3.93-.502-5.814zM9.545 15.568V8.432L15.818 12l-6.273 3.568z"/>
-                  </svg>
+        {personalizedContent.song_recommendation && (
+          <Card className="bg-gradient-to-r from-purple-50 to-blue-50 border-purple-200">
+            <CardHeader>
+              <CardTitle className="bg-gradient-to-r from-purple-600 to-blue-600 bg-clip-text text-transparent">Song Recommendation</CardTitle>
+            </CardHeader>
+            <CardContent>
+              <h3 className="font-semibold mb-2 text-gray-800">{personalizedContent.song_recommendation.title}</h3>
+              <a 
+                href={personalizedContent.song_recommendation.url} 
+                target="_blank" 
+                rel="noopener noreferrer"
+                className="block aspect-video mb-4 rounded-lg overflow-hidden shadow-lg bg-gradient-to-br from-red-500 to-red-600 hover:from-red-600 hover:to-red-700 transition-all duration-300 transform hover:scale-105 group"
+              >
+                <div className="w-full h-full flex flex-col items-center justify-center text-white">
+                  <div className="mb-4 p-6 bg-white/20 rounded-full backdrop-blur-sm group-hover:bg-white/30 transition-all duration-300">
+                    <svg className="w-16 h-16" viewBox="0 0 24 24" fill="currentColor">
+                      <path d="M23.498 6.186a3.016 3.016 0 0 0-2.122-2.136C19.505 3.545 12 3.545 12 3.545s-7.505 0-9.377.505A3.017 3.017 0 0 0 .502 6.186C0 8.07 0 12 0 12s0 3.93.502 5.814a3.016 3.016 0 0 0 2.122 2.136c1.871.505 9.376.505 9.376.505s7.505 0 9.377-.505a3.015 3.015 0 0 0 2.122-2.136C24 15.93 24 12 24 12s0-3.93-.502-5.814zM9.545 15.568V8.432L15.818 12l-6.273 3.568z"/>
+                    </svg>
+                  </div>
+                  <h4 className="text-2xl font-bold mb-2 text-center px-4">{personalizedContent.song_recommendation.title}</h4>
+                  <p className="text-lg font-semibold bg-white/20 px-6 py-2 rounded-full backdrop-blur-sm group-hover:bg-white/30 transition-all duration-300">
+                    Watch on YouTube
+                  </p>
                 </div>
-                <h4 className="text-2xl font-bold mb-2 text-center px-4">{personalizedContent.song_recommendation.title}</h4>
-                <p className="text-lg font-semibold bg-white/20 px-6 py-2 rounded-full backdrop-blur-sm group-hover:bg-white/30 transition-all duration-300">
-                  Watch on YouTube
-                </p>
-              </div>
-            </a>
-            <p className="text-gray-600 mb-2">{personalizedContent.song_recommendation.reason}</p>
-          </CardContent>
-        </Card>
+              </a>
+              <p className="text-gray-600 mb-2">{personalizedContent.song_recommendation.reason}</p>
+            </CardContent>
+          </Card>
+        )}
 
         {/* Essay */}
         <Card className="bg-gradient-to-r from-purple-50 to-blue-50 border-purple-200">
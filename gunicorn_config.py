@@ -1,4 +1,10 @@
 # gunicorn_config.py
+import os
+
 bind = "0.0.0.0:8000"
 workers = 4
-worker_class = "uvicorn.workers.UvicornWorker"
\ No newline at end of file
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# Import the app once in the master and fork warmed workers from it.
+# Services and SDK clients are built lazily per worker in the app lifespan.
+preload_app = os.getenv("GUNICORN_PRELOAD", "true").lower() == "true"